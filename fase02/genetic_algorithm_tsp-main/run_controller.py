@@ -0,0 +1,128 @@
+import signal
+import threading
+import time
+
+
+class RunController:
+    """
+    Decide when a genetic algorithm loop should stop, beyond a fixed number of generations.
+
+    The loop calls `update(best_fitness)` at the end of every generation and stops when it returns False:
+    wall-clock budget exhausted, `stall_generations` generations without improvement, target fitness reached,
+    generation limit or Ctrl+C. Used as a context manager, the first SIGINT only requests the stop (the loop
+    keeps its current best); a second SIGINT raises KeyboardInterrupt as usual.
+
+    Parameters:
+    - time_budget (float): Maximum run time in seconds (None = unlimited).
+    - stall_generations (int): Consecutive generations without improvement that end the run (None = disabled).
+    - target_fitness (float): Fitness that ends the run once reached (None = disabled).
+    - max_generations (int): Maximum number of generations (None = unlimited).
+    - maximize (bool): True if higher fitness is better; False for minimization problems such as the TSP distance.
+    - min_delta (float): Minimum improvement that resets the stall counter.
+    """
+
+    def __init__(self, time_budget=None, stall_generations=None, target_fitness=None, max_generations=None,
+                 maximize=True, min_delta=0.0):
+        self.time_budget = time_budget
+        self.stall_generations = stall_generations
+        self.target_fitness = target_fitness
+        self.max_generations = max_generations
+        self.maximize = maximize
+        self.min_delta = min_delta
+        self._previous_handler = None
+        self.start()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.generation = 0
+        self.best_fitness = None
+        self.stalled = 0
+        self.interrupted = False
+        self.stop_reason = None
+        return self
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def _improves(self, fitness):
+        if self.best_fitness is None:
+            return True
+        delta = fitness - self.best_fitness if self.maximize else self.best_fitness - fitness
+        return delta > self.min_delta
+
+    def _reached_target(self):
+        if self.target_fitness is None or self.best_fitness is None:
+            return False
+        if self.maximize:
+            return self.best_fitness >= self.target_fitness
+        return self.best_fitness <= self.target_fitness
+
+    def should_stop(self):
+        """
+        Check the stop conditions without recording a generation.
+
+        Returns:
+        bool: True if the loop should stop; the reason is kept in `stop_reason`.
+        """
+        if self.interrupted:
+            self.stop_reason = 'interrupted'
+        elif self.time_budget is not None and self.elapsed >= self.time_budget:
+            self.stop_reason = 'time_budget'
+        elif self._reached_target():
+            self.stop_reason = 'target'
+        elif self.stall_generations is not None and self.stalled >= self.stall_generations:
+            self.stop_reason = 'stall'
+        elif self.max_generations is not None and self.generation >= self.max_generations:
+            self.stop_reason = 'generations'
+        return self.stop_reason is not None
+
+    def update(self, fitness):
+        """
+        Record the best fitness of the generation that just finished.
+
+        Parameters:
+        - fitness (float): Best fitness of the generation.
+
+        Returns:
+        bool: True if the loop should keep running.
+        """
+        self.generation += 1
+        if self._improves(fitness):
+            self.stalled = 0
+        else:
+            self.stalled += 1
+        if self.best_fitness is None or (fitness > self.best_fitness if self.maximize else fitness < self.best_fitness):
+            self.best_fitness = fitness
+        return not self.should_stop()
+
+    def _interrupt(self, signum, frame):
+        # First Ctrl+C requests a graceful stop; the next one falls back to the default handler
+        self.interrupted = True
+        signal.signal(signal.SIGINT, self._previous_handler or signal.default_int_handler)
+
+    def install_signal_handler(self):
+        """
+        Install the graceful SIGINT handler (for loops that cannot use the context manager).
+        """
+        self._previous_handler = None
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGINT, self._interrupt)
+        return self
+
+    def restore_signal_handler(self):
+        """
+        Restore the SIGINT handler replaced by `install_signal_handler`.
+        """
+        if self._previous_handler is not None and signal.getsignal(signal.SIGINT) == self._interrupt:
+            signal.signal(signal.SIGINT, self._previous_handler)
+        self._previous_handler = None
+
+    def __enter__(self):
+        self.start()
+        return self.install_signal_handler()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.restore_signal_handler()
+        return False
@@ -0,0 +1,231 @@
+import cProfile
+import csv
+import io
+import json
+import pstats
+import statistics
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+PHASES = ['selection', 'crossover', 'mutation', 'evaluation']
+FIELDS = (['generation', 'elapsed', 'generation_time'] + [f"{phase}_time" for phase in PHASES] +
+          ['bookkeeping_time', 'evaluations', 'best', 'avg', 'worst', 'fitness_std', 'diversity'])
+
+
+def unique_ratio(population, key=tuple):
+    """
+    Population diversity as the fraction of distinct individuals.
+
+    Parameters:
+    - population (list): The individuals of one generation.
+    - key (callable): Maps an individual to a hashable genotype.
+
+    Returns:
+    float: 1.0 when every individual is different, 1/len(population) when all are equal.
+    """
+    if not population:
+        return 0.0
+    return len({key(individual) for individual in population}) / len(population)
+
+
+class GenerationTelemetry:
+    """
+    Per-generation telemetry for a genetic algorithm: time spent in each phase (selection, crossover, mutation
+    and evaluation), evaluation count, best/avg/worst fitness and diversity, written as JSON lines or CSV
+    (chosen by the extension of `path`).
+
+    Phases are measured by wrapping the GA functions with `wrap(phase, function)`. Times are exclusive: a
+    fitness evaluation called from inside the selection counts as evaluation, not selection. The rest of the
+    generation time is reported as bookkeeping (statistics, logging, drawing).
+
+    Parameters:
+    - path (str): Output file (.csv for CSV, any other extension for JSON lines). None disables writing.
+    - maximize (bool): True if higher fitness is better (defines best/worst); False for the TSP distance.
+    - profiler (str): 'cprofile' or 'pyinstrument' to profile the run; None disables profiling.
+    - profile_path (str): File for the full profile (.prof for cProfile, .html for pyinstrument).
+    """
+
+    def __init__(self, path=None, maximize=True, profiler=None, profile_path=None):
+        self.path = path
+        self.maximize = maximize
+        self.profiler = profiler
+        self.profile_path = profile_path
+        self._file = None
+        self._writer = None
+        self._stack = []
+        self._profiler = None
+        self.start()
+
+    def start(self):
+        """
+        Reset the clock and the counters (call it right before the first generation).
+        """
+        self.started = time.perf_counter()
+        self._generation_started = self.started
+        self._reset()
+        return self
+
+    def _reset(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+
+    def _switch(self, now):
+        # Close the running segment of the innermost phase (exclusive timing)
+        if self._stack:
+            phase, since = self._stack[-1]
+            self.times[phase] += now - since
+
+    def enter(self, phase):
+        now = time.perf_counter()
+        self._switch(now)
+        self.counts[phase] += 1
+        self._stack.append((phase, now))
+
+    def exit(self):
+        now = time.perf_counter()
+        self._switch(now)
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1] = (self._stack[-1][0], now)
+
+    @contextmanager
+    def phase(self, name):
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def wrap(self, phase, function):
+        """
+        Wrap `function` so that its calls and time are accounted to `phase`.
+
+        Parameters:
+        - phase (str): One of PHASES.
+        - function (callable): The function to instrument.
+
+        Returns:
+        callable: The instrumented function.
+        """
+        @wraps(function)
+        def timed(*args, **kwargs):
+            self.enter(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.exit()
+        return timed
+
+    def _write(self, row):
+        if self.path is None:
+            return
+        if self._file is None:
+            self._file = open(self.path, 'w', newline='')
+            if self.path.endswith('.csv'):
+                self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+                self._writer.writeheader()
+        if self._writer:
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(row) + '\n')
+        self._file.flush()
+
+    def record(self, generation, fitnesses, diversity=None):
+        """
+        Close a generation: write phase times, evaluations, fitness statistics and diversity, then reset the counters.
+
+        Parameters:
+        - generation (int): Generation number.
+        - fitnesses (List[float]): Fitness of every individual of the generation.
+        - diversity (float): Diversity metric of the generation, e.g. `unique_ratio(population)`.
+
+        Returns:
+        dict: The recorded row.
+        """
+        now = time.perf_counter()
+        generation_time = now - self._generation_started
+        fitnesses = list(fitnesses)
+        best, worst = (max, min) if self.maximize else (min, max)
+        row = {
+            'generation': generation,
+            'elapsed': now - self.started,
+            'generation_time': generation_time,
+            **{f"{phase}_time": self.times[phase] for phase in PHASES},
+            'bookkeeping_time': max(generation_time - sum(self.times.values()), 0.0),
+            'evaluations': self.counts['evaluation'],
+            'best': best(fitnesses) if fitnesses else None,
+            'avg': statistics.fmean(fitnesses) if fitnesses else None,
+            'worst': worst(fitnesses) if fitnesses else None,
+            'fitness_std': statistics.pstdev(fitnesses) if len(fitnesses) > 1 else 0.0,
+            'diversity': diversity,
+        }
+        self._write(row)
+        self._reset()
+        self._generation_started = time.perf_counter()
+        return row
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def start_profile(self):
+        """
+        Start the profiler selected by `profiler` (cProfile or pyinstrument); does nothing without one.
+        """
+        self._profiler = None
+        if self.profiler is None:
+            return
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("pyinstrument is not installed: pip install pyinstrument")
+            self._profiler = Profiler()
+            self._profiler.start()
+        elif self.profiler == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            raise ValueError(f"Unknown profiler: {self.profiler} (use 'cprofile' or 'pyinstrument')")
+
+    def stop_profile(self):
+        """
+        Stop the profiler, print a summary and, if `profile_path` is set, save the full profile.
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+        if self.profiler == 'pyinstrument':
+            profiler.stop()
+            print(profiler.output_text(unicode=True))
+            if self.profile_path:
+                with open(self.profile_path, 'w') as file:
+                    file.write(profiler.output_html())
+            return
+        profiler.disable()
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(20)
+        print(summary.getvalue())
+        if self.profile_path:
+            profiler.dump_stats(self.profile_path)
+
+    @contextmanager
+    def profile(self):
+        """
+        Profile the enclosed block with `start_profile`/`stop_profile`.
+        """
+        self.start_profile()
+        try:
+            yield
+        finally:
+            self.stop_profile()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
@@ -4,6 +4,8 @@ import random
 import itertools
 from genetic_algorithm import mutate, order_crossover, generate_random_population, calculate_fitness, sort_population, default_problems
 from draw_functions import draw_paths, draw_plot, draw_cities
+from run_controller import RunController
+from telemetry import GenerationTelemetry, unique_ratio
 import sys
 import numpy as np
 import pygame
@@ -22,6 +24,11 @@ N_CITIES = 15
 POPULATION_SIZE = 100
 N_GENERATIONS = None
 MUTATION_PROBABILITY = 0.5
+TIME_BUDGET = None  # seconds
+STALL_GENERATIONS = None  # stop after this many generations without improvement
+TARGET_FITNESS = None  # stop once the best distance is at or below this value
+TELEMETRY_FILE = None  # per-generation telemetry, e.g. "telemetry.csv" or "telemetry.jsonl"
+PROFILER = None  # "cprofile" or "pyinstrument"
 
 # Define colors
 WHITE = (255, 255, 255)
@@ -69,6 +76,19 @@ generation_counter = itertools.count(start=1)  # Start the counter at 1
 population = generate_random_population(cities_locations, POPULATION_SIZE)
 best_fitness_values = []
 best_solutions = []
+controller = RunController(time_budget=TIME_BUDGET, stall_generations=STALL_GENERATIONS,
+                           target_fitness=TARGET_FITNESS, max_generations=N_GENERATIONS, maximize=False)
+controller.install_signal_handler()
+
+# Instrument the GA phases only when telemetry is enabled
+telemetry = GenerationTelemetry(TELEMETRY_FILE, maximize=False, profiler=PROFILER)
+if TELEMETRY_FILE:
+    calculate_fitness = telemetry.wrap('evaluation', calculate_fitness)
+    order_crossover = telemetry.wrap('crossover', order_crossover)
+    mutate = telemetry.wrap('mutation', mutate)
+    sort_population = telemetry.wrap('selection', sort_population)
+telemetry.start_profile()
+telemetry.start()
 
 
 # Main game loop
@@ -105,6 +125,12 @@ while running:
     draw_paths(screen, population[1], rgb_color=(128, 128, 128), width=1)
 
     print(f"Generation {generation}: Best fitness = {round(best_fitness, 2)}")
+    if TELEMETRY_FILE:
+        telemetry.record(generation, population_fitness, diversity=unique_ratio(population))
+
+    if not controller.update(best_fitness):
+        print(f"Stopped at generation {generation} ({controller.stop_reason}) after {controller.elapsed:.1f}s")
+        running = False
 
     new_population = [population[0]]  # Keep the best individual: ELITISM
 
@@ -115,8 +141,10 @@ while running:
         # parent1, parent2 = random.choices(population[:10], k=2)
 
         # solution based on fitness probability
+        telemetry.enter('selection')
         probability = 1 / np.array(population_fitness)
         parent1, parent2 = random.choices(population, weights=probability, k=2)
+        telemetry.exit()
 
         # child1 = order_crossover(parent1, parent2)
         child1 = order_crossover(parent1, parent1)
@@ -131,6 +159,12 @@ while running:
     clock.tick(FPS)
 
 
+controller.restore_signal_handler()
+telemetry.stop_profile()
+telemetry.close()
+if best_fitness_values:
+    print(f"Best fitness found = {round(min(best_fitness_values), 2)}")
+
 # TODO: save the best individual in a file if it is better than the one saved.
 
 # exit software
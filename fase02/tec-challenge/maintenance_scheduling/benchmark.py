@@ -0,0 +1,152 @@
+# benchmark.py
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from data_loader import load_workers_from_csv, load_tasks_from_csv, load_worker_calendars_from_csv
+from genetic_algorithm_v2 import GeneticAlgorithm
+from greedy_scheduler import GreedyScheduler
+from instance_generator import generate_instance
+from local_search import LocalSearch
+from run_controller import RunController
+from solvers import evaluate_schedule
+
+try:
+    import resource
+except ImportError:  # Windows: sem medição de pico de memória
+    resource = None
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def peak_memory_mb():
+    """
+    Pico de memória residente do processo em MB (ru_maxrss é em KB no Linux).
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def evaluations_per_second(function, argument, min_time=1.0, controller: RunController = None):
+    """
+    Número de avaliações de `function(argument)` por segundo, repetindo por pelo menos `min_time` segundos
+    ou até o `controller` esgotar o orçamento de tempo. Retorna None se não houve tempo para nenhuma avaliação.
+    """
+    count, start = 0, time.perf_counter()
+    while not (controller is not None and controller.should_stop()):
+        function(argument)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    return count / (time.perf_counter() - start) if count else None
+
+
+def run_size(operations, args, output_dir):
+    """
+    Gera a instância com aproximadamente `operations` operações e mede carga, avaliações por segundo,
+    melhor penalidade ao longo do tempo (guloso e GA) e pico de memória. Roda em um processo próprio
+    para que o pico de memória seja o desta instância.
+
+    O orçamento `args.budget` vale para todo o agendamento (guloso, medição de avaliações e GA); a fase em que
+    ele se esgotou fica em `timeout` (None se a instância terminou dentro do orçamento).
+    """
+    orders = max(1, operations * 2 // (args.max_operations + 1))
+    workers = args.workers or max(10, operations // args.operations_per_worker)
+    started = time.perf_counter()
+    ordens, disponibilidade, historico = generate_instance(output_dir, orders=orders, workers=workers, skills=args.skills,
+                                                           work_centers=args.work_centers, horizon_days=args.horizon_days,
+                                                           max_operations=args.max_operations, seed=args.seed)
+    result = {'operations': operations, 'orders': orders, 'workers': workers,
+              'generate_time': time.perf_counter() - started}
+
+    started = time.perf_counter()
+    tasks = load_tasks_from_csv(ordens)
+    workers = load_workers_from_csv(disponibilidade, historico)
+    calendars = load_worker_calendars_from_csv(disponibilidade)
+    result['load_time'] = time.perf_counter() - started
+    result['operations'] = sum(len(task.operations) for task in tasks)
+
+    # Melhor penalidade (mesma escala de solvers.evaluate_schedule, contadas as ordens ausentes) versus tempo de parede
+    trace = []
+    result['timeout'], result['evaluations_per_second'] = None, None
+    controller = RunController(time_budget=args.budget)
+    started = controller.started
+    greedy = GreedyScheduler(tasks, workers, calendars)
+    seed = greedy.schedule(controller)
+    trace.append(('greedy', time.perf_counter() - started, evaluate_schedule(seed, calendars, tasks)))
+    if controller.stop_reason:
+        result['timeout'] = 'greedy'
+
+    genetic_algo = GeneticAlgorithm(tasks, workers, population_size=args.population_size, generations=args.generations,
+                                    seed=seed, mutation_operator=LocalSearch(workers, calendars).mutate)
+    if not result['timeout']:
+        result['evaluations_per_second'] = evaluations_per_second(genetic_algo.fitness, seed, controller=controller)
+        if controller.stop_reason:
+            result['timeout'] = 'evaluation'
+
+    population = genetic_algo.initial_population() if not result['timeout'] else []
+    for generation in range(args.generations if population else 0):
+        if controller.should_stop():
+            result['timeout'] = 'ga'
+            break
+        population = genetic_algo.evolve(population)
+        best_individual = max(population, key=genetic_algo.fitness)
+        trace.append(('ga', time.perf_counter() - started, evaluate_schedule(best_individual, calendars, tasks)))
+
+    result['trace'] = trace
+    result['best_penalty'] = min(penalty for _, _, penalty in trace)
+    result['peak_memory_mb'] = peak_memory_mb()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de agenda de manutenção em instâncias sintéticas.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help=f"Números aproximados de operações das instâncias (default: {DEFAULT_SIZES}).")
+    parser.add_argument("--max-operations", type=int, default=4, help="Máximo de operações por ordem (default: 4).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Número de colaboradores (default: uma fração do número de operações).")
+    parser.add_argument("--operations-per-worker", type=int, default=50,
+                        help="Operações por colaborador quando --workers não é informado (default: 50).")
+    parser.add_argument("--skills", type=int, default=6, help="Número de qualificações distintas (default: 6).")
+    parser.add_argument("--work-centers", type=int, default=4, help="Número de centros de trabalho (default: 4).")
+    parser.add_argument("--horizon-days", type=int, default=30, help="Dias cobertos pelas ordens (default: 30).")
+    parser.add_argument("--population-size", type=int, default=10, help="População do GA (default: 10).")
+    parser.add_argument("--generations", type=int, default=10, help="Gerações do GA (default: 10).")
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="Tempo máximo em segundos de agendamento por instância (guloso, medição de avaliações e GA); "
+                             "a fase interrompida é registrada como timeout (default: 60).")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador de instâncias (default: 42).")
+    parser.add_argument("--output", default=None, help="Arquivo JSON Lines com um resultado por instância.")
+    parser.add_argument("--keep", default=None, help="Diretório onde manter as instâncias geradas (default: temporário).")
+    args = parser.parse_args()
+
+    print("Operações | Ordens | Colaboradores | Carga (s) | Avaliações/s | Melhor penalidade | Tempo (s) | Pico de memória (MB) | Timeout")
+    output = open(args.output, "w") if args.output else None
+    try:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                output_dir = os.path.join(args.keep, str(size)) if args.keep else tmp
+                # Um processo por instância, para medir o pico de memória isoladamente
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    result = pool.submit(run_size, size, args, output_dir).result()
+            elapsed = result['trace'][-1][1]
+            memory = f"{result['peak_memory_mb']:.0f}" if result['peak_memory_mb'] is not None else "-"
+            evaluations = f"{result['evaluations_per_second']:.1f}" if result['evaluations_per_second'] is not None else "-"
+            print(f"{result['operations']} | {result['orders']} | {result['workers']} | {result['load_time']:.2f} | "
+                  f"{evaluations} | {result['best_penalty']} | {elapsed:.2f} | {memory} | {result['timeout'] or '-'}")
+            if output:
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+    finally:
+        if output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# cp_solver.py
+from datetime import timedelta
+from typing import Dict, List
+
+from greedy_scheduler import DEFAULT_HORIZON_DAYS, WorkerIndex
+from local_search import MISSING_WORKER_PENALTY, UNQUALIFIED_PENALTY
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+from util import time_to_minutes, minutes_to_time, unique_workers
+
+try:
+    from ortools.sat.python import cp_model
+except ImportError:  # OR-Tools é opcional: sem ele o AutoSolver usa apenas o algoritmo genético
+    cp_model = None
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class CPSatModel:
+    """
+    Modelo de programação por restrições (OR-Tools CP-SAT) da agenda de manutenção.
+
+    O tempo é um eixo único em minutos a partir da menor data prevista. Para cada operação há uma variável de
+    início e uma variável booleana por colaborador candidato, que só pode ser verdadeira se a operação couber em
+    uma janela de turno (dia e período antes/depois do intervalo) daquele colaborador; cada colaborador tem um
+    NoOverlap sobre os intervalos opcionais das suas operações.
+    As operações de uma ordem seguem a ordem crescente de `operacao` e uma operação só pode ser agendada se a
+    anterior também for.
+
+    O objetivo minimiza, lexicograficamente, a mesma penalidade usada por `ScheduleIndex` (colaboradores faltantes e
+    sem qualificação; sobreposições e turnos são restrições rígidas) e, em seguida, o atraso ponderado pelo indice_irpe.
+    """
+
+    def __init__(self, tasks: List[MaintenanceTask], workers: List[Worker], calendars: Dict[str, WorkerCalendar], horizon_days=DEFAULT_HORIZON_DAYS):
+        if cp_model is None:
+            raise ImportError("O solver exato requer OR-Tools: pip install ortools")
+        self.tasks = tasks
+        self.workers = unique_workers(workers)
+        self.calendars = calendars
+        self.horizon_days = horizon_days
+        self.origin = min((task.due_date for task in tasks), default=None)
+        self.model = cp_model.CpModel()
+        self.variables = {}
+        self._build()
+
+    def _windows(self, worker, day):
+        return self.calendars[worker.worker_id].weekly_shifts.get(day.isoweekday(), [])
+
+    def _build(self):
+        model = self.model
+        penalties, lateness = [], []
+        intervals = {}
+        worker_index = WorkerIndex(self.workers, self.calendars)
+        max_priority = max((int(task.priority) for task in self.tasks), default=1) or 1
+
+        for task in self.tasks:
+            previous = None
+            for position, operation in enumerate(sorted(task.operations, key=lambda op: op.operation_id)):
+                effort = int(operation.effort)
+                quantity = max(int(operation.quantity or 1), 1)
+                day_offset = (task.due_date - self.origin).days
+                release = day_offset * MINUTES_PER_DAY
+                if position == 0 and isinstance(operation.start_hour, str):
+                    release += time_to_minutes(operation.start_hour)
+
+                candidates = worker_index.candidates(operation)
+                windows = {}  # janelas de turno de cada candidato em que a operação cabe
+                for offset in range(day_offset, day_offset + self.horizon_days + 1):
+                    day = self.origin + timedelta(days=offset)
+                    for worker in candidates:
+                        for window_start, window_end in self._windows(worker, day):
+                            start, end = offset * MINUTES_PER_DAY + window_start, offset * MINUTES_PER_DAY + window_end
+                            if max(start, release) + effort <= end:
+                                windows.setdefault(worker.worker_id, []).append((start, end))
+
+                present = model.NewBoolVar(f"present_{task.task_id}_{operation.operation_id}")
+                penalties.append((quantity * MISSING_WORKER_PENALTY, present.Not()))
+                if len(windows) < quantity:
+                    model.Add(present == 0)
+                bounds = [window for worker_windows in windows.values() for window in worker_windows]
+                lower = min([start for start, _ in bounds] + [release])
+                upper = max([end - effort for _, end in bounds] + [lower])
+                start_var = model.NewIntVar(max(lower, release), max(upper, release), f"start_{task.task_id}_{operation.operation_id}")
+
+                # Um literal por janela distinta ("a operação cabe nesta janela"); cada colaborador alocado precisa
+                # de uma das suas, então colaboradores com turnos diferentes, mas sobrepostos, podem trabalhar juntos
+                fits = {}
+                for window_start, window_end in set(bounds):
+                    literal = fits[(window_start, window_end)] = model.NewBoolVar("")
+                    model.Add(start_var >= window_start).OnlyEnforceIf(literal)
+                    model.Add(start_var + effort <= window_end).OnlyEnforceIf(literal)
+
+                assigned = {}
+                for worker in candidates:
+                    assigned[worker.worker_id] = model.NewBoolVar("")
+                    worker_windows = windows.get(worker.worker_id)
+                    if worker_windows:
+                        model.AddBoolOr([fits[window] for window in worker_windows]).OnlyEnforceIf(assigned[worker.worker_id])
+                    else:
+                        model.Add(assigned[worker.worker_id] == 0)
+                    if operation.required_skill and not worker.has_skill(operation.required_mask):
+                        penalties.append((UNQUALIFIED_PENALTY, assigned[worker.worker_id]))
+                    interval = model.NewOptionalFixedSizeIntervalVar(start_var, effort, assigned[worker.worker_id], "")
+                    intervals.setdefault(worker.worker_id, []).append(interval)
+                model.Add(sum(assigned.values()) == quantity * present)
+
+                if previous is not None:
+                    previous_start, previous_effort, previous_present = previous
+                    model.Add(start_var >= previous_start + previous_effort).OnlyEnforceIf(present)
+                    model.AddImplication(present, previous_present)
+                previous = (start_var, effort, present)
+
+                lateness.append((int(task.priority), start_var - max(lower, release)))
+                self.variables[id(operation)] = (task, operation, present, start_var, assigned)
+
+        for worker_intervals in intervals.values():
+            model.AddNoOverlap(worker_intervals)
+
+        # Penalidade primeiro; o atraso só desempata (nunca supera uma unidade de penalidade)
+        span = (self.horizon_days + 2) * MINUTES_PER_DAY
+        weight = max_priority * span * max(len(self.variables), 1) + 1
+        self.penalty = sum(cost * literal for cost, literal in penalties)
+        model.Minimize(weight * self.penalty + sum(priority * delay for priority, delay in lateness))
+
+    def hint(self, schedule: List[MaintenanceTask] = None):
+        """
+        Usa a agenda de `schedule` (ex.: melhor indivíduo do GA, com cópias das ordens), casada pelo número da ordem
+        e da operação, ou a agenda atual das operações, como solução inicial.
+        """
+        seeded = {(task.task_id, op.operation_id): op for task in schedule or [] for op in task.operations}
+        for task, operation, present, start_var, assigned in self.variables.values():
+            operation = seeded.get((task.task_id, operation.operation_id), operation)
+            allocated = {worker.worker_id for worker in operation.allocated_workers}
+            self.model.AddHint(present, bool(allocated))
+            if allocated and isinstance(operation.start_hour, str):
+                start = (operation.due_date - self.origin).days * MINUTES_PER_DAY + time_to_minutes(operation.start_hour)
+                self.model.AddHint(start_var, start)
+            for worker_id, literal in assigned.items():
+                self.model.AddHint(literal, worker_id in allocated)
+
+    def solve(self, time_limit=None):
+        """
+        Resolve o modelo e grava a solução nas operações.
+        Retorna (status, pares (ordem, operação) não agendados); status é o nome do status do CP-SAT.
+        """
+        solver = cp_model.CpSolver()
+        if time_limit is not None:
+            solver.parameters.max_time_in_seconds = float(time_limit)
+        status = solver.Solve(self.model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return solver.StatusName(status), None
+
+        workers = {worker.worker_id: worker for worker in self.workers}
+        # Todas as reservas antigas saem antes de gravar a solução, senão uma operação movida colidiria com a
+        # posição antiga de outra ainda não regravada
+        for task, operation, present, start_var, assigned in self.variables.values():
+            for worker in list(operation.allocated_workers):
+                operation.unassign_worker(worker)
+        unscheduled = []
+        for task, operation, present, start_var, assigned in self.variables.values():
+            if not solver.Value(present):
+                unscheduled.append((task, operation))
+                continue
+            start = solver.Value(start_var)
+            operation.due_date = self.origin + timedelta(days=start // MINUTES_PER_DAY)
+            operation.start_hour = minutes_to_time(start % MINUTES_PER_DAY)
+            for worker_id, literal in assigned.items():
+                if solver.Value(literal):
+                    operation.assign_worker(workers[worker_id])
+        return solver.StatusName(status), unscheduled
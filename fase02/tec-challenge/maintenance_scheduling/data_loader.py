@@ -3,32 +3,109 @@ import pandas as pd
 from worker import Worker
 from task import MaintenanceTask
 from operation_task import OperationTask
-from datetime import datetime
-from util import calculate_end_time
+from datetime import datetime, timedelta
+from util import calculate_end_time, time_to_minutes
+from worker_calendar import WorkerCalendar
+from skill_registry import SKILLS
+from experience_index import ExperienceIndex
 
-def load_workers_from_csv(disponibilidade_file, historico_file):
+def load_workers_from_csv(disponibilidade_file, historico_file, experience: ExperienceIndex = None):
+    """
+    Carrega os colaboradores de disponibilidade_full.csv. O histórico é agregado uma única vez no
+    `ExperienceIndex` (ou `experience`, se já montado), compartilhado por todos os colaboradores.
+    """
     disponibilidade_df = pd.read_csv(disponibilidade_file)
-    historico_df = pd.read_csv(historico_file)
+    experience = experience or ExperienceIndex.from_csv(historico_file)
 
     workers = []
     for row in disponibilidade_df.itertuples(index=False):
-        experiencia = historico_df[historico_df['matricula'] == row.matricula]['equipamento'].value_counts().to_dict()
         worker = Worker(
             worker_id=row.matricula,
-            skills=str(row.qualificacao).split('/') if pd.notna(row.qualificacao) else [],  # Handle NaN or None
-            experience_with_assets=experiencia,
+            skills=SKILLS.parse(row.qualificacao),  # Normaliza e trata NaN/None
+            experience_with_assets=experience.assets_of(row.matricula),
+            experience=experience,
             total_hours = (lambda time_str: sum(int(x) * 60 ** i for i, x in enumerate(reversed(time_str.split(':')))))(row.hora_total) if pd.notna(row.hora_total) else 0            
         )
         workers.append(worker)
     return workers
 
+def load_worker_calendars_from_csv(disponibilidade_file):
+    """
+    Carrega os turnos semanais de cada colaborador a partir de disponibilidade_full.csv.
+    Cada linha (centro_trabalho, matricula, dia) gera até duas janelas de trabalho no dia,
+    separadas pelo intervalo (hora_inicio_intervalo - hora_fim_intervalo).
+    Linhas sem hora_inicio/hora_fim não oferecem janela de trabalho.
+    """
+    disponibilidade_df = pd.read_csv(disponibilidade_file)
+    shifts = {}
+    centers = {}
+    for row in disponibilidade_df.itertuples(index=False):
+        worker_centers = centers.setdefault(row.matricula, set())
+        if pd.notna(row.centro_trabalho):
+            worker_centers.add(row.centro_trabalho)
+        weekly = shifts.setdefault(row.matricula, {})
+        if pd.isna(row.dia) or pd.isna(row.hora_inicio) or pd.isna(row.hora_fim):
+            continue
+        weekday = int(row.dia) % 7 or 7  # 1-segunda-feira ... 7 (ou 0)-domingo
+        start, end = time_to_minutes(row.hora_inicio), time_to_minutes(row.hora_fim)
+        if pd.notna(row.hora_inicio_intervalo) and pd.notna(row.hora_fim_intervalo):
+            break_start, break_end = time_to_minutes(row.hora_inicio_intervalo), time_to_minutes(row.hora_fim_intervalo)
+            windows = [(start, break_start), (break_end, end)]
+        else:
+            windows = [(start, end)]
+        # O mesmo colaborador aparece em vários centros de trabalho com o mesmo turno
+        day_windows = weekly.setdefault(weekday, [])
+        for window in windows:
+            if window[0] < window[1] and window not in day_windows:
+                day_windows.append(window)
+
+    return {
+        worker_id: WorkerCalendar(worker_id, weekly, work_centers=centers[worker_id])
+        for worker_id, weekly in shifts.items()
+    }
+
 def load_tasks_from_csv(ordens_file):
     """
     Carrega ordens de serviço e suas operações a partir de um arquivo CSV.
     Para cada ordem, as operações são adicionadas e suas horas de início são ajustadas
     com base na hora de término da operação anterior.
     """
-    ordens_df = pd.read_csv(ordens_file)
+    return tasks_from_dataframe(pd.read_csv(ordens_file))
+
+def iter_task_windows(ordens_file, window_days=7, chunksize=10000):
+    """
+    Lê o arquivo de ordens em blocos de `chunksize` linhas e devolve, em ordem cronológica,
+    as ordens agrupadas em janelas de `window_days` dias por `data_inicio_base`.
+
+    O arquivo é lido como fluxo: uma janela é emitida assim que aparece uma linha com data
+    posterior ao seu fim, então a memória fica limitada ao tamanho da janela (para arquivos
+    aproximadamente ordenados por data, como os exportados do SAP). Linhas atrasadas, com data
+    anterior à janela corrente, entram na janela corrente como pendências.
+
+    Yields:
+        (inicio_da_janela, lista de MaintenanceTask)
+    """
+    window = timedelta(days=window_days)
+    current_start = None
+    pending = []
+    for chunk in pd.read_csv(ordens_file, chunksize=chunksize):
+        dates = pd.to_datetime(chunk['data_inicio_base'], format='%d/%m/%Y').dt.date
+        for day, rows in chunk.groupby(dates, sort=True):
+            if current_start is None:
+                current_start = day
+            while day >= current_start + window:
+                if pending:
+                    yield current_start, tasks_from_dataframe(pd.concat(pending))
+                    pending = []
+                current_start += window
+            pending.append(rows)
+    if pending:
+        yield current_start, tasks_from_dataframe(pd.concat(pending))
+
+def tasks_from_dataframe(ordens_df):
+    """
+    Monta as ordens de serviço (MaintenanceTask) e suas operações a partir das linhas de ordens_manutencao.
+    """
     tasks = {}
     for row in ordens_df.itertuples(index=False):
         ordem_id = row.ordem
@@ -44,9 +121,9 @@ def load_tasks_from_csv(ordens_file):
             task = tasks[ordem_id]
 
         # Cria a operação dentro da ordem de serviço
+        op_effort = int(float(str(row.esforco_individual).replace(',','.'))*60) if pd.notna(row.esforco_individual) else 0 #em minutos 
         # Se for a primeira operação, usar a hora de início base da ordem
         if len(task.operations) == 0:
-            op_effort = int(float(str(row.esforco_individual).replace(',','.'))*60) if pd.notna(row.esforco_individual) else 0 #em minutos 
             start_hour = row.hora_inicio_base if pd.notna(row.hora_inicio_base) else '00:00:01'
         else:
             # Hora de início da nova operação é a hora de término da última operação
@@ -55,11 +132,13 @@ def load_tasks_from_csv(ordens_file):
         
         operation = OperationTask(
             operation_id=row.operacao,
-            required_skill=str(row.qualificacao).split('/') if pd.notna(row.qualificacao) else [],  # Handle NaN or None
+            required_skill=SKILLS.parse(row.qualificacao),  # Normaliza e trata NaN/None
             due_date=datetime.strptime(row.data_inicio_base, '%d/%m/%Y').date(),
             asset=row.equipamento_ordem,
             effort= op_effort,
-            start_hour=start_hour
+            start_hour=start_hour,
+            quantity=int(float(str(row.quantidade_executantes).replace(',','.'))) if pd.notna(row.quantidade_executantes) else 1,
+            work_center=row.centro_trabalho if pd.notna(row.centro_trabalho) else None  # NaN vira None (sem centro)
         )
         
         # Adiciona a operação à ordem de serviço
@@ -0,0 +1,158 @@
+# decomposition.py
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from genetic_algorithm_v2 import GeneticAlgorithm
+from greedy_scheduler import GreedyScheduler
+from local_search import LocalSearch
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+from util import unique_workers
+
+
+def greedy_solver(tasks, workers, calendars, horizon_days=7):
+    """
+    Resolve um subproblema apenas com o construtor guloso.
+    Retorna (ordens agendadas, pares (ordem, operação) não agendados, agendas dos colaboradores).
+    """
+    scheduler = GreedyScheduler(tasks, workers, calendars, horizon_days=horizon_days)
+    scheduled = scheduler.schedule()
+    return scheduled, scheduler.unscheduled, calendars
+
+
+def ga_solver(tasks, workers, calendars, horizon_days=7, population_size=10, generations=10, mutation_rate=0.05):
+    """
+    Resolve um subproblema com o algoritmo genético semeado pelo construtor guloso e mutação por busca local.
+    """
+    scheduled, unscheduled, calendars = greedy_solver(tasks, workers, calendars, horizon_days)
+    local_search = LocalSearch(workers, calendars, horizon_days=horizon_days)
+    genetic_algo = GeneticAlgorithm(tasks, workers, population_size=population_size, generations=generations,
+                                    mutation_rate=mutation_rate, seed=scheduled, mutation_operator=local_search.mutate)
+    return genetic_algo.optimize(), unscheduled, calendars
+
+
+def _solve(job):
+    solver, tasks, workers, calendars = job
+    return solver(tasks, workers, calendars)
+
+
+class WorkCenterDecomposition:
+    """
+    Decompõe o problema por centro de trabalho e resolve as partes em paralelo.
+
+    Cada operação só pode ser atendida por colaboradores do seu centro de trabalho, então o problema se divide
+    em subproblemas independentes. Centros são unidos (union-find) quando compartilham um colaborador
+    (ex.: matrícula 3 em vários centros) ou quando uma mesma ordem tem operações em mais de um centro; operações
+    sem centro de trabalho unem tudo. Cada partição é resolvida por `solver` em um processo separado e os
+    resultados são juntados numa agenda única, de modo que o tempo total acompanha a maior partição. As ordens e
+    os colaboradores voltam dos processos como cópias: a agenda é gravada de volta nas ordens e colaboradores de entrada.
+
+    Attributes:
+        tasks (list): Ordens de serviço.
+        workers (list): Colaboradores (um por matrícula).
+        calendars (dict): Mapeia a matrícula para a sua `WorkerCalendar`; recebe as agendas resolvidas.
+        solver (callable): Função de topo de módulo (precisa ser serializável) `solver(tasks, workers, calendars)`.
+        max_workers (int): Número de processos (None = número de CPUs).
+        unscheduled (list): Pares (ordem, operação) não agendados por alguma partição.
+    """
+
+    def __init__(self, tasks: List[MaintenanceTask], workers: List[Worker], calendars: Dict[str, WorkerCalendar], solver=greedy_solver, max_workers=None):
+        self.tasks = tasks
+        self.workers = unique_workers(workers)
+        self.calendars = calendars
+        self.solver = solver
+        self.max_workers = max_workers
+        self.unscheduled = []
+
+    def partitions(self):
+        """
+        Agrupa ordens e colaboradores em partições independentes.
+        Retorna uma lista de (centros de trabalho, ordens, colaboradores, agendas), da maior para a menor.
+        """
+        parent = {}
+
+        def find(center):
+            parent.setdefault(center, center)
+            while parent[center] != center:
+                parent[center] = parent[parent[center]]
+                center = parent[center]
+            return center
+
+        def union(centers):
+            roots = [find(center) for center in centers]
+            for root in roots[1:]:
+                parent[root] = roots[0]
+
+        no_center = None  # operações sem centro de trabalho podem usar qualquer colaborador
+        for calendar in self.calendars.values():
+            union(calendar.work_centers or {no_center})
+        for task in self.tasks:
+            union({operation.work_center if isinstance(operation.work_center, str) else no_center for operation in task.operations} or {no_center})
+        if no_center in parent:
+            union(list(parent))
+
+        groups = {}
+        for task in self.tasks:
+            center = next((op.work_center for op in task.operations if isinstance(op.work_center, str)), no_center)
+            groups.setdefault(find(center), ([], []))[0].append(task)
+        for worker in self.workers:
+            calendar = self.calendars.get(worker.worker_id)
+            if calendar is None:
+                continue
+            root = find(next(iter(calendar.work_centers), no_center))
+            if root in groups:
+                groups[root][1].append(worker)
+
+        partitions = []
+        for root, (tasks, workers) in groups.items():
+            centers = {center for center in parent if find(center) == root}
+            calendars = {worker.worker_id: self.calendars[worker.worker_id] for worker in workers}
+            partitions.append((centers, tasks, workers, calendars))
+        partitions.sort(key=lambda part: sum(len(task.operations) for task in part[1]), reverse=True)
+        return partitions
+
+    def solve(self) -> List[MaintenanceTask]:
+        """
+        Resolve as partições (em paralelo quando houver mais de uma) e junta as agendas.
+        """
+        self._tasks = {task.task_id: task for task in self.tasks}
+        self._workers = {worker.worker_id: worker for worker in self.workers}
+        jobs = [(self.solver, tasks, workers, calendars) for _, tasks, workers, calendars in self.partitions()]
+        if len(jobs) <= 1 or self.max_workers == 1:
+            results = map(_solve, jobs)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(_solve, jobs))
+
+        schedule = []
+        self.unscheduled = []
+        for scheduled, unscheduled, calendars in results:
+            schedule.extend(self._merge(task) for task in scheduled)
+            self.unscheduled.extend(self._original(task, operation) for task, operation in unscheduled)
+            self.calendars.update(calendars)
+        return schedule
+
+    def _original(self, task, operation):
+        """
+        Par (ordem, operação) de entrada correspondente a um par devolvido por uma partição (cópia, se veio de outro processo).
+        """
+        original = self._tasks.get(task.task_id, task)
+        return original, next((op for op in original.operations if op.operation_id == operation.operation_id), operation)
+
+    def _merge(self, solved: MaintenanceTask) -> MaintenanceTask:
+        """
+        Grava a agenda de uma ordem resolvida (cópia serializada ou indivíduo do GA) na ordem de entrada, com os
+        colaboradores de entrada (os do subprocesso são cópias), e registra as horas neles.
+        """
+        task = self._tasks.get(solved.task_id, solved)
+        if task is solved:
+            return task
+        for solved_operation in solved.operations:
+            _, operation = self._original(task, solved_operation)
+            for worker in list(operation.allocated_workers):
+                operation.unassign_worker(worker)
+            operation.due_date, operation.start_hour = solved_operation.due_date, solved_operation.start_hour
+            for worker in solved_operation.allocated_workers:
+                operation.assign_worker(self._workers.get(worker.worker_id, worker))
+        return task
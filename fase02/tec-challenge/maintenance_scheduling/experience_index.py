@@ -0,0 +1,142 @@
+# experience_index.py
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HALF_LIFE_DAYS = 180
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize_key(value):
+    """
+    Normaliza matrículas e equipamentos vindos de CSVs diferentes: 3, 3.0, '3' e '3.0' viram o inteiro 3;
+    textos não numéricos ficam como texto e valores ausentes viram None.
+    """
+    if value is None or value != value:
+        return None
+    text = str(value).strip()
+    if not text or text == 'nan':
+        return None
+    try:
+        number = float(text.replace(',', '.'))
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() else number
+
+
+class ExperienceIndex:
+    """
+    Índice de experiência colaborador x equipamento, montado uma única vez a partir do histórico de manutenção.
+
+    Guarda apenas os pares que aparecem no histórico (matriz esparsa): número de execuções, horas de
+    `trabalho_real` e uma pontuação com decaimento por recência (cada execução vale 0.5 ** (idade / meia-vida)).
+    Para cada equipamento, os colaboradores já ficam ordenados pela pontuação, então os k mais experientes
+    saem em O(k). É compartilhado pelos colaboradores (`Worker.experience`), pela alocação de
+    `MaintenanceTask`, pelas funções de fitness dos GAs e pelo TurnScheduling.
+
+    Attributes:
+        half_life_days (float): Meia-vida, em dias, do peso de uma execução.
+        reference_date (pd.Timestamp): Data em relação à qual a idade é medida (default: execução mais recente).
+        entries (dict): Mapeia (matrícula, equipamento) para (execuções, horas, pontuação).
+        by_worker (dict): Mapeia a matrícula para {equipamento: execuções} (linha da matriz).
+        ranking (dict): Mapeia o equipamento para [(matrícula, pontuação)], da maior para a menor pontuação.
+    """
+
+    def __init__(self, half_life_days=DEFAULT_HALF_LIFE_DAYS, reference_date=None):
+        self.half_life_days = half_life_days
+        self.reference_date = pd.Timestamp(reference_date) if reference_date is not None else None
+        self.entries: Dict[tuple, Tuple[int, float, float]] = {}
+        self.by_worker: Dict[object, Dict[object, int]] = {}
+        self.ranking: Dict[object, List[tuple]] = {}
+        self.top_scores: Dict[object, float] = {}
+
+    @classmethod
+    def from_csv(cls, historico_file, **kwargs):
+        return cls(**kwargs).build(pd.read_csv(historico_file))
+
+    @classmethod
+    def from_dataframe(cls, historico_df: pd.DataFrame, **kwargs):
+        return cls(**kwargs).build(historico_df)
+
+    def build(self, historico_df: pd.DataFrame):
+        """
+        Agrega o histórico (matricula, data_inicio_execucao, equipamento, trabalho_real) numa única passada.
+        """
+        # dtype object: com valores ausentes, o pandas converteria as matrículas inteiras para float
+        frame = pd.DataFrame({
+            'worker': pd.Series([normalize_key(value) for value in historico_df['matricula']], index=historico_df.index, dtype=object),
+            'asset': pd.Series([normalize_key(value) for value in historico_df['equipamento']], index=historico_df.index, dtype=object),
+        })
+        if 'trabalho_real' in historico_df:
+            frame['hours'] = pd.to_numeric(historico_df['trabalho_real'].astype(str).str.replace(',', '.'), errors='coerce').fillna(0.0)
+        else:
+            frame['hours'] = 0.0
+        if 'data_inicio_execucao' in historico_df:
+            dates = pd.to_datetime(historico_df['data_inicio_execucao'], format='%d/%m/%Y', errors='coerce')
+        else:
+            dates = pd.Series(pd.NaT, index=historico_df.index)
+        if self.reference_date is None:
+            self.reference_date = dates.max() if dates.notna().any() else pd.Timestamp.today().normalize()
+        # Execuções sem data contam com peso de uma execução de hoje
+        age = ((self.reference_date - dates).dt.days.fillna(0).clip(lower=0)).to_numpy(dtype=float)
+        frame['score'] = np.power(0.5, age / self.half_life_days)
+        frame = frame.dropna(subset=['worker', 'asset'])
+
+        grouped = frame.groupby(['worker', 'asset'], sort=False).agg(count=('score', 'size'), hours=('hours', 'sum'),
+                                                                     score=('score', 'sum'))
+        self.entries = {}
+        self.by_worker = {}
+        ranking = {}
+        for (worker, asset), count, hours, score in zip(grouped.index, grouped['count'], grouped['hours'], grouped['score']):
+            self.entries[(worker, asset)] = (int(count), float(hours), float(score))
+            self.by_worker.setdefault(worker, {})[asset] = int(count)
+            ranking.setdefault(asset, []).append((worker, float(score)))
+        self.ranking = {asset: sorted(workers, key=lambda item: item[1], reverse=True) for asset, workers in ranking.items()}
+        self.top_scores = {asset: workers[0][1] for asset, workers in self.ranking.items()}
+        return self
+
+    def __len__(self):
+        return len(self.entries)
+
+    def count(self, worker_id, asset) -> int:
+        return self.entries.get((normalize_key(worker_id), normalize_key(asset)), (0, 0.0, 0.0))[0]
+
+    def hours(self, worker_id, asset) -> float:
+        return self.entries.get((normalize_key(worker_id), normalize_key(asset)), (0, 0.0, 0.0))[1]
+
+    def score(self, worker_id, asset, normalized=False) -> float:
+        """
+        Pontuação de experiência com decaimento por recência. Com `normalized=True`, dividida pela maior
+        pontuação do equipamento (entre 0 e 1).
+        """
+        asset = normalize_key(asset)
+        score = self.entries.get((normalize_key(worker_id), asset), (0, 0.0, 0.0))[2]
+        if normalized and score:
+            return score / self.top_scores[asset]
+        return score
+
+    def assets_of(self, worker_id) -> Dict[object, int]:
+        """
+        Execuções por equipamento do colaborador (compatível com `Worker.experience_with_assets`).
+        """
+        return self.by_worker.get(normalize_key(worker_id), {})
+
+    def top_workers(self, asset, k=None) -> List[tuple]:
+        """
+        Os `k` colaboradores mais experientes no equipamento (todos, se k=None), como (matrícula, pontuação).
+        """
+        ranking = self.ranking.get(normalize_key(asset), [])
+        return ranking if k is None else ranking[:k]
+
+    def rank_workers(self, workers, asset) -> list:
+        """
+        Ordena `workers` (objetos Worker) colocando primeiro os experientes no equipamento, da maior para a
+        menor pontuação, seguidos dos demais na ordem original.
+        """
+        by_id = {}
+        for worker in workers:
+            by_id.setdefault(normalize_key(worker.worker_id), []).append(worker)
+        ranked = [worker for worker_id, _ in self.top_workers(asset) for worker in by_id.pop(worker_id, [])]
+        return ranked + [worker for worker in workers if normalize_key(worker.worker_id) in by_id]
@@ -1,3 +1,4 @@
+import array
 import pandas as pd
 import numpy as np
 from deap import base, creator, tools, algorithms
@@ -5,6 +6,14 @@ import random
 from datetime import datetime, timedelta
 import itertools
 import logging
+from skill_registry import SKILLS
+from run_controller import RunController
+from telemetry import GenerationTelemetry, unique_ratio
+from schedule_export import genome_frame
+from experience_index import ExperienceIndex
+
+# Colaboradores mais experientes no equipamento usados quando a ordem não tem qualificados no centro
+EXPERIENCE_TOP_K = 5
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, 
@@ -19,10 +28,18 @@ class TurnScheduling:
         
         # Preparar dados
         self.prepare_data()
+        self.prepare_genome()
         
         # Configurar DEAP
         self.setup_deap()
     
+    def __getstate__(self):
+        # Com toolbox.map paralelo, o evaluate é enviado aos processos: o toolbox (que contém o próprio pool.map)
+        # não é serializado, já que os processos apenas avaliam genomas
+        state = self.__dict__.copy()
+        state.pop('toolbox', None)
+        return state
+
     def prepare_data(self):
         # Garantir que colunas de qualificação sejam tratadas como strings
         self.ordens['qualificacao'] = self.ordens['qualificacao'].fillna('').astype(str)
@@ -33,6 +50,10 @@ class TurnScheduling:
         self.total_executores = int(self.ordens['quantidade_executantes'].sum())       
         self.disponibilidade['qualificacao'] = self.disponibilidade['qualificacao'].fillna('').astype(str)
         
+        # Índice de experiência por equipamento (contagens, horas e pontuação com decaimento por recência),
+        # montado antes da conversão para texto
+        self.experience = ExperienceIndex.from_dataframe(self.historico)
+        
         # Converter colunas para string
         self.ordens = self.ordens.astype(str)
         self.disponibilidade = self.disponibilidade.astype(str)
@@ -45,26 +66,66 @@ class TurnScheduling:
         except Exception as e:
             logging.warning(f"Erro ao ordenar ordens por IRPE: {e}")
         
-        # Criar dicionário de qualificações por funcionário
+        # Criar dicionário de qualificações por funcionário, como máscaras de bits do registro SKILLS
         self.employee_qualifications = {}
         for _, row in self.disponibilidade.iterrows():
             matricula = row['matricula']
-            qualificacoes = row['qualificacao'].split('/') if row['qualificacao'] else []
-            self.employee_qualifications[matricula] = set(qualificacoes)
-        
-        # Criar histórico de manutenção por equipamento
-        self.equipment_maintenance_history = {}
-        for _, row in self.historico.iterrows():
-            key = row['equipamento']
-            if key not in self.equipment_maintenance_history:
-                self.equipment_maintenance_history[key] = []
-            self.equipment_maintenance_history[key].append(row['matricula'])
+            qualificacoes = SKILLS.mask(SKILLS.parse(row['qualificacao']))
+            self.employee_qualifications[matricula] = self.employee_qualifications.get(matricula, 0) | qualificacoes
+        self.required_qualifications = {}
 
         # Adicionar logs de preparação
         logging.info(f"Total de ordens processadas: {len(self.ordens)}")
         logging.info(f"Total de funcionários: {len(self.disponibilidade)}")
         logging.info(f"Total de registros de histórico: {len(self.historico)}")
 
+    def prepare_genome(self):
+        # Codificação compacta do genoma: uma posição por executor (na ordem de self.ordens), guardando o índice
+        # da matrícula em self.employees (-1 = sem executor) num array de inteiros
+        self.employees = list(dict.fromkeys(self.disponibilidade['matricula']))
+        self.employee_index = {matricula: i for i, matricula in enumerate(self.employees)}
+        # Primeira linha de disponibilidade de cada matrícula (turno e centro usados nas verificações)
+        self.employee_rows = self.disponibilidade.drop_duplicates('matricula').set_index('matricula')
+        employee_center = self.employee_rows['centro_trabalho']
+        center_employees = {
+            centro: [self.employee_id(matricula) for matricula in dict.fromkeys(grupo['matricula'])]
+            for centro, grupo in self.disponibilidade.groupby('centro_trabalho')
+        }
+
+        # Candidatos por ordem: qualificados do centro, senão os mais experientes no equipamento, senão todo o centro.
+        # As listas são compartilhadas entre ordens com o mesmo (centro, qualificação, equipamento).
+        pools = {}
+        self.slot_rows = []
+        self.slot_pools = []
+        self.center_pools = []
+        for row, ordem in enumerate(self.ordens.itertuples(index=False)):
+            centro_trabalho = str(ordem.centro_trabalho)
+            equipamento = getattr(ordem, 'equipamento_ordem', None)
+            key = (centro_trabalho, ordem.qualificacao, equipamento)
+            if key not in pools:
+                qualificacoes = self.required_mask(ordem.qualificacao)
+                qualified_employees = [
+                    self.employee_id(emp) for emp, quals in self.employee_qualifications.items()
+                    if employee_center[emp] == centro_trabalho and SKILLS.has_all(quals, qualificacoes)
+                ]
+                if not qualified_employees and equipamento is not None:
+                    qualified_employees = [self.employee_id(str(emp)) for emp, _ in self.experience.top_workers(equipamento, k=EXPERIENCE_TOP_K)]
+                pools[key] = qualified_employees or center_employees.get(centro_trabalho, [])
+            quantidade_executantes = int(ordem.quantidade_executantes)
+            self.slot_rows.extend([row] * quantidade_executantes)
+            self.slot_pools.extend([pools[key]] * quantidade_executantes)
+            self.center_pools.extend([center_employees.get(centro_trabalho, [])] * quantidade_executantes)
+
+        # Penalidade de cada par (linha da ordem, gene), calculada na primeira vez em que o par aparece
+        self.penalties = {}
+
+    def employee_id(self, matricula):
+        # Matrículas vindas só do histórico também recebem um índice
+        if matricula not in self.employee_index:
+            self.employee_index[matricula] = len(self.employees)
+            self.employees.append(matricula)
+        return self.employee_index[matricula]
+
     def setup_deap(self):
         # Destruir criadores existentes para evitar erros de re-registro
         try:
@@ -75,16 +136,13 @@ class TurnScheduling:
         
         # Configurar framework DEAP para resolução do problema
         creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMin)
+        creator.create("Individual", array.array, typecode='i', fitness=creator.FitnessMin)
         
         # Criar toolbox
         self.toolbox = base.Toolbox()
         
-        # Definir operadores genéticos
-        self.toolbox.register("attr_employee", self.select_employee)
-        # Usar self.total_executores calculado em prepare_data
-        self.toolbox.register("individual", tools.initRepeat, creator.Individual, 
-                               self.toolbox.attr_employee, n=self.total_executores)
+        # Definir operadores genéticos: select_employee gera o genoma inteiro, daí initIterate
+        self.toolbox.register("individual", tools.initIterate, creator.Individual, self.select_employee)
         self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
         
         # Registrar funções de avaliação e seleção
@@ -92,72 +150,55 @@ class TurnScheduling:
         self.toolbox.register("mate", tools.cxTwoPoint)
         self.toolbox.register("mutate", self.mutate_schedule)
         self.toolbox.register("select", tools.selTournament, tournsize=3)
+        # Avaliações via toolbox.map: troque por pool.map (multiprocessing/SCOOP) para avaliar em paralelo
+        self.toolbox.register("map", map)
 
     def select_employee(self):
-        valid_employees = []
-        for _, ordem in self.ordens.iterrows():
-            centro_trabalho = str(ordem['centro_trabalho'])
-            qualificacoes = set(ordem['qualificacao'].split('/') if ordem['qualificacao'] else [])
-            quantidade_executantes = int(ordem['quantidade_executantes'])
-            
-            qualified_employees = [
-                emp for emp, quals in self.employee_qualifications.items()
-                if self.disponibilidade.loc[self.disponibilidade['matricula'] == emp, 'centro_trabalho'].iloc[0] == centro_trabalho
-                and (not qualificacoes or qualificacoes.issubset(quals))
-            ]
-            
-            if not qualified_employees and 'equipamento_ordem' in ordem:
-                equip_ordem = ordem['equipamento_ordem']
-                qualified_employees = self.equipment_maintenance_history.get(equip_ordem, [])
-            
-            employees_to_use = qualified_employees or self.disponibilidade[
-                self.disponibilidade['centro_trabalho'] == centro_trabalho
-            ]['matricula'].tolist()
-            
-            selected_employees = random.choices(employees_to_use, k=quantidade_executantes) if employees_to_use else [''] * quantidade_executantes
-            valid_employees.extend(selected_employees)
-        
-        return valid_employees
+        return [random.choice(pool) if pool else -1 for pool in self.slot_pools]
     
     def evaluate_schedule(self, individual):
         penalties = 0
-        index = 0
-        
-        for _, ordem in self.ordens.iterrows():
-            quantidade_executantes = int(ordem['quantidade_executantes'])
-            employees = individual[index:index + quantidade_executantes]
-            
-            for employee in employees:
-                if not isinstance(employee, str):
-                    logging.warning(f"Tipo inválido para funcionário: {type(employee)}")
-                    penalties += 200
-                    continue
+        for row, gene in zip(self.slot_rows, individual):
+            penalty = self.penalties.get((row, gene))
+            if penalty is None:
+                penalty = self.penalties[(row, gene)] = self.slot_penalty(row, gene)
+            penalties += penalty
+        return (penalties,)
 
-                if not employee:
-                    penalties += 200
-                    continue
-                
-                if not self.check_qualifications(employee, ordem):
-                    penalties += 100
-                
-                if not self.check_time_availability(employee, ordem):
-                    penalties += 50
-                
-                if not self.check_total_allocated_time(employee, ordem):
-                    penalties += 25
-            
-            index += quantidade_executantes
+    def slot_penalty(self, row, gene):
+        employee = self.employees[gene] if gene >= 0 else ''
+        if not isinstance(employee, str):
+            logging.warning(f"Tipo inválido para funcionário: {type(employee)}")
+            return 200
+
+        if not employee:
+            return 200
+
+        ordem = self.ordens.iloc[row]
+        penalty = 0
+        if not self.check_qualifications(employee, ordem):
+            penalty += 100
         
-        return (penalties,)
+        if not self.check_time_availability(employee, ordem):
+            penalty += 50
+        
+        if not self.check_total_allocated_time(employee, ordem):
+            penalty += 25
+        return penalty
     
     def check_qualifications(self, employee, ordem):
         if not employee or not isinstance(employee, str):
             logging.warning(f"Invalid employee type: {employee} (type: {type(employee)})")
             return False
         
-        emp_qualifications = self.employee_qualifications.get(employee, set())
-        req_qualifications = set(ordem.qualificacao.split('/') if ordem.qualificacao else [])
-        return not req_qualifications or req_qualifications.issubset(emp_qualifications)
+        emp_qualifications = self.employee_qualifications.get(employee, 0)
+        return SKILLS.has_all(emp_qualifications, self.required_mask(ordem.qualificacao))
+
+    def required_mask(self, qualificacao):
+        # Máscara das qualificações exigidas, calculada uma vez por texto distinto de 'qualificacao'
+        if qualificacao not in self.required_qualifications:
+            self.required_qualifications[qualificacao] = SKILLS.mask(SKILLS.parse(qualificacao))
+        return self.required_qualifications[qualificacao]
 
     def check_time_availability(self, employee, ordem):
         # Skip validation if no employee is assigned
@@ -166,7 +207,7 @@ class TurnScheduling:
         
         # Verificar se o horário da ordem respeita o turno do funcionário
         try:
-            emp_data = self.disponibilidade[self.disponibilidade['matricula'] == employee].iloc[0]
+            emp_data = self.employee_rows.loc[employee]
             ordem_start = datetime.strptime(f"{ordem.data_inicio_base} {ordem.hora_inicio_base}", "%Y-%m-%d %H:%M")
             return (datetime.strptime(emp_data['hora_inicio'], "%H:%M") <= ordem_start and
                     datetime.strptime(emp_data['hora_fim'], "%H:%M") >= ordem_start)
@@ -180,28 +221,40 @@ class TurnScheduling:
         
         # Verificar tempo total alocado do funcionário
         try:
-            emp_data = self.disponibilidade[self.disponibilidade['matricula'] == employee].iloc[0]
+            emp_data = self.employee_rows.loc[employee]
             return emp_data['hora_total'] >= ordem.esforco_individual
         except Exception:
             return False
     
     def mutate_schedule(self, individual, indpb=0.1):
-        index = 0
-        for _, ordem in self.ordens.iterrows():
-            quantidade_executantes = int(ordem['quantidade_executantes'])
-            for i in range(index, index + quantidade_executantes):
-                if random.random() < indpb:
-                    valid_employees = self.disponibilidade[
-                        (self.disponibilidade['centro_trabalho'] == ordem['centro_trabalho'])
-                    ]['matricula'].tolist()
-                    individual[i] = random.choice(valid_employees or [''])
-            index += quantidade_executantes
+        for i, pool in enumerate(self.center_pools):
+            if random.random() < indpb:
+                individual[i] = random.choice(pool) if pool else -1
         return (individual,)
 
-    def solve(self, population_size=100, generations=50):
+    def solve(self, population_size=100, generations=50, controller: RunController = None, telemetry: GenerationTelemetry = None,
+              offspring_size=None, cxpb=0.7, mutpb=0.2, hall_of_fame_size=1, map_function=None):
+        """
+        Executa o GA (estratégia µ+λ) por `generations` gerações (None = sem limite) ou até o `controller` pedir a
+        parada (orçamento de tempo, estagnação, fitness alvo ou Ctrl+C); a agenda do melhor indivíduo do hall da
+        fama é sempre retornada. Com `telemetry`, cada geração registra o tempo por fase, as avaliações, as
+        estatísticas de fitness e a diversidade.
+
+        A cada geração, `offspring_size` filhos (λ, default 2µ) são gerados por crossover OU mutação e os
+        `population_size` (µ) sobreviventes são selecionados entre pais e filhos. `map_function` (ex.: `pool.map`)
+        substitui o `toolbox.map` usado nas avaliações.
+        """
         logging.info(f"Iniciando otimização com {population_size} indivíduos e {generations} gerações")
+        controller = controller or RunController(maximize=False)
+        offspring_size = offspring_size or 2 * population_size
+        if map_function is not None:
+            self.toolbox.register("map", map_function)
+        if telemetry:
+            for name, phase in (('select', 'selection'), ('mate', 'crossover'), ('mutate', 'mutation'), ('evaluate', 'evaluation')):
+                setattr(self.toolbox, name, telemetry.wrap(phase, getattr(self.toolbox, name)))
         
         population = self.toolbox.population(n=population_size)
+        hall_of_fame = tools.HallOfFame(hall_of_fame_size)
         
         stats = tools.Statistics(lambda ind: ind.fitness.values)
         stats.register("avg", np.mean)
@@ -212,49 +265,52 @@ class TurnScheduling:
         logbook.header = ['gen', 'nevals'] + (stats.fields if stats else [])
 
         # Evaluate the entire population
-        fitnesses = list(map(self.toolbox.evaluate, population))
+        fitnesses = self.toolbox.map(self.toolbox.evaluate, population)
         for ind, fit in zip(population, fitnesses):
             ind.fitness.values = fit
+        hall_of_fame.update(population)
 
-        for gen in range(generations):
-            offspring = algorithms.varAnd(population, self.toolbox, cxpb=0.7, mutpb=0.2)
+        telemetry = telemetry or GenerationTelemetry()
+        with controller, telemetry.profile():
+            telemetry.start()
+            gen = 0
+            while generations is None or gen < generations:
+                offspring = algorithms.varOr(population, self.toolbox, offspring_size, cxpb=cxpb, mutpb=mutpb)
             
-            # Evaluate the individuals with an invalid fitness
-            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = map(self.toolbox.evaluate, invalid_ind)
-            for ind, fit in zip(invalid_ind, fitnesses):
-                ind.fitness.values = fit
+                # Evaluate the individuals with an invalid fitness
+                invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+                fitnesses = self.toolbox.map(self.toolbox.evaluate, invalid_ind)
+                for ind, fit in zip(invalid_ind, fitnesses):
+                    ind.fitness.values = fit
+                hall_of_fame.update(offspring)
             
-            # Select the next generation population
-            population[:] = self.toolbox.select(offspring, k=len(population))
+                # Select the next generation population among parents and offspring (µ+λ)
+                population[:] = self.toolbox.select(population + offspring, population_size)
             
-            # Append the current generation statistics to the logbook
-            record = stats.compile(population) if stats else {}
-            logbook.record(gen=gen, nevals=len(invalid_ind), **record)
-            logging.info(f"Geração {gen}: {record}")
+                # Append the current generation statistics to the logbook
+                record = stats.compile(population) if stats else {}
+                logbook.record(gen=gen, nevals=len(invalid_ind), **record)
+                logging.info(f"Geração {gen}: {record}")
+                if telemetry.path:
+                    telemetry.record(gen, [ind.fitness.values[0] for ind in population], diversity=unique_ratio(population, key=bytes))
+
+                gen += 1
+                if not controller.update(hall_of_fame[0].fitness.values[0]):
+                    logging.info(f"Parada na geração {gen} ({controller.stop_reason}) após {controller.elapsed:.1f}s")
+                    break
 
-        best_schedule = tools.selBest(population, k=1)[0]
+        best_schedule = hall_of_fame[0]
         logging.info(f"Melhor solução encontrada com fitness: {best_schedule.fitness.values[0]}")
         
         return self.format_schedule(best_schedule)
 
     def format_schedule(self, solution):
-        schedule_results = []
-        index = 0
-        for _, ordem in self.ordens.iterrows():
-            quantidade_executantes = int(ordem['quantidade_executantes'])
-            employees = solution[index:index + quantidade_executantes]
-            for employee in employees:
-                schedule_results.append({
-                    'ordem': ordem['ordem'],
-                    'operacao': ordem['operacao'],
-                    'matricula': employee,
-                    'data_inicio_base': ordem['data_inicio_base'],
-                    'horario_alocado': ordem['hora_inicio_base']
-                })
-            index += quantidade_executantes
-        
-        return pd.DataFrame(schedule_results)
+        """
+        Converte o genoma (um índice de matrícula por executor, na ordem de self.ordens) na agenda em DataFrame,
+        de forma vetorizada; posições sem executor ficam com matrícula vazia.
+        """
+        matriculas = np.array(self.employees + [''], dtype=object)
+        return genome_frame(self.ordens, matriculas[np.asarray(solution, dtype=np.intp)].tolist())
 
 # Exemplo de uso
 def main():
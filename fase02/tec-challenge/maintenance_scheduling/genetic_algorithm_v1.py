@@ -3,20 +3,45 @@ import random
 from typing import List
 from task import MaintenanceTask
 from worker import Worker
+from run_controller import RunController
+from telemetry import GenerationTelemetry, unique_ratio
 
 class GeneticAlgorithm:
     """
     Implementa o Algoritmo Genético para otimizar o planejamento de manutenção.
     """
 
-    def __init__(self, tasks: List[MaintenanceTask], workers: List[Worker], population_size=50, generations=50, mutation_rate=0.05):
+    def __init__(self, tasks: List[MaintenanceTask], workers: List[Worker], population_size=50, generations=50, mutation_rate=0.05, seed: List[MaintenanceTask] = None, mutation_operator=None, controller: RunController = None, telemetry: GenerationTelemetry = None):
         self.tasks = tasks
         self.workers = workers
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
+        self.seed = seed
+        self.mutation_operator = mutation_operator
+        self.controller = controller
+        self.telemetry = telemetry
+        if telemetry:
+            # Instrumenta as fases do GA; sem telemetria os métodos ficam intactos (custo zero)
+            self.selection = telemetry.wrap('selection', self.selection)
+            self.crossover = telemetry.wrap('crossover', self.crossover)
+            self.mutate = telemetry.wrap('mutation', self.mutate)
+            self.fitness = telemetry.wrap('evaluation', self.fitness)
+
+    def genes(self, individual):
+        """
+        Genes do indivíduo na ordem de `self.tasks`: o gene i é a ordem self.tasks[i] (ou a sua cópia), com a sua agenda.
+        """
+        by_id = {task.task_id: task for task in individual}
+        return [by_id[task.task_id] for task in self.tasks]
 
     def initial_population(self):
+        if self.seed:
+            # População semeada pela agenda do GreedyScheduler: os trabalhadores já estão alocados. Todos os
+            # indivíduos seguem a ordem de `self.tasks`; só a agenda varia (pelo operador de mutação, se houver)
+            seed = self.genes(self.seed)
+            vary = self.mutation_operator or list
+            return [seed] + [vary(list(seed)) for _ in range(self.population_size - 1)]
         population = []
         for _ in range(self.population_size):
             individual = []
@@ -32,10 +57,10 @@ class GeneticAlgorithm:
             for operation in task.operations:
                 for worker in operation.allocated_workers:                        
                     # Peso para habilidades compatíveis
-                    if worker.has_skill(operation.required_skill):
+                    if worker.has_skill(operation.required_mask):
                         score += 3                    
                     # Peso maior para experiência no ativo
-                    if worker.experience_with_assets.get(operation.asset, 0) > 0:
+                    if worker.experience_score(operation.asset) > 0:
                         score += 2
                     # Verificar disponibilidade
                     if worker.is_available(date=operation.due_date,start_time=operation.start_hour,effort=operation.effort):
@@ -48,12 +73,17 @@ class GeneticAlgorithm:
         return population[:int(len(population) / 2)]
 
     def crossover(self, parent1, parent2):
+        # Genes alinhados pela ordem (ver `genes`): o filho contém cada ordem exatamente uma vez
+        parent1, parent2 = self.genes(parent1), self.genes(parent2)
         point = random.randint(0, len(self.tasks) - 1)
         child = parent1[:point] + parent2[point:]
         return child
 
     def mutate(self, individual):
         if random.random() < self.mutation_rate:
+            if self.mutation_operator:
+                # Operador plugável, ex.: LocalSearch.mutate ou LocalSearch.memetic
+                return self.mutation_operator(individual)
             index = random.randint(0, len(individual) - 1)
             task = individual[index]
             task.assign_workers_to_operations(self.workers)
@@ -71,9 +101,28 @@ class GeneticAlgorithm:
         return new_population
 
     def optimize(self):
+        """
+        Evolui a população por `generations` gerações (None = sem limite) ou até o `controller` pedir a parada
+        (orçamento de tempo, estagnação, fitness alvo ou Ctrl+C) e retorna o melhor indivíduo encontrado.
+        """
         population = self.initial_population()
-        for generation in range(self.generations):
-            population = self.evolve(population)
-            best_individual = max(population, key=lambda ind: self.fitness(ind))
-            print(f"Generation {generation} | Best Fitness: {self.fitness(best_individual)}")
+        best_individual, best_fitness = None, None
+        telemetry = self.telemetry or GenerationTelemetry()
+        with self.controller or RunController() as controller, telemetry.profile():
+            telemetry.start()
+            generation = 0
+            while self.generations is None or generation < self.generations:
+                population = self.evolve(population)
+                scores = [self.fitness(ind) for ind in population]
+                fitness = max(scores)
+                individual = population[scores.index(fitness)]
+                if best_fitness is None or fitness > best_fitness:
+                    best_individual, best_fitness = individual, fitness
+                print(f"Generation {generation} | Best Fitness: {fitness}")
+                if self.telemetry:
+                    self.telemetry.record(generation, scores, diversity=unique_ratio(population, key=lambda ind: tuple(map(id, ind))))
+                generation += 1
+                if not controller.update(fitness):
+                    print(f"Parada na geração {generation} ({controller.stop_reason}) após {controller.elapsed:.1f}s")
+                    break
         return best_individual
@@ -3,20 +3,45 @@ import random
 from typing import List
 from task import MaintenanceTask
 from worker import Worker
+from run_controller import RunController
+from telemetry import GenerationTelemetry, unique_ratio
 
 class GeneticAlgorithm:
     """
     Implementa o Algoritmo Genético para otimizar o planejamento de manutenção.
     """
 
-    def __init__(self, tasks: List[MaintenanceTask], workers: List[Worker], population_size=50, generations=50, mutation_rate=0.05):
+    def __init__(self, tasks: List[MaintenanceTask], workers: List[Worker], population_size=50, generations=50, mutation_rate=0.05, seed: List[MaintenanceTask] = None, mutation_operator=None, controller: RunController = None, telemetry: GenerationTelemetry = None):
         self.tasks = tasks
         self.workers = workers
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
+        self.seed = seed
+        self.mutation_operator = mutation_operator
+        self.controller = controller
+        self.telemetry = telemetry
+        if telemetry:
+            # Instrumenta as fases do GA; sem telemetria os métodos ficam intactos (custo zero)
+            self.selection = telemetry.wrap('selection', self.selection)
+            self.crossover = telemetry.wrap('crossover', self.crossover)
+            self.mutate = telemetry.wrap('mutation', self.mutate)
+            self.fitness = telemetry.wrap('evaluation', self.fitness)
+
+    def genes(self, individual):
+        """
+        Genes do indivíduo na ordem de `self.tasks`: o gene i é a ordem self.tasks[i] (ou a sua cópia), com a sua agenda.
+        """
+        by_id = {task.task_id: task for task in individual}
+        return [by_id[task.task_id] for task in self.tasks]
 
     def initial_population(self):
+        if self.seed:
+            # População semeada pela agenda do GreedyScheduler: os trabalhadores já estão alocados. Todos os
+            # indivíduos seguem a ordem de `self.tasks`; só a agenda varia (pelo operador de mutação, se houver)
+            seed = self.genes(self.seed)
+            vary = self.mutation_operator or list
+            return [seed] + [vary(list(seed)) for _ in range(self.population_size - 1)]
         population = []
         for _ in range(self.population_size):
             individual = []
@@ -39,7 +64,7 @@ class GeneticAlgorithm:
             for operation in task.operations:
                 # Critério 1: Verificar se os trabalhadores alocados têm as qualificações necessárias
                 for worker in operation.allocated_workers:
-                    if worker.has_skill(operation.required_skill):
+                    if worker.has_skill(operation.required_mask):
                         score += 10  # Aumenta a pontuação para trabalhadores qualificados
 
                 # Critério 2: Priorização de ordens com maior índice de prioridade (indice_irpe)
@@ -58,6 +83,10 @@ class GeneticAlgorithm:
                     if worker.is_available(operation.due_date, operation.start_hour, operation.effort):
                         score += 5  # Recompensa por um bom uso da disponibilidade
 
+                # Critério 6: Recompensa pela experiência recente dos trabalhadores no ativo (0 a 2 por trabalhador)
+                for worker in operation.allocated_workers:
+                    score += 2 * worker.experience_score(operation.asset, normalized=True)
+
         return score
     
     def selection(self, population):
@@ -75,7 +104,9 @@ class GeneticAlgorithm:
     def crossover(self, parent1, parent2):
         """
         Executa o crossover entre dois pais, combinando diferentes partes de ambos para gerar um filho mais diversificado.
+        Os genes são alinhados pela ordem (ver `genes`), então o filho contém cada ordem exatamente uma vez.
         """
+        parent1, parent2 = self.genes(parent1), self.genes(parent2)
         point1 = random.randint(0, len(self.tasks) // 2)
         point2 = random.randint(point1, len(self.tasks) - 1)
         
@@ -86,8 +117,11 @@ class GeneticAlgorithm:
     def mutate(self, individual):
         """
         Realiza a mutação em um indivíduo para introduzir variação. A mutação troca dois genes (operações).
+        Se um `mutation_operator` foi informado (ex.: LocalSearch.mutate ou LocalSearch.memetic), ele é usado no lugar da troca.
         """
         if random.random() < self.mutation_rate:
+            if self.mutation_operator:
+                return self.mutation_operator(individual)
             idx1 = random.randint(0, len(individual) - 1)
             idx2 = random.randint(0, len(individual) - 1)
             individual[idx1], individual[idx2] = individual[idx2], individual[idx1]  # Troca os genes
@@ -118,9 +152,28 @@ class GeneticAlgorithm:
         return new_population
 
     def optimize(self):
+        """
+        Evolui a população por `generations` gerações (None = sem limite) ou até o `controller` pedir a parada
+        (orçamento de tempo, estagnação, fitness alvo ou Ctrl+C) e retorna o melhor indivíduo encontrado.
+        """
         population = self.initial_population()
-        for generation in range(self.generations):
-            population = self.evolve(population)
-            best_individual = max(population, key=lambda ind: self.fitness(ind))
-            print(f"Generation {generation} | Best Fitness: {self.fitness(best_individual)}")
+        best_individual, best_fitness = None, None
+        telemetry = self.telemetry or GenerationTelemetry()
+        with self.controller or RunController() as controller, telemetry.profile():
+            telemetry.start()
+            generation = 0
+            while self.generations is None or generation < self.generations:
+                population = self.evolve(population)
+                scores = [self.fitness(ind) for ind in population]
+                fitness = max(scores)
+                individual = population[scores.index(fitness)]
+                if best_fitness is None or fitness > best_fitness:
+                    best_individual, best_fitness = individual, fitness
+                print(f"Generation {generation} | Best Fitness: {fitness}")
+                if self.telemetry:
+                    self.telemetry.record(generation, scores, diversity=unique_ratio(population, key=lambda ind: tuple(map(id, ind))))
+                generation += 1
+                if not controller.update(fitness):
+                    print(f"Parada na geração {generation} ({controller.stop_reason}) após {controller.elapsed:.1f}s")
+                    break
         return best_individual
@@ -0,0 +1,151 @@
+# greedy_scheduler.py
+import heapq
+from datetime import timedelta
+from typing import Dict, List
+
+from run_controller import RunController
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+from util import time_to_minutes, minutes_to_time, unique_workers
+
+DEFAULT_HORIZON_DAYS = 7  # dias que uma operação pode ser postergada além da data prevista
+
+
+class WorkerIndex:
+    """
+    Índice dos colaboradores com agenda por centro de trabalho e máscara de qualificações, montado uma única vez.
+
+    `candidates` devolve os colaboradores que podem atender a operação: do mesmo centro de trabalho (ou de
+    qualquer centro, se o colaborador não tiver nenhum) e, quando houver, com a qualificação exigida; sem
+    ninguém qualificado, vale o centro de trabalho inteiro. A resposta só depende de (centro, máscara exigida)
+    e é guardada, então cada operação custa uma consulta a dicionário em vez de uma varredura de todos os
+    colaboradores. A ordem da lista de colaboradores é preservada.
+    """
+
+    def __init__(self, workers: List[Worker], calendars: Dict[str, WorkerCalendar]):
+        self.workers = [worker for worker in workers if worker.worker_id in calendars]
+        self.by_center: Dict[str, Dict[int, list]] = {}
+        self.anywhere: Dict[int, list] = {}  # colaboradores sem centro de trabalho
+        self.by_mask: Dict[int, list] = {}
+        for position, worker in enumerate(self.workers):
+            self.by_mask.setdefault(worker.skill_mask, []).append((position, worker))
+            centers = calendars[worker.worker_id].work_centers
+            for groups in [self.by_center.setdefault(center, {}) for center in centers] or [self.anywhere]:
+                groups.setdefault(worker.skill_mask, []).append((position, worker))
+        self._cache: Dict[tuple, List[Worker]] = {}
+
+    def _lookup(self, work_center, required_mask) -> List[Worker]:
+        groups = [self.by_mask] if work_center is None else [self.by_center.get(work_center, {}), self.anywhere]
+        qualified = [entry for group in groups for mask, entries in group.items() if mask & required_mask for entry in entries]
+        pool = qualified or [entry for group in groups for entries in group.values() for entry in entries]
+        return [worker for _, worker in sorted(pool, key=lambda entry: entry[0])]
+
+    def candidates(self, operation) -> List[Worker]:
+        key = (operation.work_center, operation.required_mask)
+        if key not in self._cache:
+            self._cache[key] = self._lookup(*key)
+        return self._cache[key]
+
+
+class GreedyScheduler:
+    """
+    Construtor guloso de agendas de manutenção com controle de capacidade em vários dias.
+
+    As ordens saem de uma fila de prioridade por (maior indice_irpe, data prevista) e cada operação,
+    na ordem crescente de `operacao`, é colocada no primeiro horário livre em que a quantidade de
+    colaboradores exigida esteja disponível simultaneamente, respeitando turnos e intervalos de
+    cada colaborador (ver `WorkerCalendar`). Se não houver espaço na data prevista, a operação é
+    postergada para os dias seguintes, até `horizon_days`.
+
+    O resultado pode ser usado como agenda final (modo autônomo) ou como semente da população
+    inicial dos algoritmos genéticos.
+
+    Attributes:
+        tasks (list): Ordens de serviço a serem agendadas.
+        workers (list): Colaboradores (um por matrícula).
+        calendars (dict): Mapeia a matrícula para a sua `WorkerCalendar`.
+        horizon_days (int): Quantidade máxima de dias que uma operação pode ser postergada.
+        unscheduled (list): Pares (ordem, operação) que não couberam no horizonte.
+        index (WorkerIndex): Colaboradores candidatos por centro de trabalho e qualificação.
+    """
+
+    def __init__(self, tasks: List[MaintenanceTask], workers: List[Worker], calendars: Dict[str, WorkerCalendar], horizon_days=DEFAULT_HORIZON_DAYS):
+        self.tasks = tasks
+        self.workers = unique_workers(workers)
+        self.calendars = calendars
+        self.horizon_days = horizon_days
+        self.unscheduled = []
+        self.index = WorkerIndex(self.workers, calendars)
+
+    def _earliest_common_slot(self, candidates, day, release, effort, quantity):
+        """
+        Encontra o primeiro horário >= release em que `quantity` colaboradores estão livres ao mesmo tempo.
+        Em caso de empate no horário, prefere quem tem mais execuções no ativo.
+        Retorna (inicio, colaboradores) ou None.
+        """
+        start = release
+        while True:
+            slots = []
+            for worker, experience in candidates:
+                slot = self.calendars[worker.worker_id].earliest_slot(day, start, effort)
+                if slot is not None:
+                    slots.append((slot, -experience, len(slots), worker))
+            if len(slots) < quantity:
+                return None
+            chosen = heapq.nsmallest(quantity, slots)
+            latest = chosen[-1][0]
+            if all(self.calendars[worker.worker_id].is_free(day, latest, effort) for _, _, _, worker in chosen):
+                return latest, [worker for _, _, _, worker in chosen]
+            start = latest
+
+    def _place(self, operation, earliest_day, release):
+        """
+        Coloca a operação no primeiro dia/horário viável a partir de (earliest_day, release).
+        Retorna o fim da operação (dia, minuto) ou None se não couber no horizonte.
+        """
+        candidates = [(worker, worker.experience_with_assets.get(operation.asset, 0)) for worker in self.index.candidates(operation)]
+        quantity = max(int(operation.quantity or 1), 1)
+        for offset in range(self.horizon_days + 1):
+            day = earliest_day + timedelta(days=offset)
+            slot = self._earliest_common_slot(candidates, day, release if offset == 0 else 0, operation.effort, quantity)
+            if slot is None:
+                continue
+            start, chosen = slot
+            operation.due_date = day
+            operation.start_hour = minutes_to_time(start)
+            for worker in chosen:
+                self.calendars[worker.worker_id].reserve(day, start, operation.effort)
+                operation.assign_worker(worker)
+            return day, start + operation.effort
+        return None
+
+    def schedule(self, controller: RunController = None) -> List[MaintenanceTask]:
+        """
+        Agenda todas as ordens e retorna a lista de ordens na sequência de prioridade. Com um `controller`, o
+        orçamento de tempo é verificado antes de cada ordem; esgotado, as ordens restantes são devolvidas sem
+        agenda (em `unscheduled`) e o motivo fica em `controller.stop_reason`.
+        """
+        queue = [(-task.priority, task.due_date, index, task) for index, task in enumerate(self.tasks)]
+        heapq.heapify(queue)
+
+        scheduled = []
+        self.unscheduled = []
+        while queue:
+            _, _, _, task = heapq.heappop(queue)
+            if controller is not None and controller.should_stop():
+                self.unscheduled.extend((task, op) for op in sorted(task.operations, key=lambda op: op.operation_id))
+                scheduled.append(task)
+                continue
+            operations = sorted(task.operations, key=lambda op: op.operation_id)
+            day = task.due_date
+            release = time_to_minutes(operations[0].start_hour) if operations and isinstance(operations[0].start_hour, str) else 0
+            for position, operation in enumerate(operations):
+                placed = self._place(operation, day, release)
+                if placed is None:
+                    # As operações seguintes dependem desta, então a ordem fica incompleta
+                    self.unscheduled.extend((task, op) for op in operations[position:])
+                    break
+                day, release = placed
+            scheduled.append(task)
+        return scheduled
@@ -0,0 +1,162 @@
+# instance_generator.py
+import argparse
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+ORDENS_COLUMNS = ['ordem', 'operacao', 'centro_trabalho_id', 'centro_trabalho', 'data_inicio_base', 'hora_inicio_base',
+                  'data_fim_base', 'hora_fim_base', 'indice_irpe', 'quantidade_executantes', 'esforco_individual',
+                  'unidade_esforco_individual', 'chave_modelo', 'equipamento_ordem', 'local_instalacao_ordem',
+                  'roteiro_operacoes', 'lista_tarefas_id', 'qualificacao', 'proficiencia_qualif', 'habilidade',
+                  'proficiencia_hab']
+DISPONIBILIDADE_COLUMNS = ['centro_trabalho', 'matricula', 'nome', 'grau_utilizacao_ct', 'distribuicao', 'tipo_turno',
+                           'inicio_vigencia', 'hora_inicio_trabalho', 'horas_trabalho', 'fim_vigencia', 'horas_folga',
+                           'dia', 'hora_inicio', 'hora_inicio_intervalo', 'hora_fim_intervalo', 'hora_fim',
+                           'hora_total', 'qualificacao']
+HISTORICO_COLUMNS = ['matricula', 'data_inicio_execucao', 'equipamento', 'trabalho_real']
+
+BASE_SKILLS = ['NR10', 'NR13', 'NR35', 'NR33', 'NR12', 'EPI', 'TAQ', 'SOLDA']
+# (hora_inicio, hora_inicio_intervalo, hora_fim_intervalo, hora_fim, hora_total)
+SHIFTS = [('08:00', '12:00', '13:00', '17:00', '08:00'),
+          ('06:00', '10:00', '11:00', '15:00', '08:00'),
+          ('14:00', '18:00', '19:00', '23:00', '08:00')]
+EFFORTS = ['0,5', '1', '1,5', '2', '3', '4']
+START_DATE = date(2025, 1, 6)  # segunda-feira
+FIRST_ORDER = 5000000
+FIRST_ASSET = 10000000
+
+
+def _skill_names(skills):
+    return BASE_SKILLS[:skills] + [f"QL{i:03}" for i in range(len(BASE_SKILLS), skills)]
+
+
+def _format_dates(days: np.ndarray, start: date) -> np.ndarray:
+    # Datas no formato d/m/aaaa do SAP, formatadas uma vez por dia distinto
+    unique, inverse = np.unique(days, return_inverse=True)
+    labels = np.array([f"{d.day}/{d.month}/{d.year}" for d in (start + timedelta(days=int(u)) for u in unique)], dtype=object)
+    return labels[inverse]
+
+
+def generate_instance(output_dir, orders=1000, workers=20, skills=6, work_centers=4, horizon_days=30,
+                      max_operations=4, history_per_worker=20, assets=None, qualified_ratio=0.3, seed=None,
+                      start_date=START_DATE):
+    """
+    Gera uma instância sintética com os mesmos esquemas de ordens_manutencao_full.csv, disponibilidade_full.csv
+    e historico_manutencao.csv e grava os arquivos em `output_dir`.
+
+    Cada ordem tem de 1 a `max_operations` operações (10, 20, ...) em um centro de trabalho, data de início
+    uniforme nos `horizon_days` dias a partir de `start_date` e `qualified_ratio` das operações exige de uma a
+    duas qualificações. Cada colaborador pertence a um ou dois centros de trabalho, trabalha de segunda a sexta
+    em um dos turnos de SHIFTS e possui de uma a três qualificações.
+
+    Retorna os caminhos (ordens, disponibilidade, historico).
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    skill_names = np.array(_skill_names(skills), dtype=object)
+    centers = np.array([f"CT_{i:03}" for i in range(work_centers)], dtype=object)
+    assets = assets or max(10, orders // 20)
+
+    # Ordens: uma linha por operação
+    per_order = rng.integers(1, max_operations + 1, size=orders)
+    order_index = np.repeat(np.arange(orders), per_order)
+    operations = len(order_index)
+    first_row = np.cumsum(per_order) - per_order
+    operation_id = (np.arange(operations) - np.repeat(first_row, per_order) + 1) * 10
+    order_center = rng.integers(0, work_centers, size=orders)[order_index]
+    order_days = rng.integers(0, horizon_days, size=orders)[order_index]
+    dates = _format_dates(order_days, start_date)
+    order_asset = (FIRST_ASSET + rng.integers(0, assets, size=orders))[order_index]
+
+    qualificacao = np.full(operations, np.nan, dtype=object)
+    requires = np.flatnonzero(rng.random(operations) < qualified_ratio)
+    first_skill = rng.integers(0, skills, size=len(requires))
+    second_skill = rng.integers(0, skills, size=len(requires))
+    two = rng.random(len(requires)) < 0.3
+    qualificacao[requires] = np.where(two & (first_skill != second_skill),
+                                      skill_names[first_skill] + ' / ' + skill_names[second_skill],
+                                      skill_names[first_skill])
+
+    ordens = pd.DataFrame({
+        'ordem': FIRST_ORDER + order_index,
+        'operacao': operation_id,
+        'centro_trabalho_id': 10000001 + order_center,
+        'centro_trabalho': centers[order_center],
+        'data_inicio_base': dates,
+        'hora_inicio_base': np.nan,
+        'data_fim_base': dates,
+        'hora_fim_base': '23:59:59',
+        'indice_irpe': rng.integers(1, 51, size=orders)[order_index],
+        'quantidade_executantes': rng.choice([1, 1, 1, 2], size=operations),
+        'esforco_individual': np.array(EFFORTS, dtype=object)[rng.integers(0, len(EFFORTS), size=operations)],
+        'unidade_esforco_individual': 'H',
+        'chave_modelo': np.nan,
+        'equipamento_ordem': order_asset,
+        'local_instalacao_ordem': 'ITSS-GYN1-PRED-SLRN',
+        'roteiro_operacoes': 1000000000 + FIRST_ORDER + order_index,
+        'lista_tarefas_id': np.nan,
+        'qualificacao': qualificacao,
+        'proficiencia_qualif': np.nan,
+        'habilidade': np.nan,
+        'proficiencia_hab': np.nan,
+    }, columns=ORDENS_COLUMNS)
+
+    # Disponibilidade: uma linha por (centro de trabalho, colaborador, dia útil)
+    matriculas = np.arange(1, workers + 1)
+    worker_skills = []
+    for _ in range(workers):
+        chosen = rng.choice(skills, size=min(skills, rng.integers(1, 4)), replace=False)
+        worker_skills.append(' / '.join(skill_names[sorted(chosen)]))
+    memberships = [(center, worker) for worker in range(workers)
+                   for center in {worker % work_centers, int(rng.integers(0, work_centers))}]
+    worker_shift = rng.integers(0, len(SHIFTS), size=workers)
+    rows = []
+    for center, worker in memberships:
+        hora_inicio, inicio_intervalo, fim_intervalo, hora_fim, hora_total = SHIFTS[worker_shift[worker]]
+        for dia in range(1, 6):
+            rows.append((centers[center], matriculas[worker], f"Colaborador {matriculas[worker]}", 85, 20,
+                         'TURNO_SEMANAL', '00:00,0', np.nan, np.nan, '00:00,0', np.nan, dia, hora_inicio,
+                         inicio_intervalo, fim_intervalo, hora_fim, hora_total, worker_skills[worker]))
+    disponibilidade = pd.DataFrame(rows, columns=DISPONIBILIDADE_COLUMNS)
+
+    # Histórico: execuções passadas de cada colaborador em equipamentos da instância
+    history = workers * history_per_worker
+    history_days = rng.integers(-365, 0, size=history)
+    trabalho = np.round(rng.uniform(0.1, 4.0, size=history), 1)
+    historico = pd.DataFrame({
+        'matricula': np.repeat(matriculas, history_per_worker),
+        'data_inicio_execucao': _format_dates(history_days, start_date),
+        'equipamento': FIRST_ASSET + rng.integers(0, assets, size=history),
+        'trabalho_real': [f"{value:g}".replace('.', ',') for value in trabalho],
+    }, columns=HISTORICO_COLUMNS)
+
+    paths = tuple(os.path.join(output_dir, name) for name in
+                  ('ordens_manutencao.csv', 'disponibilidade.csv', 'historico_manutencao.csv'))
+    for frame, path in zip((ordens, disponibilidade, historico), paths):
+        frame.to_csv(path, index=False)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma instância sintética de agenda de manutenção.")
+    parser.add_argument("output_dir", help="Diretório de saída dos arquivos CSV.")
+    parser.add_argument("--orders", type=int, default=1000, help="Número de ordens (default: 1000).")
+    parser.add_argument("--max-operations", type=int, default=4, help="Máximo de operações por ordem (default: 4).")
+    parser.add_argument("--workers", type=int, default=20, help="Número de colaboradores (default: 20).")
+    parser.add_argument("--skills", type=int, default=6, help="Número de qualificações distintas (default: 6).")
+    parser.add_argument("--work-centers", type=int, default=4, help="Número de centros de trabalho (default: 4).")
+    parser.add_argument("--horizon-days", type=int, default=30, help="Dias cobertos pelas datas das ordens (default: 30).")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do gerador aleatório.")
+    args = parser.parse_args()
+
+    paths = generate_instance(args.output_dir, orders=args.orders, workers=args.workers, skills=args.skills,
+                              work_centers=args.work_centers, horizon_days=args.horizon_days,
+                              max_operations=args.max_operations, seed=args.seed)
+    for path in paths:
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
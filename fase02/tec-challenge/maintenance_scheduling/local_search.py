@@ -0,0 +1,431 @@
+# local_search.py
+import copy
+import random
+from bisect import insort
+from datetime import timedelta
+from typing import Dict, List
+
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+from greedy_scheduler import WorkerIndex
+from util import time_to_minutes, minutes_to_time, unique_workers
+
+# Penalidades na mesma escala do TurnScheduling (ga_deap_claudai.py)
+MISSING_WORKER_PENALTY = 200
+UNQUALIFIED_PENALTY = 100
+OVERLAP_PENALTY = 50
+OUT_OF_SHIFT_PENALTY = 50
+OVER_CAPACITY_PENALTY = 25
+ABSENCE_PENALTY = 1000  # maior que MISSING_WORKER_PENALTY: nunca compensa alocar um colaborador ausente
+
+
+def _book(worker: Worker, operation):
+    """
+    Registra a operação no colaborador sem a checagem de disponibilidade de `allocate_hours`;
+    conflitos são medidos pelas penalidades da busca local.
+    """
+    worker.hours_allocated[operation.due_date] = worker.hours_allocated.get(operation.due_date, 0) + operation.effort
+    worker.operations.append(operation)
+
+
+def copy_individual(individual: List[MaintenanceTask]) -> List[MaintenanceTask]:
+    """
+    Cópia das ordens e operações de um indivíduo do GA, que nos algoritmos genéticos são compartilhadas entre
+    os indivíduos da população; os colaboradores continuam compartilhados.
+    """
+    copies = []
+    for task in individual:
+        task = copy.copy(task)
+        task.operations = [copy.copy(operation) for operation in task.operations]
+        for operation in task.operations:
+            operation.allocated_workers = list(operation.allocated_workers)
+        copies.append(task)
+    return copies
+
+
+class ScheduleIndex:
+    """
+    Índice de intervalos por colaborador e dia de uma agenda já montada.
+
+    Guarda, para cada (matrícula, data), a lista ordenada de reservas (inicio, fim, operação) e calcula
+    as penalidades de forma local: o custo de um dia depende apenas das reservas daquele colaborador
+    naquele dia, o que permite avaliar um movimento recalculando só os dias e operações afetados.
+    `absences` mapeia (matrícula, data) para intervalos (inicio, fim) em que o colaborador está ausente.
+    """
+
+    def __init__(self, calendars: Dict[str, WorkerCalendar], absences: Dict[tuple, list] = None):
+        self.calendars = calendars
+        self.absences = absences if absences is not None else {}
+        self.bookings: Dict[tuple, list] = {}
+
+    @staticmethod
+    def interval(operation):
+        start = time_to_minutes(operation.start_hour)
+        return start, start + operation.effort
+
+    def add(self, worker_id, operation):
+        start, end = self.interval(operation)
+        insort(self.bookings.setdefault((worker_id, operation.due_date), []), (start, end, id(operation), operation))
+
+    def remove(self, worker_id, operation):
+        start, end = self.interval(operation)
+        self.bookings[(worker_id, operation.due_date)].remove((start, end, id(operation), operation))
+
+    def day_cost(self, key):
+        """
+        Penalidade de um colaborador em uma data: sobreposições, reservas fora do turno e excesso de horas.
+        """
+        bookings = self.bookings.get(key, [])
+        cost = 0
+        for i, (start, end, _, _) in enumerate(bookings):
+            for next_start, _, _, _ in bookings[i + 1:]:
+                if next_start >= end:
+                    break
+                cost += OVERLAP_PENALTY
+        for absence_start, absence_end in self.absences.get(key, []):
+            cost += sum(ABSENCE_PENALTY for start, end, _, _ in bookings if start < absence_end and absence_start < end)
+
+        calendar = self.calendars.get(key[0])
+        if calendar is None or not bookings:
+            return cost
+        windows = calendar.weekly_shifts.get(key[1].isoweekday(), [])
+        for start, end, _, _ in bookings:
+            if not any(window_start <= start and end <= window_end for window_start, window_end in windows):
+                cost += OUT_OF_SHIFT_PENALTY
+        if sum(end - start for start, end, _, _ in bookings) > sum(end - start for start, end in windows):
+            cost += OVER_CAPACITY_PENALTY
+        return cost
+
+    @staticmethod
+    def operation_cost(operation):
+        """
+        Penalidade da própria operação: colaboradores faltantes e colaboradores sem a qualificação exigida.
+        """
+        allocated = {worker.worker_id for worker in operation.allocated_workers}
+        cost = max(int(operation.quantity or 1) - len(allocated), 0) * MISSING_WORKER_PENALTY
+        if operation.required_skill:
+            cost += sum(UNQUALIFIED_PENALTY for worker in operation.allocated_workers if not worker.has_skill(operation.required_mask))
+        return cost
+
+    def total_cost(self, operations):
+        return sum(self.operation_cost(op) for op in operations) + sum(self.day_cost(key) for key in self.bookings)
+
+
+class Reassign:
+    """
+    Movimento: troca o colaborador `old` da operação por `new` (ou apenas acrescenta `new`, se `old` for None).
+    """
+
+    def __init__(self, operation, old: Worker, new: Worker):
+        self.operation, self.old, self.new = operation, old, new
+
+    def keys(self):
+        day = self.operation.due_date
+        return {(worker.worker_id, day) for worker in (self.old, self.new) if worker is not None}
+
+    def operations(self):
+        return [self.operation]
+
+    def apply(self, index: ScheduleIndex):
+        if self.old is not None:
+            index.remove(self.old.worker_id, self.operation)
+            self.operation.allocated_workers.remove(self.old)
+        index.add(self.new.worker_id, self.operation)
+        self.operation.allocated_workers.append(self.new)
+
+    def undo(self, index: ScheduleIndex):
+        index.remove(self.new.worker_id, self.operation)
+        self.operation.allocated_workers.remove(self.new)
+        if self.old is not None:
+            index.add(self.old.worker_id, self.operation)
+            self.operation.allocated_workers.append(self.old)
+
+    def commit(self):
+        if self.old is not None:
+            self.old.release_hours(self.operation)
+        _book(self.new, self.operation)
+
+
+class Shift:
+    """
+    Movimento: desloca a operação (com todos os seus colaboradores) para outra data/horário.
+    """
+
+    def __init__(self, operation, day, start: int):
+        self.operation, self.day, self.start = operation, day, start
+        self.old_day, self.old_start = operation.due_date, operation.start_hour
+
+    def keys(self):
+        return {(worker.worker_id, day) for worker in self.operation.allocated_workers for day in (self.old_day, self.day)}
+
+    def operations(self):
+        return [self.operation]
+
+    def _move(self, index: ScheduleIndex, day, start_hour):
+        for worker in self.operation.allocated_workers:
+            index.remove(worker.worker_id, self.operation)
+        self.operation.due_date, self.operation.start_hour = day, start_hour
+        for worker in self.operation.allocated_workers:
+            index.add(worker.worker_id, self.operation)
+
+    def apply(self, index: ScheduleIndex):
+        self._move(index, self.day, minutes_to_time(self.start))
+
+    def undo(self, index: ScheduleIndex):
+        self._move(index, self.old_day, self.old_start)
+
+    def commit(self):
+        for worker in self.operation.allocated_workers:
+            worker.release_hours(self.operation, self.old_day)
+            _book(worker, self.operation)
+
+
+class Swap:
+    """
+    Movimento: troca os colaboradores de duas operações sobrepostas (w_a sai de op_a e entra em op_b, e vice-versa).
+    """
+
+    def __init__(self, operation_a, worker_a: Worker, operation_b, worker_b: Worker):
+        self.moves = [Reassign(operation_a, worker_a, worker_b), Reassign(operation_b, worker_b, worker_a)]
+
+    def keys(self):
+        return set().union(*(move.keys() for move in self.moves))
+
+    def operations(self):
+        return [move.operation for move in self.moves]
+
+    def apply(self, index: ScheduleIndex):
+        for move in self.moves:
+            move.apply(index)
+
+    def undo(self, index: ScheduleIndex):
+        for move in reversed(self.moves):
+            move.undo(index)
+
+    def commit(self):
+        for move in self.moves:
+            move.commit()
+
+
+class LocalSearch:
+    """
+    Operadores de vizinhança sobre a agenda (realocar colaborador, deslocar operação, trocar colaboradores
+    entre operações sobrepostas), com avaliação incremental via `ScheduleIndex` e um passo de reparo que
+    elimina sobreposições, reservas fora do turno e falta de colaboradores.
+
+    Um deslocamento mantém a operação entre a data prevista original (`planned_date`) e `horizon_days` dias
+    depois dela, e depois do fim da operação anterior e antes do início da seguinte na mesma ordem.
+
+    `mutate` e `memetic` recebem um indivíduo (lista de `MaintenanceTask`) e devolvem uma cópia alterada, sem
+    mexer nas ordens e operações compartilhadas com os demais indivíduos da população; podem ser passados como
+    `mutation_operator` para os dois algoritmos genéticos.
+
+    Attributes:
+        workers (list): Colaboradores (um por matrícula).
+        calendars (dict): Mapeia a matrícula para a sua `WorkerCalendar` (usada para os turnos).
+        horizon_days (int): Quantos dias após a data prevista um deslocamento pode levar a operação.
+        iterations (int): Movimentos aleatórios tentados por `improve`.
+    """
+
+    def __init__(self, workers: List[Worker], calendars: Dict[str, WorkerCalendar], horizon_days=7, iterations=50, absences: Dict[tuple, list] = None):
+        self.workers = unique_workers(workers)
+        self.calendars = calendars
+        self.horizon_days = horizon_days
+        self.iterations = iterations
+        self.absences = absences if absences is not None else {}
+        self.worker_index = WorkerIndex(self.workers, calendars)
+        self.index = None
+        self.operations = []
+        self.sequence = {}
+        self.touched = set()
+        self.moved = []
+
+    def build(self, tasks: List[MaintenanceTask]) -> ScheduleIndex:
+        """
+        Monta o índice de intervalos a partir da agenda atual das ordens.
+        """
+        self.operations = [op for task in tasks for op in task.operations]
+        self.index = ScheduleIndex(self.calendars, self.absences)
+        self.sequence = {}
+        for task in tasks:
+            self.link(task)
+        for operation in self.operations:
+            for worker in operation.allocated_workers:
+                self.index.add(worker.worker_id, operation)
+        return self.index
+
+    def link(self, task: MaintenanceTask):
+        """
+        Registra a operação anterior e a seguinte de cada operação da ordem (ordem crescente de `operacao`).
+        """
+        operations = sorted(task.operations, key=lambda op: op.operation_id)
+        for position, operation in enumerate(operations):
+            previous = operations[position - 1] if position > 0 else None
+            following = operations[position + 1] if position + 1 < len(operations) else None
+            self.sequence[id(operation)] = (previous, following)
+
+    def delta(self, move) -> int:
+        """
+        Variação da penalidade total se o movimento for aplicado (negativo = melhora).
+        """
+        keys, operations = move.keys(), move.operations()
+        before = sum(self.index.day_cost(key) for key in keys) + sum(self.index.operation_cost(op) for op in operations)
+        move.apply(self.index)
+        after = sum(self.index.day_cost(key) for key in keys) + sum(self.index.operation_cost(op) for op in operations)
+        move.undo(self.index)
+        return after - before
+
+    def apply(self, move, commit=True):
+        """
+        Aplica o movimento ao índice e, com `commit`, também às horas e operações registradas nos colaboradores.
+        """
+        self.touched |= move.keys()
+        move.apply(self.index)
+        if commit:
+            move.commit()
+        self.touched |= move.keys()
+        self.moved.extend(move.operations())
+
+    def local_cost(self, operation) -> int:
+        """
+        Penalidade da operação somada à dos dias dos seus colaboradores; > 0 indica algo a reparar.
+        """
+        return self.index.operation_cost(operation) + sum(
+            self.index.day_cost((worker.worker_id, operation.due_date)) for worker in operation.allocated_workers
+        )
+
+    def free_start(self, operation, day, release=0):
+        """
+        Primeiro horário >= release, dentro dos turnos de todos os colaboradores da operação na data,
+        que não sobrepõe outras reservas deles. Retorna None se não houver espaço.
+        """
+        workers = operation.allocated_workers
+        if not workers or any(worker.worker_id not in self.calendars for worker in workers):
+            return None
+        windows = None
+        for worker in workers:
+            shifts = self.calendars[worker.worker_id].weekly_shifts.get(day.isoweekday(), [])
+            windows = shifts if windows is None else [
+                (max(a_start, b_start), min(a_end, b_end))
+                for a_start, a_end in windows for b_start, b_end in shifts
+                if max(a_start, b_start) < min(a_end, b_end)
+            ]
+        busy = sorted(
+            [(start, end)
+             for worker in workers
+             for start, end, _, op in self.index.bookings.get((worker.worker_id, day), [])
+             if op is not operation]
+            + [interval for worker in workers for interval in self.absences.get((worker.worker_id, day), [])]
+        )
+        for window_start, window_end in sorted(windows):
+            start = max(window_start, release)
+            for busy_start, busy_end in busy:
+                if busy_start < start + operation.effort and busy_end > start:
+                    start = busy_end
+            if start + operation.effort <= window_end:
+                return start
+        return None
+
+    def neighborhood(self, operation):
+        """
+        Gera os movimentos candidatos para a operação.
+        """
+        allocated = {worker.worker_id for worker in operation.allocated_workers}
+        candidates = [worker for worker in self.worker_index.candidates(operation) if worker.worker_id not in allocated]
+
+        moves = []
+        if len(allocated) < int(operation.quantity or 1):
+            moves.extend(Reassign(operation, None, worker) for worker in candidates)
+        for worker in operation.allocated_workers:
+            moves.extend(Reassign(operation, worker, candidate) for candidate in candidates)
+
+        previous, following = self.sequence.get(id(operation), (None, None))
+        earliest = ScheduleIndex.interval(previous)[1] if self._scheduled(previous) else None
+        latest = ScheduleIndex.interval(following)[0] if self._scheduled(following) else None
+        for offset in range(self.horizon_days + 1):
+            day = operation.planned_date + timedelta(days=offset)
+            if (earliest is not None and day < previous.due_date) or (latest is not None and day > following.due_date):
+                continue
+            start = self.free_start(operation, day, earliest if earliest is not None and day == previous.due_date else 0)
+            if start is None or (latest is not None and day == following.due_date and start + operation.effort > latest):
+                continue
+            if (day, minutes_to_time(start)) != (operation.due_date, operation.start_hour):
+                moves.append(Shift(operation, day, start))
+
+        for worker in operation.allocated_workers:
+            for _, _, _, other in self.index.bookings.get((worker.worker_id, operation.due_date), []):
+                if other is operation or not self._overlaps(operation, other):
+                    continue
+                other_ids = {w.worker_id for w in other.allocated_workers}
+                for other_worker in other.allocated_workers:
+                    if worker.worker_id not in other_ids and other_worker.worker_id not in allocated:
+                        moves.append(Swap(operation, worker, other, other_worker))
+        return moves
+
+    @staticmethod
+    def _scheduled(operation):
+        return operation is not None and bool(operation.allocated_workers) and isinstance(operation.start_hour, str)
+
+    def _overlaps(self, operation, other):
+        start, end = ScheduleIndex.interval(operation)
+        other_start, other_end = ScheduleIndex.interval(other)
+        return operation.due_date == other.due_date and start < other_end and other_start < end
+
+    def repair(self, tasks: List[MaintenanceTask], max_passes=3) -> List[MaintenanceTask]:
+        """
+        Percorre as operações com penalidade e aplica o melhor movimento da vizinhança enquanto houver melhora.
+        """
+        self.build(tasks)
+        self.repair_operations(self.operations, max_passes)
+        return tasks
+
+    def repair_operations(self, operations, max_passes=3, commit=True):
+        """
+        Reparo restrito a `operations`, sobre o índice já montado (ver `build`); usado no reagendamento
+        incremental, em que só a vizinhança de um evento precisa ser revista. Os dias (matrícula, data)
+        alterados ficam em `touched` e as operações movidas em `moved`.
+        """
+        for _ in range(max_passes):
+            improved = False
+            for operation in operations:
+                if self.local_cost(operation) == 0:
+                    continue
+                scored = [(self.delta(move), position, move) for position, move in enumerate(self.neighborhood(operation))]
+                if scored:
+                    best_delta, _, best_move = min(scored, key=lambda item: item[:2])
+                    if best_delta < 0:
+                        self.apply(best_move, commit)
+                        improved = True
+            if not improved:
+                break
+
+    def improve(self, tasks: List[MaintenanceTask], iterations=None, commit=True) -> List[MaintenanceTask]:
+        """
+        Busca local estocástica: tenta movimentos aleatórios e aceita os que não pioram a agenda.
+        """
+        self.build(tasks)
+        if not self.operations:
+            return tasks
+        for _ in range(self.iterations if iterations is None else iterations):
+            moves = self.neighborhood(random.choice(self.operations))
+            if moves:
+                move = random.choice(moves)
+                if self.delta(move) <= 0:
+                    self.apply(move, commit)
+        return tasks
+
+    def mutate(self, individual: List[MaintenanceTask]) -> List[MaintenanceTask]:
+        """
+        Operador de mutação: um único movimento aleatório que não piora a agenda, aplicado a uma cópia do indivíduo.
+        """
+        return self.improve(copy_individual(individual), iterations=1, commit=False)
+
+    def memetic(self, individual: List[MaintenanceTask]) -> List[MaintenanceTask]:
+        """
+        Operador memético: reparo seguido de busca local, aplicados a uma cópia do indivíduo.
+        """
+        individual = copy_individual(individual)
+        self.build(individual)
+        self.repair_operations(self.operations, commit=False)
+        return self.improve(individual, commit=False)
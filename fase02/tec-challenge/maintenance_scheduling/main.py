@@ -1,29 +1,131 @@
 # main.py
+import argparse
+from contextlib import nullcontext
 from genetic_algorithm_v2 import GeneticAlgorithm
-from data_loader import load_workers_from_csv, load_tasks_from_csv
-from util import calculate_end_time
+from greedy_scheduler import GreedyScheduler, DEFAULT_HORIZON_DAYS
+from local_search import LocalSearch
+from rolling_horizon import RollingHorizonScheduler
+from decomposition import WorkCenterDecomposition, greedy_solver, ga_solver
+from solvers import AutoSolver, CPSatSolver
+from run_controller import RunController
+from telemetry import GenerationTelemetry
+from data_loader import load_workers_from_csv, load_tasks_from_csv, load_worker_calendars_from_csv
+from schedule_export import ScheduleWriter, schedule_frame, format_lines
 
 # Carregar os dados
 historico_manutencao_csv = 'data/historico_manutencao.csv'
 disponibilidade_csv = 'data/disponibilidade_full.csv'
 ordens_manutencao_csv = 'data/ordens_manutencao.csv'
 
+parser = argparse.ArgumentParser(description="Sugestão de agenda de manutenção.")
+parser.add_argument("--scheduler", default="ga", choices=["ga", "greedy", "rolling", "cp", "auto"],
+                    help="ga: algoritmo genético semeado pelo construtor guloso; greedy: somente o construtor guloso; "
+                         "rolling: construtor guloso em horizonte rolante, lendo as ordens em blocos; "
+                         "cp: solver exato CP-SAT (requer ortools); auto: CP-SAT para instâncias pequenas e GA nas demais (default: ga).")
+parser.add_argument("--ordens", default=ordens_manutencao_csv,
+                    help=f"Arquivo de ordens de manutenção (default: {ordens_manutencao_csv}).")
+parser.add_argument("--window-days", type=int, default=7,
+                    help="Tamanho da janela em dias no modo rolling (default: 7).")
+parser.add_argument("--by-work-center", action="store_true",
+                    help="Decompõe o problema por centro de trabalho e resolve as partes em paralelo (modos ga e greedy).")
+parser.add_argument("--jobs", type=int, default=None,
+                    help="Número de processos usados com --by-work-center (default: número de CPUs).")
+parser.add_argument("--output", default=None,
+                    help="Grava a agenda em CSV ou Parquet (.parquet) em vez de imprimi-la.")
+parser.add_argument("--by-day", action="store_true",
+                    help="Com --output, grava a agenda em blocos por data de início.")
+parser.add_argument("--time-budget", type=float, default=None,
+                    help="Tempo máximo em segundos do algoritmo genético; devolve o melhor indivíduo até ali.")
+parser.add_argument("--stall-generations", type=int, default=None,
+                    help="Encerra o algoritmo genético após este número de gerações sem melhora.")
+parser.add_argument("--telemetry", default=None,
+                    help="Grava a telemetria por geração do algoritmo genético neste arquivo (.csv ou JSON Lines).")
+parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], default=None,
+                    help="Perfila a execução do algoritmo genético.")
+parser.add_argument("--profile-output", default=None,
+                    help="Arquivo onde gravar o perfil (.prof do cProfile ou .html do pyinstrument).")
+parser.add_argument("--time-limit", type=float, default=60.0,
+                    help="Limite de tempo em segundos do CP-SAT nos modos cp e auto (default: 60).")
+parser.add_argument("--cp-threshold", type=int, default=200,
+                    help="No modo auto, número máximo de operações resolvidas com CP-SAT; acima disso usa o GA (default: 200).")
+parser.add_argument("--polish-time", type=float, default=None,
+                    help="No modo auto, refina o resultado do GA com CP-SAT por este tempo em segundos.")
 
-workers = load_workers_from_csv(disponibilidade_csv, historico_manutencao_csv)
-tasks = load_tasks_from_csv(ordens_manutencao_csv)
+def print_unscheduled(unscheduled, horizon_days):
+    for task, operation in unscheduled:
+        print(f"Ordem {task.task_id} operação {operation.operation_id} não coube no horizonte de {horizon_days} dias.")
 
-# Instanciando o Algoritmo Genético
-genetic_algo = GeneticAlgorithm(tasks, workers, population_size=10, generations=10, mutation_rate=0.05)
+def print_schedule(frame):
+    if not frame.empty:
+        print('\n'.join(format_lines(frame)))
 
-# Executar a otimização
-best_solution = genetic_algo.optimize()
+HEADER = "Ordem | Lista de Operações | Lista de Colaboradores | Data Início | Hora Início da Operação | Hora de Término"
 
-# Exibir o melhor planejamento, evitando sobreposições
-print("Ordem | Lista de Operações | Lista de Colaboradores | Data Início | Hora Início da Operação | Hora de Término")
-for task in best_solution:
-    operation_details = []
-    for operation in sorted(task.operations, key=lambda op: op.operation_id):
-        colaboradores = ', '.join([str(worker.worker_id) for worker in operation.allocated_workers])
-        hora_termino = calculate_end_time(operation.start_hour, operation.effort)
-        #operation_details.append(f"Operação {operation.operation_id} - Colaboradores: {colaboradores} - Hora Início: {operation.start_hour} - Término: {hora_termino}")    
-        print(f"{task.task_id} | {operation.operation_id} | {colaboradores}| {task.due_date} | {operation.start_hour} | {hora_termino} ")
\ No newline at end of file
+def main():
+    args = parser.parse_args()
+
+    workers = load_workers_from_csv(disponibilidade_csv, historico_manutencao_csv)
+    calendars = load_worker_calendars_from_csv(disponibilidade_csv)
+
+    if args.scheduler == "rolling":
+        # Cada janela é impressa assim que agendada; as agendas dos colaboradores seguem para a próxima janela
+        rolling = RollingHorizonScheduler(workers, calendars, window_days=args.window_days)
+        if not args.output:
+            print(HEADER)
+        with ScheduleWriter(args.output, by_day=args.by_day) if args.output else nullcontext() as writer:
+            for window_start, scheduled, unscheduled in rolling.run(args.ordens):
+                print_unscheduled(unscheduled, rolling.horizon_days)
+                if writer:
+                    writer.write(scheduled)
+                else:
+                    print_schedule(schedule_frame(scheduled))
+    else:
+        tasks = load_tasks_from_csv(args.ordens)
+
+        if args.scheduler in ("cp", "auto"):
+            solver = CPSatSolver() if args.scheduler == "cp" else AutoSolver(threshold=args.cp_threshold, polish_time=args.polish_time)
+            result = solver.solve(tasks, workers, calendars, time_limit=args.time_limit)
+            print(f"Solver {result.solver}: status {result.status}, penalidade {result.penalty}, tempo {result.solve_time:.2f}s")
+            best_solution = result.schedule
+            unscheduled = result.unscheduled
+        elif args.by_work_center:
+            # Cada partição (centros de trabalho ligados por colaboradores em comum) é resolvida em um processo
+            decomposition = WorkCenterDecomposition(tasks, workers, calendars,
+                                                    solver=greedy_solver if args.scheduler == "greedy" else ga_solver,
+                                                    max_workers=args.jobs)
+            best_solution = decomposition.solve()
+            unscheduled = decomposition.unscheduled
+        else:
+            # Agenda inicial gulosa, respeitando turnos, intervalos e prioridade (indice_irpe)
+            greedy = GreedyScheduler(tasks, workers, calendars)
+            greedy_solution = greedy.schedule()
+            unscheduled = greedy.unscheduled
+
+            if args.scheduler == "greedy":
+                best_solution = greedy_solution
+            else:
+                # Instanciando o Algoritmo Genético, com mutação por busca local na agenda
+                local_search = LocalSearch(workers, calendars)
+                controller = RunController(time_budget=args.time_budget, stall_generations=args.stall_generations)
+                with GenerationTelemetry(args.telemetry, profiler=args.profile, profile_path=args.profile_output) as telemetry:
+                    genetic_algo = GeneticAlgorithm(tasks, workers, population_size=10, generations=10, mutation_rate=0.05, seed=greedy_solution,
+                                                    mutation_operator=local_search.mutate, controller=controller,
+                                                    telemetry=telemetry if args.telemetry or args.profile else None)
+
+                    # Executar a otimização
+                    best_solution = genetic_algo.optimize()
+
+        print_unscheduled(unscheduled, DEFAULT_HORIZON_DAYS)
+
+        # Exibir (ou gravar) o melhor planejamento, evitando sobreposições
+        frame = schedule_frame(best_solution)
+        if args.output:
+            with ScheduleWriter(args.output, by_day=args.by_day) as writer:
+                writer.write(frame)
+            print(f"Agenda com {writer.rows} operações gravada em {args.output}")
+        else:
+            print(HEADER)
+            print_schedule(frame)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 from typing import List
 from datetime import datetime, date
 from worker import Worker
+from skill_registry import SKILLS
 
 class OperationTask:
     """
@@ -10,24 +11,39 @@ class OperationTask:
     Attributes:
         operation_id (str): ID da operação.
         required_skill (list): Habilidade necessária para realizar a operação.
+        required_mask (int): Máscara de bits de required_skill no registro SKILLS.
         due_date (str): Data prevista para execução.
+        planned_date (date): Data prevista original (data_inicio_base); due_date muda quando a operação é agendada.
         asset (str): Ativo relacionado à operação.
         effort (float): Esforço necessário para executar a operação.
         start_hour (str): Hora de início da operação.
         allocated_workers (list): Lista de colaboradores alocados para essa operação.
+        quantity (int): Quantidade de colaboradores necessária (quantidade_executantes).
+        work_center (str): Centro de trabalho responsável pela operação.
     """
-    def __init__(self, operation_id, required_skill: List[str], due_date: date, asset: str, effort: int, start_hour):
+    def __init__(self, operation_id, required_skill: List[str], due_date: date, asset: str, effort: int, start_hour, quantity: int = 1, work_center: str = None):
         self.operation_id = operation_id
         self.required_skill = required_skill
+        self.required_mask = SKILLS.mask(required_skill)
         self.due_date: date = due_date
+        self.planned_date: date = due_date
         self.asset = asset
         self.effort:int = effort
         self.start_hour = start_hour
         self.allocated_workers = []
+        self.quantity: int = quantity
+        self.work_center = work_center
     
     def assign_worker(self, worker: Worker):
         """
         Aloca um colaborador para a operação.
         """
         self.allocated_workers.append(worker)
-        worker.allocate_hours(self)
\ No newline at end of file
+        worker.allocate_hours(self)
+
+    def unassign_worker(self, worker: Worker):
+        """
+        Remove um colaborador da operação.
+        """
+        self.allocated_workers.remove(worker)
+        worker.release_hours(self)
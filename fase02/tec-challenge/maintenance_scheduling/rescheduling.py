@@ -0,0 +1,268 @@
+# rescheduling.py
+import time
+from typing import Dict, List
+
+from data_loader import load_workers_from_csv, load_tasks_from_csv, load_worker_calendars_from_csv
+from greedy_scheduler import DEFAULT_HORIZON_DAYS, GreedyScheduler
+from local_search import LocalSearch
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+from util import time_to_minutes, unique_workers
+
+FULL_DAY = (0, 24 * 60)
+
+
+class RescheduleResult:
+    """
+    Resultado de um evento de reagendamento.
+
+    Attributes:
+        changed (list): Pares (ordem, operação) cuja data, horário ou colaboradores mudaram.
+        unscheduled (list): Pares (ordem, operação) ainda sem agenda após o evento.
+        elapsed (float): Tempo de processamento do evento em segundos.
+    """
+
+    def __init__(self, changed, unscheduled, elapsed):
+        self.changed = changed
+        self.unscheduled = unscheduled
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"RescheduleResult(changed={len(self.changed)}, unscheduled={len(self.unscheduled)}, elapsed={self.elapsed * 1000:.1f}ms)"
+
+
+class ReschedulingService:
+    """
+    Serviço de reagendamento incremental durante o turno.
+
+    Os dados são carregados e agendados uma única vez (`load`); depois disso, eventos (nova ordem, ordem cancelada,
+    ordem adiada, ausência de colaborador) alteram apenas a parte afetada da agenda: a ordem do evento é colocada
+    pelo `GreedyScheduler` nas agendas livres dos colaboradores e as operações afetadas são reparadas pela
+    `LocalSearch` sobre o índice de intervalos já montado. As demais alocações permanecem como estavam.
+
+    Attributes:
+        workers (list): Colaboradores (um por matrícula).
+        calendars (dict): Mapeia a matrícula para a sua `WorkerCalendar`, mantida em sincronia com a agenda.
+        horizon_days (int): Quantos dias uma operação pode ser postergada.
+        tasks (dict): Ordens agendadas, por número da ordem.
+        unscheduled (list): Pares (ordem, operação) sem agenda.
+        absences (dict): Mapeia (matrícula, data) para os intervalos (inicio, fim) de ausência.
+        owners (dict): Mapeia cada operação agendada para a sua ordem.
+    """
+
+    def __init__(self, workers: List[Worker], calendars: Dict[str, WorkerCalendar], horizon_days=DEFAULT_HORIZON_DAYS):
+        self.workers = unique_workers(workers)
+        self.calendars = calendars
+        self.horizon_days = horizon_days
+        self.tasks: Dict[object, MaintenanceTask] = {}
+        self.unscheduled = []
+        self.absences: Dict[tuple, list] = {}
+        self.owners: Dict[object, MaintenanceTask] = {}
+        self._positions: Dict[object, int] = {}  # posição de cada operação em local_search.operations
+        self.local_search = LocalSearch(self.workers, calendars, horizon_days=horizon_days, absences=self.absences)
+        self.local_search.build([])
+
+    @classmethod
+    def from_csv(cls, ordens_file, disponibilidade_file, historico_file, horizon_days=DEFAULT_HORIZON_DAYS):
+        service = cls(load_workers_from_csv(disponibilidade_file, historico_file),
+                      load_worker_calendars_from_csv(disponibilidade_file), horizon_days)
+        service.load(load_tasks_from_csv(ordens_file))
+        return service
+
+    @property
+    def index(self):
+        return self.local_search.index
+
+    def load(self, tasks: List[MaintenanceTask], schedule=True) -> RescheduleResult:
+        """
+        Carrega as ordens. Com `schedule=True` elas são agendadas pelo construtor guloso; caso contrário a agenda
+        atual das operações (ex.: resultado do GA) é adotada e as agendas dos colaboradores são sincronizadas com ela.
+        """
+        started = time.perf_counter()
+        if schedule:
+            scheduler = GreedyScheduler(tasks, self.workers, self.calendars, horizon_days=self.horizon_days)
+            scheduler.schedule()
+            self.unscheduled = list(scheduler.unscheduled)
+        else:
+            self.unscheduled = [(task, op) for task in tasks for op in task.operations if not op.allocated_workers]
+        self.tasks = {task.task_id: task for task in tasks}
+        self.local_search.build(tasks)
+        self.owners = {op: task for task in tasks for op in task.operations}
+        self._positions = {op: position for position, op in enumerate(self.local_search.operations)}
+        self._sync(set(self.index.bookings))
+        return RescheduleResult([], list(self.unscheduled), time.perf_counter() - started)
+
+    def _snapshot(self, operations):
+        return {id(op): (op.due_date, op.start_hour, tuple(sorted(w.worker_id for w in op.allocated_workers))) for op in operations}
+
+    def _keys(self, operation):
+        return {(worker.worker_id, operation.due_date) for worker in operation.allocated_workers}
+
+    def _sync(self, keys):
+        """
+        Atualiza os intervalos livres das agendas nos dias (matrícula, data) alterados.
+        """
+        for worker_id, day in keys:
+            if worker_id in self.calendars:
+                busy = [(start, end) for start, end, _, _ in self.index.bookings.get((worker_id, day), [])]
+                self.calendars[worker_id].rebuild_day(day, busy + self.absences.get((worker_id, day), []))
+
+    def _unassign(self, operation):
+        keys = self._keys(operation)
+        for worker in list(operation.allocated_workers):
+            self.index.remove(worker.worker_id, operation)
+            operation.unassign_worker(worker)
+        return keys
+
+    def _register(self, tasks):
+        """
+        Inclui as operações recém-agendadas no índice e na lista de operações da busca local.
+        """
+        keys = set()
+        for task in tasks:
+            self.local_search.link(task)
+            for operation in task.operations:
+                self.owners[operation] = task
+                if operation not in self._positions:
+                    self._positions[operation] = len(self.local_search.operations)
+                    self.local_search.operations.append(operation)
+                for worker in operation.allocated_workers:
+                    self.index.add(worker.worker_id, operation)
+                keys |= self._keys(operation)
+        return keys
+
+    def _forget(self, operation):
+        """
+        Retira a operação da lista da busca local (troca com a última, sem deslocar as demais) e do mapa de ordens.
+        """
+        self.owners.pop(operation, None)
+        position = self._positions.pop(operation, None)
+        if position is None:
+            return
+        operations = self.local_search.operations
+        last = operations.pop()
+        if last is not operation:
+            operations[position] = last
+            self._positions[last] = position
+
+    def _place(self, tasks):
+        """
+        Agenda as ordens nas agendas livres e devolve os pares que não couberam.
+        """
+        scheduler = GreedyScheduler(tasks, self.workers, self.calendars, horizon_days=self.horizon_days)
+        scheduler.schedule()
+        self._register(tasks)
+        return scheduler.unscheduled
+
+    def _pending(self, freed):
+        """
+        Ordens com operações sem agenda que algum dos colaboradores `freed` poderia atender, na ordem em que ficaram pendentes.
+        """
+        centers = set().union(*(self.calendars[worker_id].work_centers for worker_id in freed if worker_id in self.calendars))
+        pending = {}  # dicionário como conjunto ordenado
+        for task, operation in self.unscheduled:
+            if task not in pending and task.task_id in self.tasks and (not operation.work_center or operation.work_center in centers):
+                pending[task] = None
+        return list(pending)
+
+    def _finish(self, started, affected, before, repair=()):
+        """
+        Repara as operações `repair`, sincroniza as agendas e monta o resultado comparando com `before`.
+        """
+        self.local_search.touched = set()
+        self.local_search.moved = []
+        if repair:
+            self.local_search.repair_operations(list(repair))
+        self._sync(self.local_search.touched)
+        changed = {id(op): (task, op) for task, op in affected if before.get(id(op)) != self._snapshot([op])[id(op)]}
+        # Operações vizinhas alteradas pelo reparo (ex.: trocas de colaboradores)
+        for operation in self.local_search.moved:
+            if id(operation) not in changed:
+                changed[id(operation)] = (self.owners.get(operation), operation)
+        changed = list(changed.values())
+        return RescheduleResult(changed, list(self.unscheduled), time.perf_counter() - started)
+
+    def add_order(self, task: MaintenanceTask) -> RescheduleResult:
+        """
+        Evento: nova ordem. Agenda apenas a ordem nova e repara suas operações que ficaram sem colaboradores.
+        """
+        started = time.perf_counter()
+        if task.task_id in self.tasks:
+            raise ValueError(f"Ordem {task.task_id} já está na agenda.")
+        affected = [(task, op) for op in task.operations]
+        before = self._snapshot(task.operations)
+        self.tasks[task.task_id] = task
+        unscheduled = self._place([task])
+        self.unscheduled.extend(unscheduled)
+        return self._finish(started, affected, before, repair=[op for _, op in unscheduled])
+
+    def remove_order(self, task_id) -> RescheduleResult:
+        """
+        Evento: ordem cancelada. Libera os colaboradores e tenta agendar as ordens pendentes no espaço liberado.
+        """
+        started = time.perf_counter()
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            raise KeyError(f"Ordem {task_id} não está na agenda.")
+        keys = set()
+        for operation in task.operations:
+            keys |= self._unassign(operation)
+            self._forget(operation)
+        self._sync(keys)
+        self.unscheduled = [(t, op) for t, op in self.unscheduled if t is not task]
+
+        # Capacidade liberada: as ordens pendentes são agendadas de novo, do zero
+        pending = self._pending({worker_id for worker_id, _ in keys})
+        affected = [(t, op) for t in pending for op in t.operations]
+        before = self._snapshot([op for _, op in affected])
+        for _, operation in affected:
+            self._sync(self._unassign(operation))
+        pending_tasks = set(pending)
+        self.unscheduled = [(t, op) for t, op in self.unscheduled if t not in pending_tasks]
+        self.unscheduled.extend(self._place(pending))
+        return self._finish(started, affected, before)
+
+    def delay_order(self, task_id, new_date, start_hour=None) -> RescheduleResult:
+        """
+        Evento: ordem adiada para `new_date` (e, opcionalmente, `start_hour` 'HH:MM:SS'). Somente a ordem é reagendada.
+        """
+        started = time.perf_counter()
+        task = self.tasks[task_id]
+        affected = [(task, op) for op in task.operations]
+        before = self._snapshot(task.operations)
+        keys = set()
+        for operation in task.operations:
+            keys |= self._unassign(operation)
+        self._sync(keys)
+        self.unscheduled = [(t, op) for t, op in self.unscheduled if t is not task]
+
+        operations = sorted(task.operations, key=lambda op: op.operation_id)
+        task.due_date = new_date
+        for operation in task.operations:
+            operation.due_date = operation.planned_date = new_date
+        if operations:
+            operations[0].start_hour = start_hour or (task.start_hour if isinstance(task.start_hour, str) else '00:00:00')
+        unscheduled = self._place([task])
+        self.unscheduled.extend(unscheduled)
+        return self._finish(started, affected, before, repair=[op for _, op in unscheduled])
+
+    def worker_absence(self, worker_id, day, start=None, end=None) -> RescheduleResult:
+        """
+        Evento: colaborador ausente na data (o dia todo ou entre `start` e `end`, 'HH:MM'). As operações dele que
+        coincidem com a ausência perdem o colaborador e são reparadas por substituição ou deslocamento.
+        """
+        started = time.perf_counter()
+        interval = (time_to_minutes(start), time_to_minutes(end)) if start is not None and end is not None else FULL_DAY
+        key = (worker_id, day)
+        self.absences.setdefault(key, []).append(interval)
+
+        hit = [op for op_start, op_end, _, op in self.index.bookings.get(key, []) if op_start < interval[1] and interval[0] < op_end]
+        affected = [(self.owners.get(op), op) for op in hit]
+        before = self._snapshot(hit)
+        for operation in hit:
+            worker = next(w for w in operation.allocated_workers if w.worker_id == worker_id)
+            self.index.remove(worker_id, operation)
+            operation.unassign_worker(worker)
+        self._sync({key})
+        return self._finish(started, affected, before, repair=hit)
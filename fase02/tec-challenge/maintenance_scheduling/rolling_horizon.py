@@ -0,0 +1,58 @@
+# rolling_horizon.py
+from typing import Dict, List
+
+from data_loader import iter_task_windows
+from greedy_scheduler import GreedyScheduler
+from worker import Worker
+from worker_calendar import WorkerCalendar
+from util import unique_workers
+
+
+class RollingHorizonScheduler:
+    """
+    Agendamento em horizonte rolante para carteiras de ordens muito grandes.
+
+    As ordens são lidas do CSV em janelas de `window_days` dias (ver `iter_task_windows`) e cada janela é
+    agendada pelo `GreedyScheduler`. As agendas dos colaboradores (`WorkerCalendar`) são compartilhadas entre
+    as janelas, de modo que os compromissos de uma janela (inclusive operações postergadas para depois do seu
+    fim) são respeitados pela seguinte. Datas anteriores à janela corrente são descartadas das agendas e dos
+    colaboradores, mantendo a memória limitada ao tamanho da janela e não ao total de ordens.
+
+    Attributes:
+        workers (list): Colaboradores (um por matrícula).
+        calendars (dict): Mapeia a matrícula para a sua `WorkerCalendar`.
+        window_days (int): Tamanho da janela em dias.
+        horizon_days (int): Quantos dias uma operação pode ser postergada dentro do `GreedyScheduler`.
+        chunksize (int): Linhas lidas do CSV por vez.
+    """
+
+    def __init__(self, workers: List[Worker], calendars: Dict[str, WorkerCalendar], window_days=7, horizon_days=7, chunksize=10000):
+        self.workers = unique_workers(workers)
+        self.calendars = calendars
+        self.window_days = window_days
+        self.horizon_days = horizon_days
+        self.chunksize = chunksize
+
+    def run(self, ordens_file):
+        """
+        Agenda o arquivo janela a janela.
+
+        Yields:
+            (inicio_da_janela, ordens agendadas, lista de (ordem, operação) não agendadas)
+        """
+        for window_start, tasks in iter_task_windows(ordens_file, self.window_days, self.chunksize):
+            for calendar in self.calendars.values():
+                calendar.forget_before(window_start)
+            for worker in self.workers:
+                worker.forget_before(window_start)
+
+            # Ordens atrasadas (data anterior à janela) são tratadas como pendências a partir do início da janela
+            for task in tasks:
+                if task.due_date < window_start:
+                    task.due_date = window_start
+                    for operation in task.operations:
+                        operation.due_date = operation.planned_date = window_start
+
+            scheduler = GreedyScheduler(tasks, self.workers, self.calendars, horizon_days=self.horizon_days)
+            scheduled = scheduler.schedule()
+            yield window_start, scheduled, scheduler.unscheduled
@@ -0,0 +1,121 @@
+# run_controller.py
+import signal
+import threading
+import time
+
+
+class RunController:
+    """
+    Controla quando um algoritmo genético deve parar, além do número fixo de gerações.
+
+    O laço do otimizador chama `update(melhor_fitness)` ao fim de cada geração e para quando o retorno é False:
+    orçamento de tempo esgotado, `stall_generations` gerações sem melhora, fitness alvo atingido, limite de
+    gerações ou Ctrl+C. Usado como context manager, o primeiro SIGINT apenas pede a parada (o otimizador
+    devolve o melhor indivíduo até ali); um segundo SIGINT interrompe normalmente.
+
+    Attributes:
+        time_budget (float): Tempo máximo de execução em segundos (None = sem limite).
+        stall_generations (int): Gerações seguidas sem melhora que encerram a execução (None = desativado).
+        target_fitness (float): Fitness que, se atingido, encerra a execução (None = desativado).
+        max_generations (int): Número máximo de gerações (None = sem limite).
+        maximize (bool): True se maior fitness é melhor; False para problemas de minimização.
+        min_delta (float): Melhora mínima para zerar a contagem de estagnação.
+        stop_reason (str): Motivo da parada ('time_budget', 'stall', 'target', 'generations' ou 'interrupted').
+    """
+
+    def __init__(self, time_budget=None, stall_generations=None, target_fitness=None, max_generations=None,
+                 maximize=True, min_delta=0.0):
+        self.time_budget = time_budget
+        self.stall_generations = stall_generations
+        self.target_fitness = target_fitness
+        self.max_generations = max_generations
+        self.maximize = maximize
+        self.min_delta = min_delta
+        self._previous_handler = None
+        self.start()
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.generation = 0
+        self.best_fitness = None
+        self.stalled = 0
+        self.interrupted = False
+        self.stop_reason = None
+        return self
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def _improves(self, fitness):
+        if self.best_fitness is None:
+            return True
+        delta = fitness - self.best_fitness if self.maximize else self.best_fitness - fitness
+        return delta > self.min_delta
+
+    def _reached_target(self):
+        if self.target_fitness is None or self.best_fitness is None:
+            return False
+        if self.maximize:
+            return self.best_fitness >= self.target_fitness
+        return self.best_fitness <= self.target_fitness
+
+    def should_stop(self):
+        """
+        Verifica as condições de parada sem registrar uma nova geração (ex.: antes de uma geração cara).
+        """
+        if self.interrupted:
+            self.stop_reason = 'interrupted'
+        elif self.time_budget is not None and self.elapsed >= self.time_budget:
+            self.stop_reason = 'time_budget'
+        elif self._reached_target():
+            self.stop_reason = 'target'
+        elif self.stall_generations is not None and self.stalled >= self.stall_generations:
+            self.stop_reason = 'stall'
+        elif self.max_generations is not None and self.generation >= self.max_generations:
+            self.stop_reason = 'generations'
+        return self.stop_reason is not None
+
+    def update(self, fitness):
+        """
+        Registra o melhor fitness da geração que terminou. Retorna True se o otimizador deve continuar.
+        """
+        self.generation += 1
+        if self._improves(fitness):
+            self.stalled = 0
+        else:
+            self.stalled += 1
+        if self.best_fitness is None or (fitness > self.best_fitness if self.maximize else fitness < self.best_fitness):
+            self.best_fitness = fitness
+        return not self.should_stop()
+
+    def _interrupt(self, signum, frame):
+        # Primeiro Ctrl+C: parada graciosa; o próximo volta ao comportamento padrão (KeyboardInterrupt)
+        self.interrupted = True
+        signal.signal(signal.SIGINT, self._previous_handler or signal.default_int_handler)
+
+    def install_signal_handler(self):
+        """
+        Instala o tratamento gracioso de SIGINT (para laços que não usam o context manager).
+        """
+        self._previous_handler = None
+        # Sinais só podem ser tratados na thread principal (ex.: não dentro de um executor de threads)
+        if threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGINT, self._interrupt)
+        return self
+
+    def restore_signal_handler(self):
+        """
+        Restaura o tratamento de SIGINT substituído por `install_signal_handler`.
+        """
+        if self._previous_handler is not None and signal.getsignal(signal.SIGINT) == self._interrupt:
+            signal.signal(signal.SIGINT, self._previous_handler)
+        self._previous_handler = None
+
+    def __enter__(self):
+        self.start()
+        return self.install_signal_handler()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.restore_signal_handler()
+        return False
@@ -0,0 +1,135 @@
+# schedule_export.py
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from task import MaintenanceTask
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def end_times(start_hours: pd.Series, efforts) -> pd.Series:
+    """
+    Versão vetorizada de `calculate_end_time`: hora de término 'HH:MM:SS' a partir das horas de início e dos
+    esforços em minutos (passando da meia-noite, volta para 00:00:00). Horas inválidas resultam em None.
+    """
+    start = pd.to_timedelta(pd.Series(start_hours, dtype=object).where(lambda s: s.map(type) == str), errors='coerce')
+    valid = start.notna().to_numpy()
+    seconds = (start.dt.total_seconds().fillna(0).to_numpy(dtype=np.int64) + np.asarray(efforts, dtype=np.int64) * 60) % SECONDS_PER_DAY
+    hours, rest = np.divmod(seconds, 3600)
+    minutes, secs = np.divmod(rest, 60)
+    text = (pd.Series(hours).astype(str).str.zfill(2) + ':' + pd.Series(minutes).astype(str).str.zfill(2) + ':' +
+            pd.Series(secs).astype(str).str.zfill(2))
+    return text.where(valid, None)
+
+
+def schedule_frame(tasks: List[MaintenanceTask]) -> pd.DataFrame:
+    """
+    Monta a agenda em colunas (uma linha por operação, na ordem das ordens e, dentro delas, de `operacao`),
+    percorrendo as operações uma única vez; a hora de término é calculada de forma vetorizada.
+    """
+    columns = {'ordem': [], 'operacao': [], 'colaboradores': [], 'data_inicio': [], 'hora_inicio': [], 'esforco': []}
+    for task in tasks:
+        for operation in sorted(task.operations, key=lambda op: op.operation_id):
+            columns['ordem'].append(task.task_id)
+            columns['operacao'].append(operation.operation_id)
+            columns['colaboradores'].append(', '.join([str(worker.worker_id) for worker in operation.allocated_workers]))
+            columns['data_inicio'].append(operation.due_date)
+            columns['hora_inicio'].append(operation.start_hour)
+            columns['esforco'].append(operation.effort)
+    frame = pd.DataFrame(columns)
+    frame['hora_termino'] = end_times(frame['hora_inicio'], frame['esforco'])
+    return frame
+
+
+def genome_frame(ordens: pd.DataFrame, genome) -> pd.DataFrame:
+    """
+    Agenda do TurnScheduling a partir do genoma: cada linha de `ordens` ocupa `quantidade_executantes` posições
+    consecutivas do genoma, então as linhas são repetidas com `np.repeat` e o genoma vira a coluna de matrículas.
+    """
+    repeats = pd.to_numeric(ordens['quantidade_executantes'], errors='coerce').fillna(1).astype(int).to_numpy()
+    rows = np.repeat(np.arange(len(ordens)), repeats)
+    frame = ordens.iloc[rows][['ordem', 'operacao', 'data_inicio_base', 'hora_inicio_base']].reset_index(drop=True)
+    genome = list(genome)[:len(rows)]
+    frame.insert(2, 'matricula', pd.Series(genome + [None] * (len(rows) - len(genome))))
+    return frame.rename(columns={'hora_inicio_base': 'horario_alocado'})
+
+
+def format_lines(frame: pd.DataFrame) -> pd.Series:
+    """
+    Linhas de texto no formato impresso por main.py ('ordem | operação | colaboradores| data | início | término ').
+    """
+    return (frame['ordem'].astype(str) + ' | ' + frame['operacao'].astype(str) + ' | ' + frame['colaboradores'] + '| ' +
+            frame['data_inicio'].astype(str) + ' | ' + frame['hora_inicio'].astype(str) + ' | ' +
+            frame['hora_termino'].astype(str) + ' ')
+
+
+class ScheduleWriter:
+    """
+    Grava agendas em CSV ou Parquet (pela extensão de `path`) em blocos, sem reter a agenda inteira em memória:
+    cada `write` acrescenta um bloco ao arquivo (no Parquet, um row group). Com `by_day=True`, cada bloco é
+    dividido por data de início, o que permite gravar o resultado do horizonte rolante à medida que sai.
+
+    Attributes:
+        path (str): Arquivo de saída (.parquet para Parquet; qualquer outra extensão para CSV).
+        by_day (bool): Grava um bloco por data de início.
+    """
+
+    def __init__(self, path, by_day=False):
+        self.path = path
+        self.by_day = by_day
+        self.parquet = str(path).endswith('.parquet')
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def _write_frame(self, frame: pd.DataFrame):
+        if frame.empty:
+            return
+        if self.parquet:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("A exportação em Parquet requer pyarrow: pip install pyarrow")
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            self._writer.write_table(table.cast(self._schema))
+        else:
+            frame.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        self.rows += len(frame)
+
+    def write(self, schedule):
+        """
+        Acrescenta uma agenda (lista de MaintenanceTask ou DataFrame de `schedule_frame`).
+        """
+        frame = schedule if isinstance(schedule, pd.DataFrame) else schedule_frame(schedule)
+        if self.by_day and 'data_inicio' in frame:
+            for _, day in frame.groupby('data_inicio', sort=True):
+                self._write_frame(day)
+        else:
+            self._write_frame(frame)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+def export_schedule(schedule, path, by_day=False):
+    """
+    Grava a agenda inteira em CSV ou Parquet numa única passada colunar. Retorna o número de linhas.
+    """
+    with ScheduleWriter(path, by_day=by_day) as writer:
+        writer.write(schedule)
+    return writer.rows
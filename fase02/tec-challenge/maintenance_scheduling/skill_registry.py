@@ -0,0 +1,74 @@
+# skill_registry.py
+import re
+from typing import Dict, List
+
+
+def normalize_skill(name) -> str:
+    """
+    Normaliza o nome de uma qualificação: maiúsculas, sem espaços nas pontas, espaços internos simples e
+    um espaço de cada lado do hífen (ex.: ' nr10-2024 ' -> 'NR10 - 2024'). Nada do nome é descartado, então
+    'NR10 - 2024' e 'NR10 - 2025' continuam sendo qualificações diferentes.
+    """
+    name = re.sub(r'\s+', ' ', str(name).strip().upper())
+    return re.sub(r'\s*-\s*', ' - ', name)
+
+
+class SkillRegistry:
+    """
+    Registro de qualificações que atribui um bit a cada nome normalizado.
+
+    As qualificações de um colaborador e os requisitos de uma operação viram máscaras inteiras,
+    de modo que "possui alguma" e "possui todas" são uma única operação AND.
+    """
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self._bits)
+
+    def bit(self, name) -> int:
+        """
+        Bit da qualificação (registrada na primeira vez em que aparece).
+        """
+        name = normalize_skill(name)
+        if name not in self._bits:
+            self._bits[name] = 1 << len(self._bits)
+        return self._bits[name]
+
+    def parse(self, raw) -> List[str]:
+        """
+        Separa uma lista de qualificações no formato do CSV ('NR13 / NR10 - 2024') em nomes normalizados.
+        """
+        if raw is None or raw != raw or not str(raw).strip() or str(raw) == 'nan':
+            return []
+        names = []
+        for name in str(raw).split('/'):
+            name = normalize_skill(name)
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    def mask(self, skills) -> int:
+        """
+        Máscara de bits de uma qualificação (str) ou de uma lista de qualificações.
+        """
+        if isinstance(skills, str):
+            skills = [skills]
+        mask = 0
+        for name in skills:
+            if normalize_skill(name):
+                mask |= self.bit(name)
+        return mask
+
+    @staticmethod
+    def has_any(skill_mask: int, required_mask: int) -> bool:
+        return bool(skill_mask & required_mask)
+
+    @staticmethod
+    def has_all(skill_mask: int, required_mask: int) -> bool:
+        return skill_mask & required_mask == required_mask
+
+
+# Registro compartilhado pelos carregadores de dados, Worker, OperationTask e TurnScheduling
+SKILLS = SkillRegistry()
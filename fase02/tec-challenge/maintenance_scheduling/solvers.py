@@ -0,0 +1,192 @@
+# solvers.py
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+import cp_solver
+from genetic_algorithm_v2 import GeneticAlgorithm
+from greedy_scheduler import DEFAULT_HORIZON_DAYS, GreedyScheduler
+from local_search import MISSING_WORKER_PENALTY, LocalSearch, ScheduleIndex
+from run_controller import RunController
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+
+
+def evaluate_schedule(tasks: List[MaintenanceTask], calendars: Dict[str, WorkerCalendar], expected: List[MaintenanceTask] = None) -> int:
+    """
+    Penalidade de uma agenda (quanto menor, melhor), a mesma para todos os solvers: colaboradores faltantes,
+    sem qualificação, sobreposições, reservas fora do turno e excesso de horas (ver `ScheduleIndex`).
+    Com `expected` (as ordens de entrada), cada operação ausente da agenda custa como uma operação sem
+    colaboradores, para que uma agenda que perdeu ordens não pareça melhor.
+    """
+    index = ScheduleIndex(calendars)
+    operations = [op for task in tasks for op in task.operations]
+    for operation in operations:
+        for worker in operation.allocated_workers:
+            index.add(worker.worker_id, operation)
+    cost = index.total_cost(operations)
+    if expected is not None:
+        present = {(task.task_id, op.operation_id) for task in tasks for op in task.operations}
+        cost += sum(int(op.quantity or 1) * MISSING_WORKER_PENALTY for task in expected for op in task.operations
+                    if (task.task_id, op.operation_id) not in present)
+    return cost
+
+
+def snapshot_schedule(tasks: List[MaintenanceTask], workers: List[Worker]):
+    """
+    Guarda a agenda das ordens (data, horário e colaboradores de cada operação) e as horas e operações
+    registradas nos colaboradores, para desfazer um solver que grava a sua solução nos mesmos objetos.
+    """
+    operations = [(op, op.due_date, op.start_hour, list(op.allocated_workers)) for task in tasks for op in task.operations]
+    bookings = [(worker, list(worker.operations), dict(worker.hours_allocated)) for worker in workers]
+    return operations, bookings
+
+
+def restore_schedule(snapshot):
+    """
+    Volta a agenda e os colaboradores ao estado guardado por `snapshot_schedule`.
+    """
+    operations, bookings = snapshot
+    for operation, due_date, start_hour, allocated in operations:
+        operation.due_date, operation.start_hour, operation.allocated_workers = due_date, start_hour, list(allocated)
+    for worker, worker_operations, hours in bookings:
+        worker.operations, worker.hours_allocated = list(worker_operations), dict(hours)
+
+
+class SolverResult:
+    """
+    Resultado de um solver, com objetivo e tempo comparáveis entre backends.
+
+    Attributes:
+        solver (str): Nome do backend.
+        schedule (list): Ordens de serviço com as operações agendadas.
+        unscheduled (list): Pares (ordem, operação) sem agenda.
+        penalty (int): Valor de `evaluate_schedule` para a agenda, contadas as ordens de entrada ausentes.
+        solve_time (float): Tempo de resolução em segundos.
+        status (str): Situação informada pelo backend (ex.: OPTIMAL, FEASIBLE).
+    """
+
+    def __init__(self, solver, schedule, unscheduled, penalty, solve_time, status="FEASIBLE"):
+        self.solver = solver
+        self.schedule = schedule
+        self.unscheduled = unscheduled
+        self.penalty = penalty
+        self.solve_time = solve_time
+        self.status = status
+
+    def __repr__(self):
+        return f"SolverResult(solver={self.solver}, status={self.status}, penalty={self.penalty}, solve_time={self.solve_time:.3f}s)"
+
+
+class Solver(ABC):
+    """
+    Interface comum dos backends de agendamento sobre o modelo Worker/MaintenanceTask.
+    """
+    name = "solver"
+
+    def __init__(self, horizon_days=DEFAULT_HORIZON_DAYS):
+        self.horizon_days = horizon_days
+
+    @abstractmethod
+    def _solve(self, tasks, workers, calendars, time_limit):
+        """
+        Retorna (agenda, não agendadas, status).
+        """
+
+    def solve(self, tasks: List[MaintenanceTask], workers: List[Worker], calendars: Dict[str, WorkerCalendar], time_limit=None) -> SolverResult:
+        start = time.perf_counter()
+        schedule, unscheduled, status = self._solve(tasks, workers, calendars, time_limit)
+        solve_time = time.perf_counter() - start
+        return SolverResult(self.name, schedule, unscheduled, evaluate_schedule(schedule, calendars, tasks), solve_time, status)
+
+
+class GreedySolver(Solver):
+    name = "greedy"
+
+    def _solve(self, tasks, workers, calendars, time_limit):
+        scheduler = GreedyScheduler(tasks, workers, calendars, horizon_days=self.horizon_days)
+        return scheduler.schedule(), scheduler.unscheduled, "FEASIBLE"
+
+
+class GeneticSolver(Solver):
+    """
+    Algoritmo genético (v2) semeado pelo construtor guloso e com mutação por busca local; `time_limit` vira o
+    orçamento de tempo do RunController.
+    """
+    name = "ga"
+
+    def __init__(self, horizon_days=DEFAULT_HORIZON_DAYS, population_size=10, generations=10, mutation_rate=0.05):
+        super().__init__(horizon_days)
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+
+    def _solve(self, tasks, workers, calendars, time_limit):
+        greedy = GreedyScheduler(tasks, workers, calendars, horizon_days=self.horizon_days)
+        seed = greedy.schedule()
+        local_search = LocalSearch(workers, calendars, horizon_days=self.horizon_days)
+        genetic_algo = GeneticAlgorithm(tasks, workers, population_size=self.population_size, generations=self.generations,
+                                        mutation_rate=self.mutation_rate, seed=seed, mutation_operator=local_search.mutate,
+                                        controller=RunController(time_budget=time_limit))
+        return genetic_algo.optimize(), greedy.unscheduled, "FEASIBLE"
+
+
+class CPSatSolver(Solver):
+    """
+    Solver exato (OR-Tools CP-SAT). Com `polish=True` parte de uma agenda como dica, o que permite refinar o
+    melhor indivíduo do GA dentro de um limite de tempo: `seed` (ex.: o indivíduo, cujas ordens são cópias das
+    de entrada) ou, sem ela, a agenda atual das operações. A solução é sempre gravada nas ordens de entrada.
+    """
+    name = "cp-sat"
+
+    def __init__(self, horizon_days=DEFAULT_HORIZON_DAYS, polish=False, seed: List[MaintenanceTask] = None):
+        super().__init__(horizon_days)
+        self.polish = polish
+        self.seed = seed
+
+    @staticmethod
+    def available():
+        return cp_solver.cp_model is not None
+
+    def _solve(self, tasks, workers, calendars, time_limit):
+        model = cp_solver.CPSatModel(tasks, workers, calendars, horizon_days=self.horizon_days)
+        if self.polish:
+            model.hint(self.seed)
+        status, unscheduled = model.solve(time_limit)
+        if unscheduled is None:
+            # Sem solução dentro do limite: a agenda recebida fica como está
+            unscheduled = [(task, op) for task in tasks for op in task.operations if not op.allocated_workers]
+        return list(tasks), unscheduled, status
+
+
+class AutoSolver(Solver):
+    """
+    Escolhe o backend pelo tamanho da instância: CP-SAT até `threshold` operações (se o OR-Tools estiver
+    instalado) e GA acima disso, opcionalmente refinando o resultado do GA com CP-SAT por `polish_time` segundos.
+    """
+    name = "auto"
+
+    def __init__(self, horizon_days=DEFAULT_HORIZON_DAYS, threshold=200, polish_time=None, genetic_solver: GeneticSolver = None):
+        super().__init__(horizon_days)
+        self.threshold = threshold
+        self.polish_time = polish_time
+        self.genetic_solver = genetic_solver or GeneticSolver(horizon_days)
+
+    def _solve(self, tasks, workers, calendars, time_limit):
+        operations = sum(len(task.operations) for task in tasks)
+        if CPSatSolver.available() and operations <= self.threshold:
+            result = CPSatSolver(self.horizon_days).solve(tasks, workers, calendars, time_limit)
+        else:
+            result = self.genetic_solver.solve(tasks, workers, calendars, time_limit)
+            if CPSatSolver.available() and self.polish_time:
+                # O CP-SAT parte do indivíduo do GA e grava a solução nas ordens de entrada (cujas reservas estão
+                # nos colaboradores): sem melhora, elas e os colaboradores voltam ao estado anterior
+                snapshot = snapshot_schedule(tasks, workers)
+                polished = CPSatSolver(self.horizon_days, polish=True, seed=result.schedule).solve(tasks, workers, calendars, self.polish_time)
+                if polished.status in ("OPTIMAL", "FEASIBLE") and polished.penalty <= result.penalty:
+                    result = polished
+                else:
+                    restore_schedule(snapshot)
+        self.name = f"auto/{result.solver}"
+        return result.schedule, result.unscheduled, result.status
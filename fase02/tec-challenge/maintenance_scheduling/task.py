@@ -35,11 +35,15 @@ class MaintenanceTask:
         """
         for operation in sorted(self.operations, key=lambda op: op.operation_id):
             # Filtrar os trabalhadores qualificados para a operação
-            qualified_workers = [worker for worker in workers if worker.has_skill(operation.required_skill)]
+            qualified_workers = [worker for worker in workers if worker.has_skill(operation.required_mask)]
             
-            # Se nenhum colaborador for qualificado, selecionar por experiência no ativo
+            # Se nenhum colaborador for qualificado, selecionar por experiência no ativo (recente primeiro)
             if not qualified_workers:
-                qualified_workers = sorted(workers, key=lambda w: w.experience_with_assets.get(operation.asset, 0), reverse=True)
+                experience = workers[0].experience if workers else None
+                if experience is not None:
+                    qualified_workers = experience.rank_workers(workers, operation.asset)
+                else:
+                    qualified_workers = sorted(workers, key=lambda w: w.experience_with_assets.get(operation.asset, 0), reverse=True)
             
             for worker in qualified_workers:
                 if worker.is_available(operation.due_date, operation.start_hour, operation.effort):
@@ -0,0 +1,211 @@
+# telemetry.py
+import cProfile
+import csv
+import io
+import json
+import pstats
+import statistics
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+PHASES = ['selection', 'crossover', 'mutation', 'evaluation']
+FIELDS = (['generation', 'elapsed', 'generation_time'] + [f"{phase}_time" for phase in PHASES] +
+          ['bookkeeping_time', 'evaluations', 'best', 'avg', 'worst', 'fitness_std', 'diversity'])
+
+
+def unique_ratio(population, key=tuple):
+    """
+    Diversidade da população: fração de indivíduos distintos segundo `key` (1.0 = todos diferentes).
+    """
+    if not population:
+        return 0.0
+    return len({key(individual) for individual in population}) / len(population)
+
+
+class GenerationTelemetry:
+    """
+    Telemetria por geração de um algoritmo genético: tempo gasto em cada fase (seleção, crossover, mutação e
+    avaliação), número de avaliações, melhor/média/pior fitness e diversidade, gravados em JSON Lines ou CSV
+    (pela extensão de `path`).
+
+    As fases são medidas envolvendo as funções do GA com `wrap(fase, funcao)`; o tempo é exclusivo, ou seja,
+    uma avaliação chamada dentro da seleção por torneio conta como avaliação e não como seleção. O que sobra
+    do tempo da geração é contabilizado como bookkeeping (estatísticas, logs, desenho).
+
+    Attributes:
+        path (str): Arquivo de saída (.csv para CSV; qualquer outra extensão para JSON Lines). None desativa a gravação.
+        maximize (bool): True se maior fitness é melhor (define best/worst).
+        profiler (str): 'cprofile' ou 'pyinstrument' para perfilar a execução em `profile()`; None desativa.
+        profile_path (str): Arquivo onde gravar o perfil (.prof do cProfile ou .html do pyinstrument).
+    """
+
+    def __init__(self, path=None, maximize=True, profiler=None, profile_path=None):
+        self.path = path
+        self.maximize = maximize
+        self.profiler = profiler
+        self.profile_path = profile_path
+        self._file = None
+        self._writer = None
+        self._stack = []
+        self._profiler = None
+        self.start()
+
+    def start(self):
+        """
+        Reinicia o relógio e os contadores (chamado pelo GA antes da primeira geração).
+        """
+        self.started = time.perf_counter()
+        self._generation_started = self.started
+        self._reset()
+        return self
+
+    def _reset(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+
+    def _switch(self, now):
+        # Fecha o trecho da fase do topo da pilha (tempo exclusivo)
+        if self._stack:
+            phase, since = self._stack[-1]
+            self.times[phase] += now - since
+
+    def enter(self, phase):
+        now = time.perf_counter()
+        self._switch(now)
+        self.counts[phase] += 1
+        self._stack.append((phase, now))
+
+    def exit(self):
+        now = time.perf_counter()
+        self._switch(now)
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1] = (self._stack[-1][0], now)
+
+    @contextmanager
+    def phase(self, name):
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def wrap(self, phase, function):
+        """
+        Retorna `function` instrumentada para contar chamadas e tempo na fase `phase`.
+        """
+        @wraps(function)
+        def timed(*args, **kwargs):
+            self.enter(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.exit()
+        return timed
+
+    def _write(self, row):
+        if self.path is None:
+            return
+        if self._file is None:
+            self._file = open(self.path, 'w', newline='')
+            if self.path.endswith('.csv'):
+                self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+                self._writer.writeheader()
+        if self._writer:
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(row) + '\n')
+        self._file.flush()
+
+    def record(self, generation, fitnesses, diversity=None):
+        """
+        Fecha a geração: grava tempos por fase, avaliações, estatísticas de fitness e diversidade e zera os contadores.
+        Retorna a linha gravada.
+        """
+        now = time.perf_counter()
+        generation_time = now - self._generation_started
+        fitnesses = list(fitnesses)
+        best, worst = (max, min) if self.maximize else (min, max)
+        row = {
+            'generation': generation,
+            'elapsed': now - self.started,
+            'generation_time': generation_time,
+            **{f"{phase}_time": self.times[phase] for phase in PHASES},
+            'bookkeeping_time': max(generation_time - sum(self.times.values()), 0.0),
+            'evaluations': self.counts['evaluation'],
+            'best': best(fitnesses) if fitnesses else None,
+            'avg': statistics.fmean(fitnesses) if fitnesses else None,
+            'worst': worst(fitnesses) if fitnesses else None,
+            'fitness_std': statistics.pstdev(fitnesses) if len(fitnesses) > 1 else 0.0,
+            'diversity': diversity,
+        }
+        self._write(row)
+        self._reset()
+        self._generation_started = time.perf_counter()
+        return row
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def start_profile(self):
+        """
+        Inicia o profiler escolhido em `profiler` (cProfile ou pyinstrument); sem profiler, não faz nada.
+        """
+        self._profiler = None
+        if self.profiler is None:
+            return
+        if self.profiler == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ImportError("O profiler pyinstrument não está instalado: pip install pyinstrument")
+            self._profiler = Profiler()
+            self._profiler.start()
+        elif self.profiler == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            raise ValueError(f"Profiler desconhecido: {self.profiler} (use 'cprofile' ou 'pyinstrument')")
+
+    def stop_profile(self):
+        """
+        Para o profiler, imprime o resumo e, se `profile_path` foi informado, grava o perfil completo.
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+        if self.profiler == 'pyinstrument':
+            profiler.stop()
+            print(profiler.output_text(unicode=True))
+            if self.profile_path:
+                with open(self.profile_path, 'w') as file:
+                    file.write(profiler.output_html())
+            return
+        profiler.disable()
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(20)
+        print(summary.getvalue())
+        if self.profile_path:
+            profiler.dump_stats(self.profile_path)
+
+    @contextmanager
+    def profile(self):
+        """
+        Perfila o bloco com `start_profile`/`stop_profile`.
+        """
+        self.start_profile()
+        try:
+            yield
+        finally:
+            self.stop_profile()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
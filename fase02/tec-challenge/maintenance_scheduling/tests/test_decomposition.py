@@ -0,0 +1,92 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from decomposition import WorkCenterDecomposition, greedy_solver
+from operation_task import OperationTask
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+
+MONDAY = date(2025, 1, 6)
+SHIFT = {day: [(8 * 60, 12 * 60), (13 * 60, 17 * 60)] for day in range(1, 6)}
+
+
+def make_task(task_id, *centers, effort=60):
+    task = MaintenanceTask(task_id, MONDAY, '08:00:00', 1)
+    for position, center in enumerate(centers):
+        task.add_operation(OperationTask(10 * (position + 1), [], MONDAY, 'A1', effort, '08:00:00', 1, center))
+    return task
+
+
+def make_instance():
+    # w2 atende CT3 e CT4; a ordem 5 tem operações em CT2 e CT5
+    centers = {'w0': {'CT1'}, 'w1': {'CT2'}, 'w2': {'CT3', 'CT4'}, 'w3': {'CT5'}}
+    workers = [Worker(worker_id, [], {}, total_hours=8 * 60) for worker_id in centers]
+    calendars = {worker_id: WorkerCalendar(worker_id, SHIFT, work_centers) for worker_id, work_centers in centers.items()}
+    tasks = [make_task(1, 'CT1'), make_task(2, 'CT2'), make_task(3, 'CT3'), make_task(4, 'CT4'), make_task(5, 'CT2', 'CT5'),
+             # Não cabem em nenhum turno: ficam sem agenda, em partições diferentes
+             make_task(6, 'CT1', effort=600), make_task(7, 'CT3', effort=600)]
+    return tasks, workers, calendars
+
+
+class TestWorkCenterDecomposition(unittest.TestCase):
+
+    def test_partitions(self):
+        tasks, workers, calendars = make_instance()
+        partitions = WorkCenterDecomposition(tasks, workers, calendars).partitions()
+        found = {frozenset(centers): (sorted(task.task_id for task in part_tasks), sorted(w.worker_id for w in part_workers))
+                 for centers, part_tasks, part_workers, _ in partitions}
+        self.assertEqual(found, {frozenset({'CT1'}): ([1, 6], ['w0']),
+                                 frozenset({'CT2', 'CT5'}): ([2, 5], ['w1', 'w3']),
+                                 frozenset({'CT3', 'CT4'}): ([3, 4, 7], ['w2'])})
+
+    def test_operation_without_center_joins_everything(self):
+        tasks, workers, calendars = make_instance()
+        tasks.append(make_task(8, None))
+        partitions = WorkCenterDecomposition(tasks, workers, calendars).partitions()
+        self.assertEqual(len(partitions), 1)
+        self.assertEqual(len(partitions[0][1]), len(tasks))
+
+    def test_parallel_solve_merges_into_input_objects(self):
+        tasks, workers, calendars = make_instance()
+        decomposition = WorkCenterDecomposition(tasks, workers, calendars, solver=greedy_solver, max_workers=2)
+        schedule = decomposition.solve()
+
+        self.assertEqual(sorted(task.task_id for task in schedule), [task.task_id for task in tasks])
+        # As ordens e os colaboradores voltam dos processos como cópias: a agenda vai para os objetos de entrada
+        self.assertTrue(all(any(task is original for original in tasks) for task in schedule))
+        by_id = {worker.worker_id: worker for worker in workers}
+        for task in schedule:
+            for operation in task.operations:
+                for worker in operation.allocated_workers:
+                    self.assertIs(worker, by_id[worker.worker_id])
+                    self.assertIn(operation, worker.operations)
+        self.assertEqual(tasks[0].operations[0].allocated_workers, [by_id['w0']])
+        self.assertEqual(sum(by_id['w2'].hours_allocated.values()), 120)
+
+        unscheduled = sorted((task.task_id, operation.operation_id) for task, operation in decomposition.unscheduled)
+        self.assertEqual(unscheduled, [(6, 10), (7, 10)])
+        self.assertTrue(all(task in tasks and operation in task.operations for task, operation in decomposition.unscheduled))
+
+    def test_sequential_solve_matches_parallel(self):
+        results = []
+        for max_workers in (1, 2):
+            tasks, workers, calendars = make_instance()
+            schedule = WorkCenterDecomposition(tasks, workers, calendars, max_workers=max_workers).solve()
+            results.append(sorted((task.task_id, op.operation_id, op.due_date, op.start_hour,
+                                   tuple(w.worker_id for w in op.allocated_workers))
+                                  for task in schedule for op in task.operations))
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
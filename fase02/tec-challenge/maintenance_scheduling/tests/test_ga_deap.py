@@ -0,0 +1,46 @@
+import os
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+try:
+    from ga_deap_claudai import TurnScheduling
+except ImportError:  # DEAP não instalado
+    TurnScheduling = None
+
+DATA = os.path.join(project_root, 'data')
+
+
+@unittest.skipIf(TurnScheduling is None, "DEAP não instalado")
+class TestTurnScheduling(unittest.TestCase):
+
+    def test_short_run_returns_valid_individual(self):
+        random.seed(0)
+        scheduler = TurnScheduling(os.path.join(DATA, 'ordens_manutencao.csv'), os.path.join(DATA, 'disponibilidade_full.csv'),
+                                   os.path.join(DATA, 'historico_manutencao.csv'))
+        with patch.object(scheduler, 'format_schedule', wraps=scheduler.format_schedule) as format_schedule:
+            frame = scheduler.solve(population_size=10, generations=3)
+        best, = format_schedule.call_args.args
+
+        # Um gene por executor, cada um sem executor (-1) ou um colaborador candidato daquela posição
+        self.assertEqual(len(best), len(scheduler.slot_rows))
+        self.assertEqual(best.typecode, 'i')
+        for gene, slot_pool, center_pool in zip(best, scheduler.slot_pools, scheduler.center_pools):
+            self.assertTrue(gene == -1 or gene in slot_pool or gene in center_pool)
+        self.assertTrue(best.fitness.valid)
+        self.assertEqual(best.fitness.values, scheduler.evaluate_schedule(best))
+
+        self.assertEqual(len(frame), len(scheduler.slot_rows))
+        self.assertTrue(set(frame['matricula']) <= set(scheduler.employees) | {''})
+
+
+if __name__ == '__main__':
+    unittest.main()
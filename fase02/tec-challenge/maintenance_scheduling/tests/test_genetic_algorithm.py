@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+import unittest
+from datetime import date
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+import genetic_algorithm_v1
+import genetic_algorithm_v2
+from greedy_scheduler import GreedyScheduler
+from local_search import LocalSearch
+from operation_task import OperationTask
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+
+MONDAY = date(2025, 1, 6)
+SHIFT = {day: [(8 * 60, 12 * 60), (13 * 60, 17 * 60)] for day in range(1, 6)}
+
+
+def make_instance(orders=12):
+    workers = [Worker(f'w{i}', [], {}, total_hours=40 * 60) for i in range(3)]
+    calendars = {w.worker_id: WorkerCalendar(w.worker_id, SHIFT, {'CT1'}) for w in workers}
+    tasks = []
+    for task_id in range(orders):
+        # Prioridades distintas: a agenda gulosa (semente) sai em ordem diferente de `tasks`
+        task = MaintenanceTask(task_id, MONDAY, '08:00:00', task_id % 5)
+        task.add_operation(OperationTask(10, [], MONDAY, 'A1', 60, '08:00:00', 1, 'CT1'))
+        task.add_operation(OperationTask(20, [], MONDAY, 'A1', 60, '09:00:00', 1, 'CT1'))
+        tasks.append(task)
+    return tasks, workers, calendars
+
+
+class TestGeneticAlgorithm(unittest.TestCase):
+
+    def assert_each_order_once(self, individual, tasks):
+        self.assertEqual(sorted(task.task_id for task in individual), [task.task_id for task in tasks])
+
+    def run_ga(self, module, local_search=False, mutation_rate=0.5):
+        tasks, workers, calendars = make_instance()
+        seed = GreedyScheduler(tasks, workers, calendars).schedule()
+        self.assertNotEqual([task.task_id for task in seed], [task.task_id for task in tasks])
+        mutation_operator = LocalSearch(workers, calendars).mutate if local_search else None
+        genetic_algo = module.GeneticAlgorithm(tasks, workers, population_size=8, generations=15, mutation_rate=mutation_rate,
+                                               seed=seed, mutation_operator=mutation_operator)
+        for individual in genetic_algo.initial_population():
+            self.assertEqual([task.task_id for task in individual], [task.task_id for task in tasks])
+        return genetic_algo.optimize(), tasks
+
+    def test_v2_returns_each_order_once(self):
+        random.seed(1)
+        for local_search in (False, True):
+            with self.subTest(local_search=local_search):
+                self.assert_each_order_once(*self.run_ga(genetic_algorithm_v2, local_search))
+
+    def test_v1_returns_each_order_once(self):
+        random.seed(1)
+        # A mutação do v1 realoca os colaboradores da ordem toda (lenta): taxa baixa
+        self.assert_each_order_once(*self.run_ga(genetic_algorithm_v1, mutation_rate=0.05))
+
+    def test_crossover_of_permutations(self):
+        random.seed(2)
+        tasks, workers, _ = make_instance()
+        genetic_algo = genetic_algorithm_v2.GeneticAlgorithm(tasks, workers)
+        for _ in range(50):
+            child = genetic_algo.crossover(random.sample(tasks, len(tasks)), random.sample(tasks, len(tasks)))
+            self.assert_each_order_once(child, tasks)
+
+
+if __name__ == '__main__':
+    unittest.main()
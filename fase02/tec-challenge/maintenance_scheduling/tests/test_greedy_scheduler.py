@@ -0,0 +1,176 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+import pandas as pd
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from data_loader import tasks_from_dataframe
+from greedy_scheduler import GreedyScheduler, WorkerIndex
+from operation_task import OperationTask
+from run_controller import RunController
+from task import MaintenanceTask
+from util import time_to_minutes
+from worker import Worker
+from worker_calendar import WorkerCalendar
+
+MONDAY = date(2025, 1, 6)
+# 08:00-12:00 e 13:00-17:00, de segunda a sexta
+SHIFT = {day: [(8 * 60, 12 * 60), (13 * 60, 17 * 60)] for day in range(1, 6)}
+
+
+def make_worker(worker_id, skills=()):
+    return Worker(worker_id, list(skills), {}, total_hours=8 * 60)
+
+
+def make_task(task_id, efforts, skill=(), quantity=1, work_center='CT1', day=MONDAY, priority=1):
+    task = MaintenanceTask(task_id, day, '00:00:00', priority)
+    for position, effort in enumerate(efforts):
+        task.add_operation(OperationTask((position + 1) * 10, list(skill), day, 'A1', effort,
+                                         '00:00:00' if position == 0 else None, quantity, work_center))
+    return task
+
+
+def interval(operation):
+    start = time_to_minutes(operation.start_hour)
+    return operation.due_date, start, start + operation.effort
+
+
+class TestWorkerIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.workers = [make_worker('w1', ['NR10']), make_worker('w2'), make_worker('w3', ['NR10']), make_worker('w4')]
+        self.calendars = {
+            'w1': WorkerCalendar('w1', SHIFT, {'CT1'}),
+            'w2': WorkerCalendar('w2', SHIFT, {'CT1'}),
+            'w3': WorkerCalendar('w3', SHIFT, {'CT2'}),
+            'w4': WorkerCalendar('w4', SHIFT),  # sem centro: atende qualquer um
+        }
+        self.index = WorkerIndex(self.workers, self.calendars)
+
+    def ids(self, operation):
+        return [worker.worker_id for worker in self.index.candidates(operation)]
+
+    def test_filters_by_center_and_skill(self):
+        self.assertEqual(self.ids(OperationTask(10, ['NR10'], MONDAY, 'A1', 60, None, 1, 'CT1')), ['w1'])
+        self.assertEqual(self.ids(OperationTask(10, [], MONDAY, 'A1', 60, None, 1, 'CT1')), ['w1', 'w2', 'w4'])
+
+    def test_falls_back_to_whole_center_without_qualified_workers(self):
+        self.assertEqual(self.ids(OperationTask(10, ['NR35'], MONDAY, 'A1', 60, None, 1, 'CT2')), ['w3', 'w4'])
+
+    def test_operation_without_center_takes_anyone(self):
+        self.assertEqual(self.ids(OperationTask(10, ['NR10'], MONDAY, 'A1', 60, None, 1, None)), ['w1', 'w3'])
+
+    def test_workers_without_calendar_are_ignored(self):
+        index = WorkerIndex(self.workers + [make_worker('w5', ['NR10'])], self.calendars)
+        self.assertNotIn('w5', [w.worker_id for w in index.candidates(OperationTask(10, ['NR10'], MONDAY, 'A1', 60, None, 1, None))])
+
+
+class TestGreedyScheduler(unittest.TestCase):
+
+    def assert_feasible(self, tasks, calendars):
+        """Sem sobreposição por colaborador, tudo dentro do turno e operações de uma ordem em sequência."""
+        bookings = {}
+        for task in tasks:
+            previous_end = None
+            for operation in sorted(task.operations, key=lambda op: op.operation_id):
+                if not operation.allocated_workers:
+                    continue
+                day, start, end = interval(operation)
+                if previous_end is not None:
+                    self.assertGreaterEqual((day, start), previous_end)
+                previous_end = (day, end)
+                self.assertEqual(len({w.worker_id for w in operation.allocated_workers}), operation.quantity)
+                for worker in operation.allocated_workers:
+                    windows = calendars[worker.worker_id].weekly_shifts.get(day.isoweekday(), [])
+                    self.assertTrue(any(a <= start and end <= b for a, b in windows), (worker.worker_id, day, start, end))
+                    bookings.setdefault((worker.worker_id, day), []).append((start, end))
+        for intervals in bookings.values():
+            intervals.sort()
+            for (_, end), (next_start, _) in zip(intervals, intervals[1:]):
+                self.assertLessEqual(end, next_start)
+
+    def test_capacity_postpones_to_next_day(self):
+        workers = [make_worker('w1')]
+        calendars = {'w1': WorkerCalendar('w1', SHIFT, {'CT1'})}
+        tasks = [make_task(1, [240]), make_task(2, [240]), make_task(3, [240])]
+        scheduler = GreedyScheduler(tasks, workers, calendars)
+        scheduled = scheduler.schedule()
+
+        self.assert_feasible(scheduled, calendars)
+        self.assertEqual(scheduler.unscheduled, [])
+        days = sorted(task.operations[0].due_date for task in tasks)
+        self.assertEqual(days, [MONDAY, MONDAY, date(2025, 1, 7)])
+
+    def test_priority_order(self):
+        workers = [make_worker('w1')]
+        calendars = {'w1': WorkerCalendar('w1', SHIFT, {'CT1'})}
+        low, high = make_task(1, [480], priority=1), make_task(2, [240], priority=9)
+        GreedyScheduler([low, high], workers, calendars).schedule()
+        self.assertEqual(interval(high.operations[0]), (MONDAY, 8 * 60, 12 * 60))
+        # 8h sem interrupção não cabem em nenhum período do turno
+        self.assertEqual(low.operations[0].allocated_workers, [])
+
+    def test_skill_and_quantity(self):
+        workers = [make_worker('w1'), make_worker('w2', ['NR10']), make_worker('w3', ['NR10'])]
+        calendars = {worker.worker_id: WorkerCalendar(worker.worker_id, SHIFT, {'CT1'}) for worker in workers}
+        task = make_task(1, [60, 60], skill=['NR10'], quantity=2)
+        GreedyScheduler([task], workers, calendars).schedule()
+
+        self.assert_feasible([task], calendars)
+        for operation in task.operations:
+            self.assertEqual(sorted(w.worker_id for w in operation.allocated_workers), ['w2', 'w3'])
+
+    def test_operations_follow_order_sequence(self):
+        workers = [make_worker('w1'), make_worker('w2')]
+        calendars = {worker.worker_id: WorkerCalendar(worker.worker_id, SHIFT, {'CT1'}) for worker in workers}
+        tasks = [make_task(task_id, [90, 120, 60]) for task_id in range(6)]
+        scheduler = GreedyScheduler(tasks, workers, calendars, horizon_days=3)
+        self.assert_feasible(scheduler.schedule(), calendars)
+
+    def test_unscheduled_beyond_horizon(self):
+        workers = [make_worker('w1')]
+        calendars = {'w1': WorkerCalendar('w1', SHIFT, {'CT1'})}
+        tasks = [make_task(task_id, [240, 240]) for task_id in range(3)]
+        scheduler = GreedyScheduler(tasks, workers, calendars, horizon_days=1)
+        scheduler.schedule()
+        self.assertEqual(len(scheduler.unscheduled), 2)
+
+    def test_time_budget_returns_remaining_orders_unscheduled(self):
+        workers = [make_worker('w1')]
+        calendars = {'w1': WorkerCalendar('w1', SHIFT, {'CT1'})}
+        tasks = [make_task(task_id, [60, 60], priority=task_id) for task_id in range(3)]
+        controller = RunController(time_budget=0)
+        scheduler = GreedyScheduler(tasks, workers, calendars)
+        scheduled = scheduler.schedule(controller)
+
+        self.assertEqual(controller.stop_reason, 'time_budget')
+        self.assertEqual([task.task_id for task in scheduled], [2, 1, 0])
+        self.assertEqual(len(scheduler.unscheduled), 6)
+        self.assertTrue(all(not op.allocated_workers for task in tasks for op in task.operations))
+
+
+class TestLoadTasks(unittest.TestCase):
+
+    def test_missing_work_center_is_none(self):
+        rows = pd.DataFrame({
+            'ordem': [1, 1], 'operacao': [10, 20], 'centro_trabalho': ['CT1', float('nan')],
+            'data_inicio_base': ['6/1/2025', '6/1/2025'], 'hora_inicio_base': ['08:00:00', '08:00:00'],
+            'indice_irpe': [5, 5], 'esforco_individual': ['1,5', '1'], 'qualificacao': ['NR10 - 2024', float('nan')],
+            'equipamento_ordem': [100, 100], 'quantidade_executantes': [1, 2],
+        })
+        task, = tasks_from_dataframe(rows)
+        self.assertEqual([op.work_center for op in task.operations], ['CT1', None])
+        self.assertEqual([op.effort for op in task.operations], [90, 60])
+        self.assertEqual(task.operations[0].required_skill, ['NR10 - 2024'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import random
+import sys
+import unittest
+from datetime import date, timedelta
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from greedy_scheduler import GreedyScheduler
+from local_search import LocalSearch, Reassign, ScheduleIndex, Shift, Swap, copy_individual
+from operation_task import OperationTask
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+
+MONDAY = date(2025, 1, 6)
+SHIFT = {day: [(8 * 60, 12 * 60), (13 * 60, 17 * 60)] for day in range(1, 6)}
+
+
+def make_worker(worker_id, skills=()):
+    return Worker(worker_id, list(skills), {}, total_hours=8 * 60)
+
+
+def make_operation(operation_id, start_hour, effort=60, day=MONDAY, skill=()):
+    return OperationTask(operation_id, list(skill), day, 'A1', effort, start_hour, 1, 'CT1')
+
+
+def make_task(task_id, operations, day=MONDAY):
+    task = MaintenanceTask(task_id, day, '08:00:00', 1)
+    for operation in operations:
+        task.add_operation(operation)
+    return task
+
+
+def state(index, operations):
+    """Tudo que um movimento pode alterar: datas, horários, colaboradores e reservas do índice."""
+    return ([(op.due_date, op.start_hour, [w.worker_id for w in op.allocated_workers]) for op in operations],
+            {key: list(bookings) for key, bookings in index.bookings.items() if bookings})
+
+
+class TestMoves(unittest.TestCase):
+
+    def setUp(self):
+        self.workers = [make_worker('w1'), make_worker('w2'), make_worker('w3')]
+        self.calendars = {w.worker_id: WorkerCalendar(w.worker_id, SHIFT, {'CT1'}) for w in self.workers}
+        self.op_a = make_operation(10, '08:00:00')
+        self.op_b = make_operation(10, '08:30:00')
+        self.op_a.allocated_workers.append(self.workers[0])
+        self.op_b.allocated_workers.append(self.workers[1])
+        self.operations = [self.op_a, self.op_b]
+        self.index = ScheduleIndex(self.calendars)
+        for operation in self.operations:
+            for worker in operation.allocated_workers:
+                self.index.add(worker.worker_id, operation)
+
+    def assert_round_trip(self, move):
+        before = state(self.index, self.operations)
+        move.apply(self.index)
+        self.assertNotEqual(state(self.index, self.operations), before)
+        move.undo(self.index)
+        self.assertEqual(state(self.index, self.operations), before)
+
+    def test_reassign_round_trip(self):
+        self.assert_round_trip(Reassign(self.op_a, self.workers[0], self.workers[2]))
+        self.assert_round_trip(Reassign(self.op_a, None, self.workers[2]))
+
+    def test_shift_round_trip(self):
+        self.assert_round_trip(Shift(self.op_a, MONDAY + timedelta(days=1), 13 * 60))
+
+    def test_swap_round_trip(self):
+        self.assert_round_trip(Swap(self.op_a, self.workers[0], self.op_b, self.workers[1]))
+
+    def test_delta_leaves_index_unchanged(self):
+        search = LocalSearch(self.workers, self.calendars)
+        search.build([make_task(1, [self.op_a]), make_task(2, [self.op_b])])
+        before = state(search.index, self.operations)
+        move = Reassign(self.op_a, self.workers[0], self.workers[2])
+        self.assertEqual(search.delta(move), 0)
+        self.assertEqual(state(search.index, self.operations), before)
+
+
+class TestNeighborhood(unittest.TestCase):
+
+    def setUp(self):
+        self.worker = make_worker('w1')
+        self.calendars = {'w1': WorkerCalendar('w1', SHIFT, {'CT1'})}
+        self.search = LocalSearch([self.worker], self.calendars, horizon_days=2)
+
+    def shifts(self, operation):
+        return [(move.day, move.start) for move in self.search.neighborhood(operation) if isinstance(move, Shift)]
+
+    def test_shift_is_anchored_to_planned_date(self):
+        operation = make_operation(10, '08:00:00')
+        operation.allocated_workers.append(self.worker)
+        self.search.build([make_task(1, [operation])])
+        # Deslocamentos aceitos em sequência não podem empurrar a operação além do horizonte
+        for _ in range(5):
+            self.search.apply(Shift(operation, max(day for day, _ in self.shifts(operation)), 8 * 60), commit=False)
+        self.assertEqual(operation.due_date, MONDAY + timedelta(days=2))
+        self.assertTrue(all(MONDAY <= day <= MONDAY + timedelta(days=2) for day, _ in self.shifts(operation)))
+
+    def test_shift_keeps_order_sequence(self):
+        first, second, third = make_operation(10, '09:00:00'), make_operation(20, '11:00:00'), make_operation(30, '10:00:00', day=MONDAY + timedelta(days=1))
+        other = make_worker('w2')
+        self.calendars['w2'] = WorkerCalendar('w2', SHIFT, {'CT1'})
+        first.allocated_workers.append(other)
+        second.allocated_workers.append(self.worker)
+        third.allocated_workers.append(other)
+        self.search.build([make_task(1, [first, second, third])])
+
+        # Depois do fim de 10 (10:00 de segunda) e antes do início de 30 (10:00 de terça)
+        self.assertEqual(self.shifts(second), [(MONDAY, 10 * 60), (MONDAY + timedelta(days=1), 8 * 60)])
+
+
+class TestMutation(unittest.TestCase):
+
+    def test_mutate_does_not_touch_shared_individual(self):
+        random.seed(3)
+        workers = [make_worker(f'w{i}') for i in range(3)]
+        calendars = {w.worker_id: WorkerCalendar(w.worker_id, SHIFT, {'CT1'}) for w in workers}
+        tasks = [make_task(i, [make_operation(10, '08:00:00', effort=120), make_operation(20, '10:00:00', effort=60)]) for i in range(6)]
+        seed = GreedyScheduler(tasks, workers, calendars).schedule()
+        snapshot = [(op.due_date, op.start_hour, list(op.allocated_workers)) for task in seed for op in task.operations]
+        worker_operations = [list(w.operations) for w in workers]
+
+        search = LocalSearch(workers, calendars, horizon_days=3)
+        mutants = [search.mutate(seed) for _ in range(30)]
+
+        self.assertEqual([(op.due_date, op.start_hour, list(op.allocated_workers)) for task in seed for op in task.operations], snapshot)
+        self.assertEqual([list(w.operations) for w in workers], worker_operations)
+        self.assertTrue(all(mutant[0] is not seed[0] for mutant in mutants))
+
+    def test_copy_individual_shares_workers_only(self):
+        worker = make_worker('w1')
+        operation = make_operation(10, '08:00:00')
+        operation.allocated_workers.append(worker)
+        task = make_task(1, [operation])
+        copied, = copy_individual([task])
+        self.assertIsNot(copied.operations[0], operation)
+        self.assertIsNot(copied.operations[0].allocated_workers, operation.allocated_workers)
+        self.assertIs(copied.operations[0].allocated_workers[0], worker)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from operation_task import OperationTask
+from rescheduling import ReschedulingService
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+
+MONDAY = date(2025, 1, 6)
+TUESDAY = MONDAY + timedelta(days=1)
+SHIFT = {day: [(8 * 60, 12 * 60), (13 * 60, 17 * 60)] for day in range(1, 6)}
+
+
+def make_task(task_id, efforts, day=MONDAY, priority=1):
+    task = MaintenanceTask(task_id, day, '00:00:00', priority)
+    for position, effort in enumerate(efforts):
+        task.add_operation(OperationTask((position + 1) * 10, [], day, 'A1', effort, '00:00:00', 1, 'CT1'))
+    return task
+
+
+def workers_of(task):
+    return [[w.worker_id for w in op.allocated_workers] for op in task.operations]
+
+
+class TestReschedulingService(unittest.TestCase):
+
+    def make_service(self, worker_ids=('w1',)):
+        workers = [Worker(worker_id, [], {}, total_hours=8 * 60) for worker_id in worker_ids]
+        calendars = {w.worker_id: WorkerCalendar(w.worker_id, SHIFT, {'CT1'}) for w in workers}
+        return ReschedulingService(workers, calendars, horizon_days=0)
+
+    def test_add_order_uses_free_time_only(self):
+        service = self.make_service()
+        first = make_task(1, [240])
+        service.load([first])
+        result = service.add_order(make_task(2, [240]))
+
+        self.assertEqual(len(result.changed), 1)
+        self.assertEqual(result.unscheduled, [])
+        self.assertEqual([op.start_hour for task in service.tasks.values() for op in task.operations], ['08:00:00', '13:00:00'])
+        with self.assertRaises(ValueError):
+            service.add_order(make_task(2, [60]))
+
+    def test_remove_order_schedules_pending_orders(self):
+        service = self.make_service()
+        tasks = [make_task(1, [240], priority=3), make_task(2, [240], priority=2), make_task(3, [240], priority=1)]
+        service.load(tasks)
+        self.assertEqual([task.task_id for task, _ in service.unscheduled], [3])
+
+        result = service.remove_order(1)
+        self.assertEqual(result.unscheduled, [])
+        self.assertEqual(workers_of(tasks[2]), [['w1']])
+        self.assertNotIn(tasks[0].operations[0], service.owners)
+        self.assertNotIn(tasks[0].operations[0], service.local_search.operations)
+        self.assertEqual(len(service.local_search.operations), 2)
+        self.assertIs(service.owners[tasks[2].operations[0]], tasks[2])
+        with self.assertRaises(KeyError):
+            service.remove_order(1)
+
+    def test_delay_order(self):
+        service = self.make_service()
+        task = make_task(1, [60, 60])
+        service.load([task])
+        result = service.delay_order(1, TUESDAY, '09:00:00')
+
+        self.assertEqual(len(result.changed), 2)
+        self.assertEqual([(op.due_date, op.start_hour) for op in task.operations], [(TUESDAY, '09:00:00'), (TUESDAY, '10:00:00')])
+        self.assertEqual([op.planned_date for op in task.operations], [TUESDAY, TUESDAY])
+        # O dia antigo foi liberado
+        self.assertEqual(service.calendars['w1'].free_intervals(MONDAY), [(8 * 60, 12 * 60), (13 * 60, 17 * 60)])
+
+    def test_worker_absence_replaces_worker(self):
+        service = self.make_service(('w1', 'w2'))
+        task = make_task(1, [60])
+        service.load([task])
+        absent = task.operations[0].allocated_workers[0].worker_id
+        result = service.worker_absence(absent, MONDAY, '08:00', '12:00')
+
+        self.assertEqual(len(result.changed), 1)
+        self.assertIs(result.changed[0][0], task)
+        self.assertEqual(len(task.operations[0].allocated_workers), 1)
+        self.assertNotEqual(task.operations[0].allocated_workers[0].worker_id, absent)
+        self.assertEqual(result.unscheduled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
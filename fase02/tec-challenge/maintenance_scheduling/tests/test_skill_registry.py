@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from skill_registry import SkillRegistry, normalize_skill
+from worker import Worker
+
+
+class TestNormalizeSkill(unittest.TestCase):
+
+    def test_normalize_skill(self):
+        self.assertEqual(normalize_skill(' NR10 - 2024 '), 'NR10 - 2024')
+        self.assertEqual(normalize_skill('nr10-2024'), 'NR10 - 2024')
+        self.assertEqual(normalize_skill('SLR  -   sist'), 'SLR - SIST')
+        self.assertEqual(normalize_skill('nr13'), 'NR13')
+        self.assertEqual(normalize_skill('  '), '')
+
+    def test_suffix_is_kept(self):
+        # O ano da certificação e o complemento fazem parte do nome
+        self.assertNotEqual(normalize_skill('NR10 - 2024'), normalize_skill('NR10 - 2025'))
+        self.assertNotEqual(normalize_skill('SLR - SIST'), normalize_skill('SLR'))
+
+
+class TestSkillRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SkillRegistry()
+
+    def test_parse(self):
+        self.assertEqual(self.registry.parse('NR13 / NR10 - 2024 / nr13 / nr10-2024'), ['NR13', 'NR10 - 2024'])
+        for empty in (None, float('nan'), '', '  ', 'nan'):
+            self.assertEqual(self.registry.parse(empty), [])
+
+    def test_bits_are_stable(self):
+        self.assertEqual(self.registry.bit('NR10'), 1)
+        self.assertEqual(self.registry.bit('NR13'), 2)
+        self.assertEqual(self.registry.bit(' nr10 '), 1)
+        self.assertEqual(self.registry.bit('NR10 - 2023'), 4)
+        self.assertEqual(len(self.registry), 3)
+
+    def test_mask(self):
+        mask = self.registry.mask(['NR10', 'NR13'])
+        self.assertEqual(mask, self.registry.mask('nr10') | self.registry.mask(' NR13 '))
+        self.assertEqual(self.registry.mask([]), 0)
+        self.assertTrue(SkillRegistry.has_any(mask, self.registry.mask('NR13')))
+        self.assertFalse(SkillRegistry.has_all(self.registry.mask('NR10'), mask))
+        self.assertTrue(SkillRegistry.has_all(mask, mask))
+
+
+class TestWorkerSkills(unittest.TestCase):
+
+    def test_has_skill_accepts_names_lists_and_masks(self):
+        worker = Worker('w1', ['NR10 - 2024', 'nr35'], {}, total_hours=480)
+        self.assertEqual(worker.skills, ['NR10 - 2024', 'NR35'])
+        self.assertTrue(worker.has_skill('NR35'))
+        self.assertTrue(worker.has_skill(['NR13', 'nr10-2024']))
+        self.assertFalse(worker.has_skill('NR10'))
+        self.assertTrue(worker.has_skill(worker.skill_mask))
+        self.assertFalse(worker.has_skill('NR13'))
+        self.assertFalse(worker.has_all_skills(['NR10', 'NR13']))
+        self.assertTrue(worker.has_all_skills(['NR10 - 2024', 'nr35']))
+        self.assertFalse(worker.has_all_skills(['NR10 - 2024', 'NR35 - 2022']))
+
+
+if __name__ == '__main__':
+    unittest.main()
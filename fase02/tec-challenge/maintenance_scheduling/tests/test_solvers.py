@@ -0,0 +1,156 @@
+import contextlib
+import io
+import os
+import random
+import sys
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+# --- Start of sys.path modification ---
+# Os módulos de maintenance_scheduling são importados pelo nome, como em main.py
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+import cp_solver
+from data_loader import load_tasks_from_csv, load_worker_calendars_from_csv, load_workers_from_csv
+from local_search import MISSING_WORKER_PENALTY
+from operation_task import OperationTask
+from solvers import AutoSolver, CPSatSolver, GeneticSolver, GreedySolver, evaluate_schedule, restore_schedule, snapshot_schedule
+from task import MaintenanceTask
+from worker import Worker
+from worker_calendar import WorkerCalendar
+
+MONDAY = date(2025, 1, 6)
+SHIFT = {day: [(8 * 60, 12 * 60), (13 * 60, 17 * 60)] for day in range(1, 6)}
+DATA = os.path.join(project_root, 'data')
+
+
+def make_instance():
+    workers = [Worker(f'w{i}', [], {}, total_hours=8 * 60) for i in range(2)]
+    calendars = {w.worker_id: WorkerCalendar(w.worker_id, SHIFT, {'CT1'}) for w in workers}
+    tasks = []
+    for task_id in range(4):
+        task = MaintenanceTask(task_id, MONDAY, '08:00:00', 1)
+        task.add_operation(OperationTask(10, [], MONDAY, 'A1', 120, '08:00:00', 1, 'CT1'))
+        tasks.append(task)
+    return tasks, workers, calendars
+
+
+def state(tasks, workers):
+    return ([(op.due_date, op.start_hour, [w.worker_id for w in op.allocated_workers]) for task in tasks for op in task.operations],
+            [(list(w.operations), dict(w.hours_allocated)) for w in workers])
+
+
+def worse_polish(self, tasks, workers, calendars, time_limit):
+    """CP-SAT simulado que grava nas operações uma agenda pior: todos com o mesmo colaborador, no mesmo horário."""
+    for task in tasks:
+        for operation in task.operations:
+            for worker in list(operation.allocated_workers):
+                operation.unassign_worker(worker)
+            operation.start_hour = '08:00:00'
+            operation.allocated_workers.append(workers[0])
+    return list(tasks), [], "FEASIBLE"
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_restore_round_trip(self):
+        tasks, workers, calendars = make_instance()
+        operation = tasks[0].operations[0]
+        operation.assign_worker(workers[0])
+        before = state(tasks, workers)
+        snapshot = snapshot_schedule(tasks, workers)
+        worse_polish(None, tasks, workers, calendars, None)
+        operation.assign_worker(workers[1])
+        restore_schedule(snapshot)
+        self.assertEqual(state(tasks, workers), before)
+
+
+class TestEvaluateSchedule(unittest.TestCase):
+
+    def test_missing_orders_are_charged(self):
+        tasks, workers, calendars = make_instance()
+        for task, worker, start_hour in zip(tasks, workers * 2, ['08:00:00', '08:00:00', '10:00:00', '10:00:00']):
+            task.operations[0].start_hour = start_hour
+            task.operations[0].assign_worker(worker)
+        # Uma agenda que repete uma ordem e perde outra não pode custar menos que a completa
+        broken = [tasks[0], tasks[0]] + tasks[2:]
+        self.assertEqual(evaluate_schedule(broken, calendars, tasks) - evaluate_schedule(broken, calendars), MISSING_WORKER_PENALTY)
+        self.assertEqual(evaluate_schedule(tasks, calendars, tasks), 0)
+        self.assertGreater(evaluate_schedule(broken, calendars, tasks), 0)
+
+
+class TestAutoSolver(unittest.TestCase):
+
+    def test_rejected_polish_restores_ga_schedule(self):
+        random.seed(0)
+        tasks, workers, calendars = make_instance()
+        solver = AutoSolver(threshold=0, polish_time=1, genetic_solver=GeneticSolver(population_size=6, generations=2))
+        ga_result = {}
+        solve_ga = GeneticSolver.solve
+
+        def record(genetic_solver, *args):
+            result = solve_ga(genetic_solver, *args)
+            ga_result['state'], ga_result['penalty'] = state(result.schedule, workers), result.penalty
+            return result
+
+        with patch.object(CPSatSolver, 'available', return_value=True), \
+                patch.object(CPSatSolver, '_solve', worse_polish), \
+                patch.object(GeneticSolver, 'solve', record):
+            result = solver.solve(tasks, workers, calendars)
+
+        self.assertEqual(solver.name, 'auto/ga')
+        self.assertEqual(state(result.schedule, workers), ga_result['state'])
+        self.assertEqual(result.penalty, ga_result['penalty'])
+        self.assertEqual(result.penalty, evaluate_schedule(result.schedule, calendars))
+
+
+def load_bundled():
+    workers = load_workers_from_csv(os.path.join(DATA, 'disponibilidade_full.csv'), os.path.join(DATA, 'historico_manutencao.csv'))
+    calendars = load_worker_calendars_from_csv(os.path.join(DATA, 'disponibilidade_full.csv'))
+    return load_tasks_from_csv(os.path.join(DATA, 'ordens_manutencao.csv')), workers, calendars
+
+
+@unittest.skipIf(cp_solver.cp_model is None, "OR-Tools não instalado")
+class TestCPSatSolver(unittest.TestCase):
+
+    def test_workers_with_different_overlapping_shifts_work_together(self):
+        # w0 trabalha 07:00-13:00 e w1 08:00-12:00/13:00-17:00: as janelas diferem, mas 08:00-12:00 serve aos dois
+        workers = [Worker(f'w{i}', [], {}, total_hours=8 * 60) for i in range(2)]
+        calendars = {'w0': WorkerCalendar('w0', {1: [(7 * 60, 13 * 60)]}, {'CT1'}),
+                     'w1': WorkerCalendar('w1', {1: [(8 * 60, 12 * 60), (13 * 60, 17 * 60)]}, {'CT1'})}
+        task = MaintenanceTask(1, MONDAY, '08:00:00', 1)
+        task.add_operation(OperationTask(10, [], MONDAY, 'A1', 60, '08:00:00', 2, 'CT1'))
+
+        result = CPSatSolver(horizon_days=0).solve([task], workers, calendars)
+
+        operation = task.operations[0]
+        self.assertEqual(result.unscheduled, [])
+        self.assertEqual(sorted(w.worker_id for w in operation.allocated_workers), ['w0', 'w1'])
+        self.assertEqual(operation.start_hour, '08:00:00')
+        self.assertEqual(result.penalty, 0)
+
+    def test_polish_of_ga_individual(self):
+        random.seed(0)
+        tasks, workers, calendars = make_instance()
+        output = io.StringIO()
+        solver = AutoSolver(threshold=0, polish_time=5, genetic_solver=GeneticSolver(population_size=6, generations=3, mutation_rate=0.5))
+        with contextlib.redirect_stdout(output):
+            result = solver.solve(tasks, workers, calendars)
+        # O indivíduo do GA tem cópias das ordens: a solução vai para as ordens de entrada, sem reservas conflitantes
+        self.assertNotIn("não pode ser alocado", output.getvalue())
+        self.assertEqual(sorted(task.task_id for task in result.schedule), [task.task_id for task in tasks])
+        self.assertEqual(result.penalty, evaluate_schedule(result.schedule, calendars, tasks))
+
+    def test_not_worse_than_greedy_on_bundled_data(self):
+        greedy = GreedySolver().solve(*load_bundled())
+        exact = CPSatSolver().solve(*load_bundled(), time_limit=30)
+        self.assertIn(exact.status, ("OPTIMAL", "FEASIBLE"))
+        self.assertLessEqual(exact.penalty, greedy.penalty)
+
+
+if __name__ == '__main__':
+    unittest.main()
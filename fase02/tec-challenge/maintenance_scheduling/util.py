@@ -8,3 +8,27 @@ def calculate_end_time(start_hour, effort):
     init_hour_dt = datetime.strptime(start_hour, hour_format)
     end_hour_dt = init_hour_dt + timedelta(minutes=effort)
     return end_hour_dt.strftime(hour_format)
+
+def time_to_minutes(time_str):
+    """
+    Converte um horário no formato 'HH:MM' ou 'HH:MM:SS' em minutos desde a meia-noite.
+    """
+    parts = [int(float(x)) for x in str(time_str).strip().split(':')]
+    parts += [0] * (3 - len(parts))
+    return parts[0] * 60 + parts[1] + parts[2] // 60
+
+def minutes_to_time(minutes):
+    """
+    Converte minutos desde a meia-noite no formato 'HH:MM:SS' usado pelas operações.
+    """
+    minutes = int(minutes)
+    return f"{minutes // 60:02}:{minutes % 60:02}:00"
+
+def unique_workers(workers):
+    """
+    Remove colaboradores repetidos (uma linha por centro de trabalho/dia no CSV), mantendo o primeiro de cada matrícula.
+    """
+    unique = {}
+    for worker in workers:
+        unique.setdefault(worker.worker_id, worker)
+    return list(unique.values())
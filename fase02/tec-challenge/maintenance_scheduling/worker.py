@@ -2,21 +2,26 @@
 from typing import List
 from datetime import datetime, date
 from util import calculate_end_time
+from skill_registry import SKILLS, normalize_skill
 class Worker:
     """
     Representa um colaborador com habilidades, disponibilidade e experiência.
 
     Attributes:
         worker_id (str): ID do colaborador.
-        skills (list): Lista de habilidades do colaborador.
+        skills (list): Lista de habilidades do colaborador (nomes normalizados).
+        skill_mask (int): Máscara de bits das habilidades no registro SKILLS.
         experience_with_assets (dict): Mapeia o ativo e o número de execuções no equipamento.
+        experience (ExperienceIndex): Índice de experiência compartilhado (pontuação com decaimento por recência).
         hours_allocated (dict): Mapeia as datas e o tempo alocado para o colaborador.
         total_hours (int): tempo total disponíveis para alocação em minutos.
     """
-    def __init__(self, worker_id, skills: List[str], experience_with_assets: dict, total_hours: float):
+    def __init__(self, worker_id, skills: List[str], experience_with_assets: dict, total_hours: float, experience=None):
         self.worker_id = worker_id
-        self.skills = skills
+        self.skills = [skill for skill in map(normalize_skill, skills) if skill]
+        self.skill_mask = SKILLS.mask(self.skills)
         self.experience_with_assets = experience_with_assets
+        self.experience = experience
         self.hours_allocated = {}
         self.total_hours = total_hours
         self.operations = [] 
@@ -46,12 +51,30 @@ class Worker:
     def has_skill(self, required_skills):
         """
         Verifica se o colaborador possui alguma das qualificações necessárias.
-        required_skills pode ser uma string ou uma lista de qualificações.
+        required_skills pode ser uma string, uma lista de qualificações ou uma máscara do registro SKILLS
+        (ex.: OperationTask.required_mask, o caminho rápido usado nos laços de alocação e fitness).
         """
-        if isinstance(required_skills, str):
-            return required_skills in self.skills
-        elif isinstance(required_skills, list):
-            return any(skill in self.skills for skill in required_skills)
+        if not isinstance(required_skills, int):
+            required_skills = SKILLS.mask(required_skills)
+        return SKILLS.has_any(self.skill_mask, required_skills)
+
+    def has_all_skills(self, required_skills):
+        """
+        Verifica se o colaborador possui todas as qualificações necessárias (mesmos formatos de has_skill).
+        """
+        if not isinstance(required_skills, int):
+            required_skills = SKILLS.mask(required_skills)
+        return SKILLS.has_all(self.skill_mask, required_skills)
+
+    def experience_score(self, asset, normalized=False):
+        """
+        Experiência no ativo: pontuação com decaimento por recência do `ExperienceIndex` ou, sem índice,
+        o número de execuções. Com `normalized=True`, a pontuação fica entre 0 e 1.
+        """
+        if self.experience is not None:
+            return self.experience.score(self.worker_id, asset, normalized)
+        count = self.experience_with_assets.get(asset, 0)
+        return min(count, 1) if normalized else count
 
     def allocate_hours(self, operation):
         """
@@ -65,4 +88,20 @@ class Worker:
             self.operations.append(operation)
         else:
             print (f"Colaborador {self.worker_id} não pode ser alocado para a operação {operation.operation_id} devido a sobreposição de horário {operation.due_date} {operation.start_hour}.")
-            #raise ValueError(f"Colaborador {self.worker_id} não pode ser alocado para a operação devido a sobreposição de horário.")
\ No newline at end of file
+            #raise ValueError(f"Colaborador {self.worker_id} não pode ser alocado para a operação devido a sobreposição de horário.")
+
+    def release_hours(self, operation, date=None):
+        """
+        Remove a operação do colaborador e devolve as horas alocadas na data da operação
+        (ou na data informada, quando a operação já foi movida para outro dia).
+        """
+        if operation in self.operations:
+            self.operations.remove(operation)
+            self.hours_allocated[date or operation.due_date] -= operation.effort
+
+    def forget_before(self, date):
+        """
+        Descarta operações e horas alocadas de datas anteriores a `date` (horizonte rolante).
+        """
+        self.operations = [operation for operation in self.operations if operation.due_date >= date]
+        self.hours_allocated = {day: hours for day, hours in self.hours_allocated.items() if day >= date}
@@ -0,0 +1,115 @@
+# worker_calendar.py
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class WorkerCalendar:
+    """
+    Agenda de horários livres de um colaborador ao longo de vários dias.
+
+    Os turnos semanais (já divididos pelo intervalo de almoço) são materializados sob demanda
+    para cada data. Os intervalos livres de um dia ficam em duas listas ordenadas (início e fim,
+    em minutos desde a meia-noite), de modo que a localização do intervalo que contém um horário
+    é feita por busca binária.
+
+    Attributes:
+        worker_id (str): ID do colaborador.
+        weekly_shifts (dict): Mapeia o dia da semana (1-segunda-feira ... 7-domingo) para a lista
+            de janelas de trabalho (inicio, fim) em minutos.
+        work_centers (set): Centros de trabalho aos quais o colaborador pertence.
+    """
+
+    def __init__(self, worker_id, weekly_shifts: Dict[int, List[Tuple[int, int]]], work_centers: Iterable[str] = ()):
+        self.worker_id = worker_id
+        self.weekly_shifts = weekly_shifts
+        self.work_centers = set(work_centers)
+        self._free: Dict[date, Tuple[List[int], List[int]]] = {}
+
+    def _day(self, day: date):
+        """
+        Retorna as listas (inícios, fins) de intervalos livres da data, criando-as a partir do turno semanal.
+        """
+        if day not in self._free:
+            windows = sorted(self.weekly_shifts.get(day.isoweekday(), []))
+            self._free[day] = ([start for start, _ in windows], [end for _, end in windows])
+        return self._free[day]
+
+    def free_intervals(self, day: date) -> List[Tuple[int, int]]:
+        """
+        Lista os intervalos livres (inicio, fim) do colaborador na data.
+        """
+        starts, ends = self._day(day)
+        return list(zip(starts, ends))
+
+    def free_minutes(self, day: date) -> int:
+        """
+        Soma dos minutos ainda livres na data.
+        """
+        starts, ends = self._day(day)
+        return sum(end - start for start, end in zip(starts, ends))
+
+    def is_free(self, day: date, start: int, effort: int) -> bool:
+        """
+        Verifica se o intervalo [start, start + effort) cabe inteiramente em um intervalo livre.
+        """
+        starts, ends = self._day(day)
+        index = bisect_right(starts, start) - 1
+        return index >= 0 and start + effort <= ends[index]
+
+    def earliest_slot(self, day: date, release: int, effort: int) -> Optional[int]:
+        """
+        Retorna o primeiro horário >= release em que a operação cabe sem interrupção, ou None.
+        """
+        starts, ends = self._day(day)
+        index = max(bisect_right(starts, release) - 1, 0)
+        for i in range(index, len(starts)):
+            start = max(starts[i], release)
+            if start + effort <= ends[i]:
+                return start
+        return None
+
+    def reserve(self, day: date, start: int, effort: int):
+        """
+        Reserva o intervalo [start, start + effort), dividindo o intervalo livre que o contém.
+        """
+        starts, ends = self._day(day)
+        index = bisect_right(starts, start) - 1
+        if index < 0 or start + effort > ends[index]:
+            raise ValueError(f"Colaborador {self.worker_id} não está livre em {day} a partir de {start} por {effort} minutos.")
+        free_start, free_end = starts[index], ends[index]
+        del starts[index], ends[index]
+        if start + effort < free_end:
+            starts.insert(index, start + effort)
+            ends.insert(index, free_end)
+        if free_start < start:
+            starts.insert(index, free_start)
+            ends.insert(index, start)
+
+    def rebuild_day(self, day: date, busy: Iterable[Tuple[int, int]]):
+        """
+        Recalcula os intervalos livres da data como o turno menos os intervalos ocupados `busy`
+        (reservas e ausências), que podem se sobrepor ou sair do turno.
+        """
+        starts, ends = [], []
+        busy = sorted(busy)
+        for window_start, window_end in sorted(self.weekly_shifts.get(day.isoweekday(), [])):
+            start = window_start
+            for busy_start, busy_end in busy:
+                if busy_end <= start or busy_start >= window_end:
+                    continue
+                if busy_start > start:
+                    starts.append(start)
+                    ends.append(busy_start)
+                start = max(start, busy_end)
+            if start < window_end:
+                starts.append(start)
+                ends.append(window_end)
+        self._free[day] = (starts, ends)
+
+    def forget_before(self, day: date):
+        """
+        Descarta as agendas de datas anteriores a `day`, que não recebem mais reservas.
+        """
+        for old_day in [d for d in self._free if d < day]:
+            del self._free[old_day]
@@ -0,0 +1,163 @@
+import argparse
+import glob
+import itertools
+import json
+import os
+import platform
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from anomaly_detection.inference import DEFAULT_ALERT_COOLDOWN, DEFAULT_MODEL_PATH, DEFAULT_THRESHOLDS, handle_detections, render
+from anomaly_detection.utils.alerts import AlertDispatcher, ConsoleAlert
+from anomaly_detection.utils.profiling import STAGES, StageTimer, peak_rss_mb, rss_mb
+from anomaly_detection.utils.runtimes import RUNTIMES, load_model
+
+DEFAULT_IMAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def make_video(image_paths, path, frames: int = 90, fps: int = 30, size=(1280, 720)):
+    """Synthetic video from the test images: each shown for a stretch of frames, panning slowly."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    images = [cv2.resize(cv2.imread(image_path), size) for image_path in image_paths]
+    for i in range(frames):
+        writer.write(np.roll(images[i * len(images) // frames], 8 * i, axis=1))
+    writer.release()
+
+
+def image_frames(image_paths, repeats, timer: StageTimer):
+    for _ in range(repeats):
+        for image_path in image_paths:
+            with timer.measure("decode"):
+                image = cv2.imread(image_path)
+            yield image
+
+
+def video_frames(video_path, timer: StageTimer):
+    capture = cv2.VideoCapture(video_path)
+    try:
+        while True:
+            with timer.measure("decode"):
+                ret, image = capture.read()
+            if not ret:
+                timer.times["decode"].pop()
+                return
+            yield image
+    finally:
+        capture.release()
+
+
+def run_pipeline(frames, model, alert, timer: StageTimer, batch_size: int = 1, imgsz: int = 640,
+                 class_thresholds=DEFAULT_THRESHOLDS):
+    """The frame loop of inference.py, stage by stage: batched model call, alerts and rendering."""
+
+    def process(batch):
+        results = model(batch, imgsz=imgsz, verbose=False)
+        for result in results:
+            # Ultralytics reports per-image preprocess/inference/postprocess times for the batch
+            for stage in ("preprocess", "inference", "postprocess"):
+                timer.add(stage, result.speed[stage])
+            with timer.measure("alert"):
+                handle_detections(result, model, alert, class_thresholds)
+            with timer.measure("render"):
+                render(result)
+
+    timer.start()
+    batch = []
+    for image in frames:
+        batch.append(image)
+        if len(batch) >= batch_size:
+            process(batch)
+            batch = []
+    if batch:
+        process(batch)
+    timer.stop()
+
+
+def run_config(model_path, runtime, imgsz, batch_size, threads, image_paths, video_path, repeats, warmup):
+    """Runs one configuration over the images and the video; called in its own process so the
+    thread settings and the memory figures are those of this configuration alone."""
+    import torch
+
+    torch.set_num_threads(threads)
+    cv2.setNumThreads(threads)
+    model = load_model(model_path, runtime)
+    warmup_image = cv2.imread(image_paths[0])
+    for _ in range(warmup):
+        model([warmup_image] * batch_size, imgsz=imgsz, verbose=False)
+
+    results = []
+    with AlertDispatcher(ConsoleAlert(), cooldown=DEFAULT_ALERT_COOLDOWN) as alert:
+        for source, make_frames in (("images", lambda timer: image_frames(image_paths, repeats, timer)),
+                                    ("video", lambda timer: video_frames(video_path, timer))):
+            timer = StageTimer()
+            run_pipeline(make_frames(timer), model, alert, timer, batch_size=batch_size, imgsz=imgsz)
+            result = {"source": source, "runtime": runtime, "imgsz": imgsz, "batch_size": batch_size, "threads": threads}
+            result.update(timer.summary())
+            result["rss_mb"] = rss_mb()
+            result["peak_rss_mb"] = peak_rss_mb()
+            results.append(result)
+    return results
+
+
+def environment():
+    import torch
+    import ultralytics
+
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "torch": torch.__version__, "ultralytics": ultralytics.__version__, "opencv": cv2.__version__}
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmark the detection pipeline of inference.py stage by stage.")
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH, help="Path to the YOLO model (.pt).")
+    parser.add_argument("--runtime", default="pytorch", choices=RUNTIMES, help="Inference engine (default: pytorch).")
+    parser.add_argument("--images", default=DEFAULT_IMAGES,
+                        help=f"Directory of test images; a synthetic video is generated from them (default: {DEFAULT_IMAGES}).")
+    parser.add_argument("--imgsz", type=int, nargs="+", default=[640], help="Inference image sizes (default: 640).")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4], help="Batch sizes (default: 1 4).")
+    parser.add_argument("--threads", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="Torch/OpenCV thread counts (default: number of CPUs).")
+    parser.add_argument("--repeats", type=int, default=5, help="Passes over the test images (default: 5).")
+    parser.add_argument("--video-frames", type=int, default=90, help="Frames of the synthetic video (default: 90).")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed warm-up model calls (default: 2).")
+    parser.add_argument("--output", default=None, help="Save the results to this JSON file.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    image_paths = sorted(path for path in glob.glob(os.path.join(args.images, "*")) if path.lower().endswith(IMAGE_EXTENSIONS))
+    if not image_paths:
+        raise SystemExit(f"No images found in {args.images}")
+
+    results = []
+    print("source | imgsz | batch | threads | FPS | p50 ms | p95 ms | p99 ms | " +
+          " | ".join(f"{stage} ms" for stage in STAGES) + " | RSS MB")
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "synthetic.mp4")
+        make_video(image_paths, video_path, frames=args.video_frames)
+        for imgsz, batch_size, threads in itertools.product(args.imgsz, args.batch_sizes, args.threads):
+            # One process per configuration, to isolate thread settings and peak memory
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                config_results = pool.submit(run_config, args.model_path, args.runtime, imgsz, batch_size, threads,
+                                             image_paths, video_path, args.repeats, args.warmup).result()
+            for result in config_results:
+                latency, stages = result["latency"], result["stages"]
+                memory = f"{result['rss_mb']:.0f}" if result["rss_mb"] is not None else "-"
+                print(f"{result['source']} | {imgsz} | {batch_size} | {threads} | {result['fps']:.1f} | "
+                      f"{latency['p50_ms']:.1f} | {latency['p95_ms']:.1f} | {latency['p99_ms']:.1f} | " +
+                      " | ".join(f"{stages[stage]['mean_ms']:.1f}" if stage in stages else "-" for stage in STAGES) +
+                      f" | {memory}")
+            results.extend(config_results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"environment": environment(), "model": args.model_path, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
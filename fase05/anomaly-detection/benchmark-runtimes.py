@@ -0,0 +1,99 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import time
+
+import cv2
+import numpy as np
+
+from anomaly_detection.utils.runtimes import RUNTIMES, load_model, resolve_model_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_images(directory: str):
+    paths = sorted(path for path in glob.glob(os.path.join(directory, "*")) if path.lower().endswith(IMAGE_EXTENSIONS))
+    return [(path, cv2.imread(path)) for path in paths]
+
+
+def benchmark_runtime(model, images, imgsz: int = 640, repeats: int = 20, warmup: int = 3):
+    """Per-image latency of `model` over `images` (ms) and the detections it finds on each image."""
+    for _ in range(warmup):
+        model(images[0][1], imgsz=imgsz, verbose=False)
+    latencies, detections = [], {}
+    for _ in range(repeats):
+        for path, image in images:
+            started = time.perf_counter()
+            result = model(image, imgsz=imgsz, verbose=False)[0]
+            latencies.append((time.perf_counter() - started) * 1000)
+            detections[os.path.basename(path)] = [
+                (result.names[int(cls)], round(float(conf), 3)) for cls, conf in zip(result.boxes.cls, result.boxes.conf)]
+    latencies = np.array(latencies)
+    return {
+        "latency_mean_ms": float(latencies.mean()),
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p95_ms": float(np.percentile(latencies, 95)),
+        "fps": float(1000 / latencies.mean()),
+        "detections": detections,
+    }
+
+
+def evaluate_runtime(model, dataset_yaml: str, imgsz: int = 640):
+    """mAP of `model` on the validation split of `dataset_yaml`."""
+    metrics = model.val(data=dataset_yaml, imgsz=imgsz, batch=1, plots=False, verbose=False)
+    return {"map50": float(metrics.box.map50), "map50_95": float(metrics.box.map)}
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Compare inference runtimes (PyTorch, ONNX, OpenVINO) of a model.")
+    parser.add_argument("model_path", help="Path to the .pt weights; the exports are looked up next to it.")
+    parser.add_argument("--runtimes", nargs="+", choices=RUNTIMES, default=RUNTIMES,
+                        help="Runtimes to compare (default: all; runtimes not exported are skipped).")
+    parser.add_argument("--images", default=DEFAULT_IMAGES,
+                        help=f"Directory of images used to measure latency (default: {DEFAULT_IMAGES}).")
+    parser.add_argument("--data", default=None,
+                        help="Dataset YAML: also compute mAP on its validation split (the bundled images have no labels).")
+    parser.add_argument("--imgsz", type=int, default=640, help="Inference image size (default: 640).")
+    parser.add_argument("--repeats", type=int, default=20, help="Passes over the images (default: 20).")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed warm-up runs (default: 3).")
+    parser.add_argument("--output", default=None, help="Also save the results to this JSON file.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    images = load_images(args.images)
+    if not images:
+        raise SystemExit(f"No images found in {args.images}")
+
+    results = {}
+    for runtime in args.runtimes:
+        try:
+            model = load_model(args.model_path, runtime)
+        except FileNotFoundError as e:
+            logger.warning(str(e))
+            continue
+        result = {"model": resolve_model_path(args.model_path, runtime)}
+        result.update(benchmark_runtime(model, images, imgsz=args.imgsz, repeats=args.repeats, warmup=args.warmup))
+        if args.data:
+            result.update(evaluate_runtime(model, args.data, imgsz=args.imgsz))
+        results[runtime] = result
+
+    print(f"{'runtime':<15}{'mean ms':>10}{'p95 ms':>10}{'FPS':>8}{'mAP50':>8}{'mAP50-95':>10}")
+    for runtime, result in results.items():
+        print(f"{runtime:<15}{result['latency_mean_ms']:>10.1f}{result['latency_p95_ms']:>10.1f}{result['fps']:>8.1f}"
+              f"{result.get('map50', float('nan')):>8.3f}{result.get('map50_95', float('nan')):>10.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"images": len(images), "imgsz": args.imgsz, "runtimes": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    main()
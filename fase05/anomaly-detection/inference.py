@@ -1,89 +1,375 @@
 import logging
 import sys
 import os
+import time
 import cv2
-from ultralytics import YOLO
 import json
 import argparse
-from anomaly_detection.utils.alerts import Alert, ConsoleAlert, EmailAlert
+import contextlib
+from anomaly_detection.utils.alerts import Alert, AlertDispatcher, ConsoleAlert, EmailAlert
+from anomaly_detection.utils.video import FrameReader, FrameWriter, format_timestamp, iter_batches
+from anomaly_detection.utils.gating import DEFAULT_MAX_INTERVAL, FrameGate
+from anomaly_detection.utils.streams import StreamScheduler, StreamStats, is_stream_url
+from anomaly_detection.utils.images import Manifest, expand_images, is_image_batch, prefetch_images
+from anomaly_detection.utils.logs import configure_logging
+from anomaly_detection.utils.regions import DEFAULT_TILE_OVERLAP, RegionDetector, load_rois, roi_for
+from anomaly_detection.utils.runtimes import RUNTIMES, load_model
+from anomaly_detection.utils.sink import DetectionSink
+from anomaly_detection.utils.incidents import (DEFAULT_MAX_GAP, DEFAULT_MIN_FRAMES, Detection,
+                                               IncidentTracker)
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(filename="logs.log", level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # Default values
 DEFAULT_MODEL_PATH = "/home/river/workspace/experiment/fiap/FIAP-POS-TECH/fase05/datasets/runs/detect/train/weights/best.pt"
 DEFAULT_THRESHOLDS = {"knife": 0.55, "scissors": 0.55}
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_MAX_LATENCY = 0.05  # seconds
+DEFAULT_ALERT_COOLDOWN = 10.0  # seconds
 
-def process_frame(frame, model, alert_handler: Alert, class_thresholds, timestamp: str = ""):
-    results = model(frame)
-    boxes = results[0].boxes
-
-    for box in boxes:
+def extract_detections(result, model, class_thresholds):
+    """Returns the boxes of `result` above their class threshold as `Detection`s."""
+    detections = []
+    for box in result.boxes:
         cls = int(box.cls[0])
         label = model.names[cls]
         conf = float(box.conf[0])
         threshold = class_thresholds.get(label, 0.6)
 
         if conf > threshold:
-            message = f"Detectado: {label} com confiança {conf:.2f}"
-            if timestamp:
-                message += f" em {timestamp}"
-            logger.debug(message)
-            alert_handler.send_alert(message)
-
-    img_bgr = cv2.cvtColor(results[0].plot(), cv2.COLOR_RGB2BGR)
-    return img_bgr
-
-def process_video(video_path: str, model, alert_handler: Alert, class_thresholds):
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        logger.error(f"Erro ao abrir vídeo: {video_path}")
-        return
+            detections.append(Detection(label, conf, tuple(float(value) for value in box.xyxy[0])))
+    return detections
 
-    cv2.namedWindow("Detecção", cv2.WINDOW_NORMAL)
+def handle_detections(result, model, alert_handler: Alert, class_thresholds, timestamp: str = "", source=None):
+    """
+    Alerts on each detection of `result`. The alert cooldown is per label, and per label and
+    `source` when one is given, so that a camera does not silence the same label on the others.
+    """
+    key = (lambda label: label) if source is None else (lambda label: (source, label))
+    for detection in extract_detections(result, model, class_thresholds):
+        message = f"Detectado: {detection.label} com confiança {detection.confidence:.2f}"
+        if timestamp:
+            message += f" em {timestamp}"
+        logger.debug(message)
+        alert_handler.send_alert(message, key=key(detection.label))
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
+def render(result, image=None):
+    """Draws `result` (on `image`, when given, to carry detections over to a skipped frame)."""
+    if result is None:
+        return cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(result.plot() if image is None else result.plot(img=image.copy()), cv2.COLOR_RGB2BGR)
 
-        current_time_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
-        current_time_sec = current_time_ms / 1000
-        timestamp = f"{int(current_time_sec // 3600):02}:{int((current_time_sec % 3600) // 60):02}:{int(current_time_sec % 60):02}"
+def process_frame(frame, model, alert_handler: Alert, class_thresholds, timestamp: str = "", draw: bool = True):
+    """Detects and alerts on one frame; returns the annotated frame, or None with `draw=False`."""
+    results = model(frame)
+    handle_detections(results[0], model, alert_handler, class_thresholds, timestamp)
+    return render(results[0]) if draw else None
 
-        processed_frame = process_frame(frame, model, alert_handler, class_thresholds, timestamp)
-        cv2.imshow("Detecção", processed_frame)
+def detect_batch(frames, model, alert_handler: Alert, class_thresholds, timestamps, regions=None, sources=None):
+    """
+    Runs a single model call over a list of frames, raises the alerts and returns the results in
+    order. With `alert_handler=None` no per-box alert is raised (an `IncidentTracker` does it).
+    `regions`, the region of interest of each frame, is passed on to a `RegionDetector` model;
+    `sources`, the stream of each frame, keeps the alert cooldown apart per stream.
+    """
+    results = model(list(frames)) if regions is None else model(list(frames), regions=regions)
+    if alert_handler is not None:
+        for result, timestamp, source in zip(results, timestamps, sources or [None] * len(results)):
+            handle_detections(result, model, alert_handler, class_thresholds, timestamp, source)
+    return results
+
+def process_batch(frames, model, alert_handler: Alert, class_thresholds, timestamps):
+    """Like `detect_batch`, but returns the annotated frames."""
+    return [render(result) for result in detect_batch(frames, model, alert_handler, class_thresholds, timestamps)]
 
-        if cv2.waitKey(1) & 0xFF == ord("q"):
-            break
+def process_video(video_path: str, model, alert_handler: Alert, class_thresholds, batch_size: int = 1,
+                  max_latency: float = DEFAULT_MAX_LATENCY, gate: FrameGate = None, tracker: IncidentTracker = None,
+                  display: bool = True, output_path: str = None, sink: DetectionSink = None):
+    """
+    Decodes the video in a background thread and runs inference on batches of up to `batch_size`
+    frames (a partial batch is flushed after `max_latency` seconds). Frames rejected by `gate`
+    (stride or no motion) skip the detector and show the last detections. With `tracker`, the
+    detections of every inferred frame go to the tracker, which alerts when each incident opens
+    and closes, instead of raising one alert per box. With `display=False` no window is opened, and
+    frames are only annotated if `output_path` is given, in which case they are drawn and encoded
+    to that video by a `FrameWriter` thread. `sink`, if given, records the detections of every inferred frame.
+    """
+    gate = gate or FrameGate()
+    reader = FrameReader(video_path, max_queue=max(2 * batch_size, 8), drop_when_full=is_stream_url(video_path))
+    if not reader.is_opened():
+        logger.error(f"Erro ao abrir vídeo: {video_path}")
+        return
+
+    writer = None
+    if output_path:
+        # Without a window, the annotations are drawn by the writer thread as well
+        writer = FrameWriter(output_path, fps=reader.fps, transform=None if display else (lambda item: render(*item)))
+        writer.start()
+    if display:
+        cv2.namedWindow("Detecção", cv2.WINDOW_NORMAL)
+    reader.start()
+    last_result = None
+    try:
+        for batch in iter_batches(reader.frames, batch_size, max_latency):
+            selected = [frame for frame in batch if gate.should_infer(frame)]
+            results = detect_batch([frame.image for frame in selected], model, None if tracker else alert_handler,
+                                   class_thresholds, [format_timestamp(frame.timestamp) for frame in selected]) if selected else []
+            results = dict(zip((frame.index for frame in selected), results))
+            quit_requested = False
+            for frame in batch:
+                if frame.index in results:
+                    last_result = results[frame.index]
+                    item = (last_result, None)
+                    if tracker is not None or sink is not None:
+                        detections = extract_detections(last_result, model, class_thresholds)
+                    if sink is not None:
+                        sink.add(detections, frame.index, frame.timestamp)
+                    if tracker is not None:
+                        # Only inferred frames are observations: a skipped frame must not confirm an incident
+                        tracker.update(detections, frame.timestamp)
+                else:
+                    item = (last_result, frame.image)
+                processed_frame = render(*item) if display else None
+                if writer is not None:
+                    writer.write(processed_frame if display else item)
+                if display:
+                    cv2.imshow("Detecção", processed_frame)
+                    if cv2.waitKey(1) & 0xFF == ord("q"):
+                        quit_requested = True
+                        break
+            if quit_requested:
+                break
+    finally:
+        reader.stop()
+        reader.join()
+        if writer is not None:
+            writer.close()
+            logger.info(f"{writer.written} quadros gravados em {output_path}")
+        if display:
+            cv2.destroyAllWindows()
+        logger.info(f"Inferência em {gate.inferred} de {gate.seen} quadros")
+        if tracker is not None:
+            tracker.flush()
+            logger.info(f"{tracker.detections} detecções agrupadas em {tracker.incidents} incidentes")
+
+def process_streams(sources, model, alert_handler: Alert, class_thresholds, batch_size: int = 8,
+                    max_latency: float = DEFAULT_MAX_LATENCY, max_queue: int = 8, gate_factory=FrameGate,
+                    tracker_factory=None, sink: DetectionSink = None, rois=None):
+    """
+    Runs one shared model over several videos or camera URLs, without display. Frames are batched
+    round-robin across the streams by `StreamScheduler`; `gate_factory` builds each stream's
+    `FrameGate` and `tracker_factory(source)`, if given, each stream's `IncidentTracker`.
+    `sink`, if given, records the detections tagged with their source. `rois`, one region of
+    interest (or None) per source, requires `model` to be a `RegionDetector`. Returns a report
+    with the aggregate throughput and per-stream latency.
+    """
+    scheduler = StreamScheduler(sources, batch_size=batch_size, max_latency=max_latency, max_queue=max_queue)
+    gates = [gate_factory() for _ in scheduler.sources]
+    trackers = [tracker_factory(source) for source in scheduler.sources] if tracker_factory else None
+    stats = [StreamStats(source) for source in scheduler.sources]
+    started = time.monotonic()
+    scheduler.start()
+    try:
+        for batch in scheduler.batches():
+            selected = [(stream, frame) for stream, frame in batch if gates[stream].should_infer(frame)]
+            results = detect_batch([frame.image for _, frame in selected], model, None if trackers else alert_handler,
+                                   class_thresholds,
+                                   [f"{format_timestamp(frame.timestamp)} [{scheduler.sources[stream]}]" for stream, frame in selected],
+                                   regions=[rois[stream] for stream, _ in selected] if rois else None,
+                                   sources=[scheduler.sources[stream] for stream, _ in selected]) if selected else []
+            results = {(stream, frame.index): result for (stream, frame), result in zip(selected, results)}
+            now = time.monotonic()
+            for stream, frame in batch:
+                result = results.get((stream, frame.index))
+                stats[stream].record(now - frame.decoded, result is not None)
+                if result is not None and (trackers or sink is not None):
+                    detections = extract_detections(result, model, class_thresholds)
+                    if sink is not None:
+                        sink.add(detections, frame.index, frame.timestamp, source=scheduler.sources[stream])
+                    if trackers:
+                        # As in `process_video`, skipped frames are not fed to the tracker
+                        trackers[stream].update(detections, frame.timestamp)
+    except KeyboardInterrupt:
+        logger.info("Processamento interrompido pelo usuário")
+    finally:
+        scheduler.stop()
+        for tracker in trackers or []:
+            tracker.flush()
 
-    cap.release()
-    cv2.destroyAllWindows()
+    elapsed = time.monotonic() - started
+    frames = sum(stream_stats.frames for stream_stats in stats)
+    report = {
+        "elapsed": elapsed,
+        "frames": frames,
+        "inferred": sum(stream_stats.inferred for stream_stats in stats),
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "streams": [stream_stats.summary(reader.dropped) for stream_stats, reader in zip(stats, scheduler.readers)],
+    }
+    logger.info(f"Multi-stream: {report['frames']} quadros em {elapsed:.1f}s ({report['fps']:.1f} FPS)")
+    return report
 
-def process_image(image_path: str, model, alert_handler: Alert, class_thresholds):
+def print_stream_report(report):
+    print(f"{len(report['streams'])} streams | {report['frames']} frames ({report['inferred']} inferred) | "
+          f"{report['elapsed']:.1f}s | {report['fps']:.1f} FPS")
+    for stream in report["streams"]:
+        print(f"  {stream['source']}: {stream['frames']} frames, {stream['inferred']} inferred, {stream['dropped']} dropped | "
+              f"latency mean {stream['latency_mean_ms']:.0f} ms, p95 {stream['latency_p95_ms']:.0f} ms, max {stream['latency_max_ms']:.0f} ms")
+
+def process_image(image_path: str, model, alert_handler: Alert, class_thresholds, display: bool = True,
+                  output_path: str = None, sink: DetectionSink = None):
     frame = cv2.imread(image_path)
     if frame is None:
         logger.error(f"Erro ao carregar imagem: {image_path}")
         return
-    processed_frame = process_frame(frame, model, alert_handler, class_thresholds)
-    cv2.namedWindow("Detecção", cv2.WINDOW_NORMAL)
-    cv2.imshow("Detecção", processed_frame)
-    cv2.waitKey(0)
-    cv2.destroyAllWindows()
+    if sink is not None:
+        result = detect_batch([frame], model, alert_handler, class_thresholds, [""])[0]
+        sink.add(extract_detections(result, model, class_thresholds), 0, 0.0, source=image_path)
+        processed_frame = render(result) if display or output_path else None
+    else:
+        processed_frame = process_frame(frame, model, alert_handler, class_thresholds, draw=display or bool(output_path))
+    if output_path:
+        cv2.imwrite(output_path, processed_frame)
+    if display:
+        cv2.namedWindow("Detecção", cv2.WINDOW_NORMAL)
+        cv2.imshow("Detecção", processed_frame)
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
+
+def process_images(paths, model, alert_handler: Alert, class_thresholds, batch_size: int = 8, workers: int = 4,
+                   sink: DetectionSink = None, manifest: Manifest = None):
+    """
+    Runs the model once over many images, without display: images are decoded ahead by a pool of
+    `workers` threads and inferred `batch_size` at a time. Detections go to the alerts and to
+    `sink` (tagged with the image path); images already in `manifest` are skipped and the
+    processed ones are added to it, only once the sink has written their detections, so that a
+    resumed run never skips an image whose detections were lost. Returns the numbers of images
+    processed, skipped and unreadable.
+    """
+    todo = [path for path in paths if manifest is None or not manifest.done(path)]
+    counts = {"processed": 0, "skipped": len(paths) - len(todo), "failed": 0}
+    if counts["skipped"]:
+        logger.info(f"{counts['skipped']} imagens já processadas (manifesto)")
+
+    def flush(batch):
+        results = detect_batch([image for _, image in batch], model, alert_handler, class_thresholds,
+                               [path for path, _ in batch])
+        if sink is not None:
+            for (path, _), result in zip(batch, results):
+                sink.add(extract_detections(result, model, class_thresholds), 0, 0.0, source=path)
+        if manifest is not None:
+            paths = [path for path, _ in batch]
+            if sink is not None:
+                sink.when_written(lambda: manifest.add(paths))
+            else:
+                manifest.add(paths)
+        counts["processed"] += len(batch)
+        if counts["processed"] // 1000 != (counts["processed"] - len(batch)) // 1000:
+            logger.info(f"{counts['processed']} de {len(todo)} imagens processadas")
+
+    batch = []
+    try:
+        for path, image in prefetch_images(todo, workers=workers, lookahead=max(2 * batch_size, 4 * workers)):
+            if image is None:
+                logger.error(f"Erro ao carregar imagem: {path}")
+                counts["failed"] += 1
+                continue
+            batch.append((path, image))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    except KeyboardInterrupt:
+        logger.info("Processamento interrompido pelo usuário")
+    finally:
+        if sink is not None and manifest is not None:
+            # The manifest is closed by the caller: record the last images before returning
+            sink.sync()
+    logger.info(f"Imagens: {counts['processed']} processadas, {counts['skipped']} puladas, {counts['failed']} com erro")
+    return counts
 
 def parse_arguments():
-    parser = argparse.ArgumentParser(description="Detect anomalies in images or videos.")
-    parser.add_argument("file_path", help="Path to the input video or image file.")
+    parser = argparse.ArgumentParser(description="Detect anomalies in images or videos.", fromfile_prefix_chars="@")
+    parser.add_argument("file_path", help="Path to the input video or image file, or a directory, glob pattern "
+                                          "(quoted, e.g. 'snapshots/**/*.jpg') or .txt list of images to process in batch.")
     parser.add_argument("--alert-type", default="console", choices=["console", "email"],
                         help="Type of alert to use (default: console).")
     parser.add_argument("--recipient-email", help="Recipient email address (required if alert_type is 'email').")
     parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH,
                         help=f"Path to the YOLO model file (default: {DEFAULT_MODEL_PATH}).")
+    parser.add_argument("--runtime", default="pytorch", choices=RUNTIMES,
+                        help="Inference engine: the .pt model itself, or its ONNX/OpenVINO export made by "
+                             "training-yolo.py --export next to it (default: pytorch).")
     parser.add_argument("--thresholds", default=json.dumps(DEFAULT_THRESHOLDS),
                         help=f"JSON string for class confidence thresholds (default: '{json.dumps(DEFAULT_THRESHOLDS)}').")
+    parser.add_argument("--alert-cooldown", type=float, default=DEFAULT_ALERT_COOLDOWN,
+                        help=f"Seconds during which repeated alerts for the same class are suppressed (default: {DEFAULT_ALERT_COOLDOWN:g}).")
+    parser.add_argument("--alert-digest", type=float, default=None,
+                        help="Collect alerts and send them as one digest every N seconds (default: send each alert).")
+    parser.add_argument("--headless", action="store_true",
+                        help="Do not open a window: detections and alerts only, no drawing unless --output is given.")
+    parser.add_argument("--output", default=None,
+                        help="Save the annotated video (or image) to this path; video is encoded by a separate thread.")
+    parser.add_argument("--detections", default=None,
+                        help="Save every detection (frame, timestamp, class, confidence, box) to a .jsonl or .parquet file.")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="Level of the messages written to logs.log (default: INFO; DEBUG logs every detection).")
+    parser.add_argument("--roi", default=None,
+                        help="JSON file mapping each camera (path, URL or file name; \"*\" for any) to polygons in "
+                             "normalized coordinates or a mask image; only those regions are analyzed.")
+    parser.add_argument("--tile-size", type=int, default=None,
+                        help="Slice frames larger than this into overlapping tiles inferred at full resolution "
+                             "(small objects in high-resolution cameras; default: disabled).")
+    parser.add_argument("--tile-overlap", type=float, default=DEFAULT_TILE_OVERLAP,
+                        help=f"Overlap between neighbouring tiles, as a fraction of the tile (default: {DEFAULT_TILE_OVERLAP:g}).")
+    parser.add_argument("--incidents", action="store_true",
+                        help="Track detections over video frames and alert when each incident opens and closes instead of once per box.")
+    parser.add_argument("--incident-min-frames", type=int, default=DEFAULT_MIN_FRAMES,
+                        help=f"Inferred frames an object must be seen in before it opens an incident (default: {DEFAULT_MIN_FRAMES}).")
+    parser.add_argument("--incident-max-gap", type=float, default=DEFAULT_MAX_GAP,
+                        help=f"Seconds without seeing an object before its incident is closed (default: {DEFAULT_MAX_GAP:g}).")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Number of video frames per model call (default: {DEFAULT_BATCH_SIZE}).")
+    parser.add_argument("--max-latency-ms", type=float, default=DEFAULT_MAX_LATENCY * 1000,
+                        help=f"Maximum time to wait for a video batch to fill, in milliseconds (default: {DEFAULT_MAX_LATENCY * 1000:g}).")
+    parser.add_argument("--streams", nargs="+", default=None,
+                        help="Additional videos or camera URLs processed together with file_path by one shared model, "
+                             "without display (a list can be read from a file with @sources.txt).")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Threads decoding images ahead in batch image mode (default: 4).")
+    parser.add_argument("--manifest", default=None,
+                        help="In batch image mode, record processed images in this file and skip them when resuming "
+                             "(--detections is then appended to, so use .jsonl).")
+    parser.add_argument("--stride", type=int, default=1,
+                        help="Run the detector on every N-th video frame only (default: 1).")
+    parser.add_argument("--motion-threshold", type=float, default=None,
+                        help="Run the detector only when this fraction of pixels changed, e.g. 0.01 (default: disabled).")
+    parser.add_argument("--max-interval", type=float, default=DEFAULT_MAX_INTERVAL,
+                        help=f"With --motion-threshold, maximum seconds between detector runs (default: {DEFAULT_MAX_INTERVAL:g}).")
     
     args = parser.parse_args()
 
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1.")
+    if args.max_latency_ms < 0:
+        parser.error("--max-latency-ms must not be negative.")
+    if args.stride < 1:
+        parser.error("--stride must be at least 1.")
+    if args.streams and args.output:
+        parser.error("--output is not supported with --streams.")
+    if args.output and is_image_batch(args.file_path):
+        parser.error("--output is not supported in batch image mode.")
+    if args.tile_size is not None and args.tile_size < 32:
+        parser.error("--tile-size must be at least 32.")
+    if not 0 <= args.tile_overlap < 1:
+        parser.error("--tile-overlap must be in [0, 1).")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+    if args.detections and os.path.splitext(args.detections)[1].lower() not in (".jsonl", ".parquet"):
+        parser.error("--detections must be a .jsonl or .parquet file.")
+    if args.incident_min_frames < 1:
+        parser.error("--incident-min-frames must be at least 1.")
+
     if args.alert_type == "email" and not args.recipient_email:
         parser.error("--recipient-email is required when --alert-type is 'email'")
 
@@ -96,25 +382,67 @@ def parse_arguments():
 
 def main():
     args = parse_arguments()
+    # Log records go through a queue to a listener thread, so logging never blocks the frame loop
+    configure_logging("logs.log", args.log_level)
 
     if args.alert_type == "email":
         alert_system = EmailAlert(args.recipient_email)
     else:
         alert_system = ConsoleAlert()
-    
-    model = YOLO(args.model_path)
+    # Alerts are filtered and sent by a background thread, so the frame loop never waits on SMTP
+    with AlertDispatcher(alert_system, cooldown=args.alert_cooldown, digest_interval=args.alert_digest) as alert_system, \
+            (DetectionSink(args.detections, append=bool(args.manifest)) if args.detections else contextlib.nullcontext()) as sink:
+        try:
+            model = load_model(args.model_path, args.runtime)
+        except FileNotFoundError as e:
+            logger.error(str(e))
+            sys.exit(1)
 
-    if not os.path.exists(args.file_path):
-        logger.error(f"Arquivo não encontrado: {args.file_path}")
-        sys.exit(1)
+        sources = [args.file_path] + (args.streams or [])
+        rois = load_rois(args.roi) if args.roi else None
+        if rois or args.tile_size:
+            model = RegionDetector(model, roi=roi_for(rois, args.file_path), tile_size=args.tile_size,
+                                   overlap=args.tile_overlap)
+        missing = [source for source in sources
+                   if not is_stream_url(source) and not os.path.exists(source) and not is_image_batch(source)]
+        if missing:
+            logger.error(f"Arquivo não encontrado: {', '.join(missing)}")
+            sys.exit(1)
 
-    ext = os.path.splitext(args.file_path)[1].lower()
-    if ext in [".mp4", ".avi", ".mov", ".mkv"]:
-        process_video(args.file_path, model, alert_system, args.thresholds)
-    elif ext in [".jpg", ".jpeg", ".png", ".bmp"]:
-        process_image(args.file_path, model, alert_system, args.thresholds)
-    else:
-        logger.error("Formato de arquivo não suportado.")
+        def gate_factory():
+            return FrameGate(stride=args.stride, motion_threshold=args.motion_threshold, max_interval=args.max_interval)
+
+        def tracker_factory(source=None):
+            return IncidentTracker(alert_system, source=source, min_frames=args.incident_min_frames,
+                                   max_gap=args.incident_max_gap)
+
+        ext = os.path.splitext(args.file_path)[1].lower()
+        if is_image_batch(args.file_path) and not args.streams:
+            paths = expand_images(args.file_path)
+            if not paths:
+                logger.error(f"Nenhuma imagem encontrada: {args.file_path}")
+                sys.exit(1)
+            with (Manifest(args.manifest) if args.manifest else contextlib.nullcontext()) as manifest:
+                counts = process_images(paths, model, alert_system, args.thresholds, batch_size=args.batch_size,
+                                        workers=args.workers, sink=sink, manifest=manifest)
+            print(f"{counts['processed']} images processed, {counts['skipped']} skipped, {counts['failed']} failed")
+        elif args.streams:
+            report = process_streams(sources, model, alert_system, args.thresholds, batch_size=args.batch_size,
+                                     max_latency=args.max_latency_ms / 1000, gate_factory=gate_factory,
+                                     tracker_factory=tracker_factory if args.incidents else None, sink=sink,
+                                     rois=[roi_for(rois, source) for source in sources] if rois else None)
+            print_stream_report(report)
+        elif ext in [".mp4", ".avi", ".mov", ".mkv"] or is_stream_url(args.file_path):
+            gate = gate_factory()
+            process_video(args.file_path, model, alert_system, args.thresholds, batch_size=args.batch_size,
+                          max_latency=args.max_latency_ms / 1000, gate=gate,
+                          tracker=tracker_factory() if args.incidents else None,
+                          display=not args.headless, output_path=args.output, sink=sink)
+        elif ext in [".jpg", ".jpeg", ".png", ".bmp"]:
+            process_image(args.file_path, model, alert_system, args.thresholds, display=not args.headless,
+                          output_path=args.output, sink=sink)
+        else:
+            logger.error("Formato de arquivo não suportado.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
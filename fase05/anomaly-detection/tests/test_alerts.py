@@ -3,6 +3,11 @@ import os
 import unittest
 from unittest.mock import patch, MagicMock
 import logging
+import smtplib
+import socket
+import time
+import email
+from email.header import decode_header, make_header
 
 # --- Start of sys.path modification ---
 # Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
@@ -13,12 +18,20 @@ if project_root not in sys.path:
 # --- End of sys.path modification ---
 
 # Now, attempt to import the modules
-from anomaly_detection.utils.alerts import ConsoleAlert, EmailAlert
+from anomaly_detection.utils.alerts import Alert, AlertDispatcher, ConsoleAlert, EmailAlert
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    Controller = None
 
 # Configure logging to avoid "No handler found" warnings during tests
 # and to capture debug messages from ConsoleAlert
 logging.basicConfig(level=logging.DEBUG)
 
+def decoded_subject(raw_message):
+    return str(make_header(decode_header(email.message_from_string(raw_message)["Subject"])))
+
 class TestConsoleAlert(unittest.TestCase):
 
     @patch('anomaly_detection.utils.alerts.logging.debug') # Path to logging in the alerts module
@@ -36,8 +49,7 @@ class TestEmailAlert(unittest.TestCase):
     })
     @patch('anomaly_detection.utils.alerts.smtplib.SMTP_SSL')
     def test_send_alert_email_success(self, mock_smtp_ssl_class):
-        mock_server = MagicMock()
-        mock_smtp_ssl_class.return_value.__enter__.return_value = mock_server
+        mock_server = mock_smtp_ssl_class.return_value
 
         recipient_email = "recipient@example.com"
         alert = EmailAlert(recipient_email)
@@ -53,7 +65,7 @@ class TestEmailAlert(unittest.TestCase):
         
         self.assertEqual(args[0], "sender@example.com")
         self.assertEqual(args[1], recipient_email)
-        self.assertIn("Subject: Alerta de Segurança", args[2])
+        self.assertEqual(decoded_subject(args[2]), "Alerta de Segurança")
         self.assertIn(f"Alerta: objeto perigoso detectado ({message})!", args[2])
 
     @patch.dict(os.environ, {
@@ -63,8 +75,7 @@ class TestEmailAlert(unittest.TestCase):
     @patch('anomaly_detection.utils.alerts.smtplib.SMTP_SSL')
     @patch('anomaly_detection.utils.alerts.logging.error')
     def test_send_alert_email_failure(self, mock_logging_error, mock_smtp_ssl_class):
-        mock_server = MagicMock()
-        mock_smtp_ssl_class.return_value.__enter__.return_value = mock_server
+        mock_server = mock_smtp_ssl_class.return_value
         mock_server.login.side_effect = Exception("SMTP login failed")
 
         recipient_email = "recipient@example.com"
@@ -75,6 +86,56 @@ class TestEmailAlert(unittest.TestCase):
 
         mock_logging_error.assert_called_with(f"Failed to send email alert to {recipient_email}: SMTP login failed")
 
+    @patch.dict(os.environ, {
+        "EMAIL_FROM": "sender@example.com",
+        "EMAIL_PASSWORD": "password"
+    })
+    @patch('anomaly_detection.utils.alerts.smtplib.SMTP_SSL')
+    def test_connection_is_reused(self, mock_smtp_ssl_class):
+        alert = EmailAlert("recipient@example.com")
+        alert.send_alert("first")
+        alert.send_alert("second")
+
+        mock_smtp_ssl_class.assert_called_once_with('smtp.gmail.com', 465)
+        self.assertEqual(mock_smtp_ssl_class.return_value.login.call_count, 1)
+        self.assertEqual(mock_smtp_ssl_class.return_value.sendmail.call_count, 2)
+
+        alert.close()
+        mock_smtp_ssl_class.return_value.quit.assert_called_once()
+
+    @patch.dict(os.environ, {
+        "EMAIL_FROM": "sender@example.com",
+        "EMAIL_PASSWORD": "password"
+    })
+    @patch('anomaly_detection.utils.alerts.smtplib.SMTP_SSL')
+    def test_reconnects_after_disconnect(self, mock_smtp_ssl_class):
+        stale, fresh = MagicMock(), MagicMock()
+        stale.sendmail.side_effect = smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        mock_smtp_ssl_class.side_effect = [stale, fresh]
+
+        alert = EmailAlert("recipient@example.com")
+        alert.send_alert("after idle timeout")
+
+        self.assertEqual(mock_smtp_ssl_class.call_count, 2)
+        fresh.sendmail.assert_called_once()
+
+    @patch.dict(os.environ, {
+        "EMAIL_FROM": "sender@example.com",
+        "EMAIL_PASSWORD": "password"
+    })
+    @patch('anomaly_detection.utils.alerts.smtplib.SMTP_SSL')
+    def test_send_digest(self, mock_smtp_ssl_class):
+        alert = EmailAlert("recipient@example.com")
+        alert.send_digest(["knife at 00:00:01", "scissors at 00:00:02"])
+
+        mock_server = mock_smtp_ssl_class.return_value
+        mock_server.sendmail.assert_called_once()
+        raw_message = mock_server.sendmail.call_args[0][2]
+        self.assertEqual(decoded_subject(raw_message), "Alerta de Segurança (2 detecções)")
+        body = email.message_from_string(raw_message).get_payload(decode=True).decode()
+        self.assertIn("- knife at 00:00:01", body)
+        self.assertIn("- scissors at 00:00:02", body)
+
     @patch.dict(os.environ, {}, clear=True) 
     def test_email_alert_init_missing_email_from(self):
         with self.assertRaises(ValueError) as context:
@@ -97,5 +158,101 @@ class TestEmailAlert(unittest.TestCase):
         except ValueError:
             self.fail("EmailAlert initialization failed unexpectedly with valid environment variables.")
 
+class RecordingAlert(Alert):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.alerts = []
+        self.digests = []
+        self.closed = False
+
+    def send_alert(self, message, key=None):
+        time.sleep(self.delay)
+        self.alerts.append(message)
+
+    def send_digest(self, messages):
+        self.digests.append(list(messages))
+
+    def close(self):
+        self.closed = True
+
+class TestAlertDispatcher(unittest.TestCase):
+
+    def test_send_does_not_block(self):
+        target = RecordingAlert(delay=0.2)
+        with AlertDispatcher(target) as dispatcher:
+            started = time.monotonic()
+            for i in range(5):
+                dispatcher.send_alert(f"alert {i}", key=i)
+            self.assertLess(time.monotonic() - started, 0.1)
+        self.assertEqual(target.alerts, [f"alert {i}" for i in range(5)])
+        self.assertTrue(target.closed)
+
+    def test_cooldown_per_key(self):
+        target = RecordingAlert()
+        with AlertDispatcher(target, cooldown=60) as dispatcher:
+            for _ in range(300):
+                dispatcher.send_alert("knife", key="knife")
+            dispatcher.send_alert("scissors", key="scissors")
+        self.assertEqual(target.alerts, ["knife", "scissors"])
+        self.assertEqual(dispatcher.suppressed, 299)
+
+    def test_digest(self):
+        target = RecordingAlert()
+        with AlertDispatcher(target, digest_interval=0.2) as dispatcher:
+            for i in range(3):
+                dispatcher.send_alert(f"alert {i}", key=i)
+            time.sleep(0.4)
+            dispatcher.send_alert("late", key="late")
+        self.assertEqual(target.digests, [["alert 0", "alert 1", "alert 2"], ["late"]])
+        self.assertEqual(target.alerts, [])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        target = RecordingAlert(delay=0.2)
+        dispatcher = AlertDispatcher(target, max_queue=1)
+        for i in range(5):
+            dispatcher.send_alert(f"alert {i}", key=i)
+        self.assertGreaterEqual(dispatcher.dropped, 3)
+        dispatcher.close()
+
+@unittest.skipIf(Controller is None, "aiosmtpd is not installed")
+class TestEmailAlertLocalSMTP(unittest.TestCase):
+
+    class Handler:
+        def __init__(self):
+            self.messages = []
+            self.connections = set()
+
+        async def handle_DATA(self, server, session, envelope):
+            self.connections.add(id(session))
+            self.messages.append(envelope)
+            return "250 OK"
+
+    def setUp(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.handler = self.Handler()
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=self.port)
+        self.controller.start()
+
+    def tearDown(self):
+        self.controller.stop()
+
+    @patch.dict(os.environ, {
+        "EMAIL_FROM": "sender@example.com",
+        "EMAIL_PASSWORD": "password"
+    })
+    def test_dispatcher_over_one_connection(self):
+        alert = EmailAlert("recipient@example.com", host="127.0.0.1", port=self.port, use_ssl=False, login=False)
+        with AlertDispatcher(alert, cooldown=60) as dispatcher:
+            for i in range(50):
+                dispatcher.send_alert(f"knife {i}", key="knife")
+                dispatcher.send_alert(f"scissors {i}", key="scissors")
+            dispatcher.send_alert("person", key="person")
+
+        self.assertEqual(len(self.handler.messages), 3)
+        self.assertEqual(len(self.handler.connections), 1)
+        self.assertEqual(self.handler.messages[0].rcpt_tos, ["recipient@example.com"])
+
 if __name__ == "__main__":
     unittest.main()
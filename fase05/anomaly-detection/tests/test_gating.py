@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.utils.gating import FrameGate
+from anomaly_detection.utils.video import Frame
+
+
+def static_frames(count, fps=10):
+    image = np.full((240, 320, 3), 100, np.uint8)
+    return [Frame(i, i / fps, image) for i in range(count)]
+
+
+def moving_frames(count, fps=10):
+    frames = []
+    for i in range(count):
+        image = np.zeros((240, 320, 3), np.uint8)
+        image[:, (i * 40) % 320:(i * 40) % 320 + 60] = 255
+        frames.append(Frame(i, i / fps, image))
+    return frames
+
+
+class TestFrameGate(unittest.TestCase):
+
+    def decisions(self, gate, frames):
+        return [gate.should_infer(frame) for frame in frames]
+
+    def test_default_infers_every_frame(self):
+        gate = FrameGate()
+        self.assertTrue(all(self.decisions(gate, static_frames(5))))
+
+    def test_stride(self):
+        gate = FrameGate(stride=3)
+        self.assertEqual(self.decisions(gate, static_frames(7)), [True, False, False, True, False, False, True])
+        self.assertEqual((gate.inferred, gate.seen), (3, 7))
+
+    def test_static_scene_only_infers_first_frame_and_max_interval(self):
+        gate = FrameGate(motion_threshold=0.01, max_interval=1.0)
+        decisions = self.decisions(gate, static_frames(25))
+        self.assertEqual([i for i, infer in enumerate(decisions) if infer], [0, 10, 20])
+
+    def test_motion_triggers_inference(self):
+        gate = FrameGate(motion_threshold=0.01, max_interval=None)
+        decisions = self.decisions(gate, moving_frames(6))
+        self.assertTrue(all(decisions))
+
+    def test_static_scene_without_max_interval(self):
+        gate = FrameGate(motion_threshold=0.01, max_interval=None)
+        self.assertEqual(sum(self.decisions(gate, static_frames(30))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.inference import process_images
+from anomaly_detection.utils.images import Manifest, expand_images, is_image_batch, prefetch_images
+from anomaly_detection.utils.sink import DetectionSink
+
+
+def fake_model():
+    box = MagicMock(cls=[0], conf=[0.9], xyxy=[[1.0, 2.0, 3.0, 4.0]])
+    model = MagicMock()
+    model.names = {0: 'knife'}
+    model.side_effect = lambda images: [MagicMock(boxes=[box]) for _ in images]
+    return model
+
+
+class ImageTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, 'cam1'))
+        self.paths = []
+        for i, name in enumerate(['a.jpg', 'b.png', os.path.join('cam1', 'c.jpg'), os.path.join('cam1', 'd.jpeg')]):
+            path = os.path.join(self.root, name)
+            cv2.imwrite(path, np.full((16, 16, 3), i * 50, np.uint8))
+            self.paths.append(path)
+        with open(os.path.join(self.root, 'notes.md'), 'w') as file:
+            file.write('not an image')
+        self.paths.sort()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class TestExpandImages(ImageTree):
+
+    def test_directory_is_searched_recursively(self):
+        self.assertEqual(expand_images(self.root), self.paths)
+
+    def test_glob(self):
+        self.assertEqual(expand_images(os.path.join(self.root, '**', '*.jpg')),
+                         sorted(path for path in self.paths if path.endswith('.jpg')))
+        self.assertEqual(expand_images(os.path.join(self.root, 'cam1', '*')), self.paths[-2:])
+
+    def test_list_file(self):
+        listing = os.path.join(self.root, 'list.txt')
+        with open(listing, 'w') as file:
+            file.write(f"# snapshots\n{self.paths[1]}\n\n{self.paths[0]}\n{self.paths[0]}\n")
+        self.assertEqual(expand_images(listing), sorted(self.paths[:2]))
+
+    def test_is_image_batch(self):
+        self.assertTrue(is_image_batch(self.root))
+        self.assertTrue(is_image_batch('snapshots/*.jpg'))
+        self.assertTrue(is_image_batch('list.txt'))
+        self.assertFalse(is_image_batch(self.paths[0]))
+        self.assertFalse(is_image_batch('video.mp4'))
+
+
+class TestPrefetchImages(ImageTree):
+
+    def test_order_and_unreadable_images(self):
+        paths = self.paths + [os.path.join(self.root, 'missing.jpg')]
+        loaded = list(prefetch_images(paths, workers=3, lookahead=2))
+        self.assertEqual([path for path, _ in loaded], paths)
+        for path, image in loaded[:-1]:
+            np.testing.assert_array_equal(image, cv2.imread(path))
+        self.assertIsNone(loaded[-1][1])
+
+
+class TestManifest(ImageTree):
+
+    def test_resume_and_changed_files(self):
+        manifest_path = os.path.join(self.root, 'manifest.jsonl')
+        with Manifest(manifest_path) as manifest:
+            manifest.add(self.paths[:2])
+        with open(manifest_path, 'a') as file:
+            file.write('{"path": "cut sh')  # interrupted while writing
+
+        with Manifest(manifest_path) as manifest:
+            self.assertEqual([manifest.done(path) for path in self.paths], [True, True, False, False])
+            # A modified image is processed again
+            stat = os.stat(self.paths[0])
+            os.utime(self.paths[0], (stat.st_atime, stat.st_mtime + 10))
+            self.assertFalse(manifest.done(self.paths[0]))
+
+
+class TestProcessImages(ImageTree):
+
+    def test_batches_sink_and_resume(self):
+        sink_path = os.path.join(self.root, 'detections.jsonl')
+        manifest_path = os.path.join(self.root, 'manifest.jsonl')
+        model, alert = fake_model(), MagicMock()
+        paths = self.paths + [os.path.join(self.root, 'missing.jpg')]
+        with DetectionSink(sink_path) as sink, Manifest(manifest_path) as manifest:
+            counts = process_images(paths[:3], model, alert, {'knife': 0.5}, batch_size=2, sink=sink, manifest=manifest)
+        self.assertEqual(counts, {'processed': 3, 'skipped': 0, 'failed': 0})
+        self.assertEqual([len(call.args[0]) for call in model.call_args_list], [2, 1])
+        self.assertIn(paths[0], alert.send_alert.call_args_list[0].args[0])
+
+        model = fake_model()
+        with DetectionSink(sink_path.replace('.jsonl', '2.jsonl')) as sink, Manifest(manifest_path) as manifest:
+            counts = process_images(paths, model, alert, {'knife': 0.5}, batch_size=2, sink=sink, manifest=manifest)
+        self.assertEqual(counts, {'processed': 1, 'skipped': 3, 'failed': 1})
+        self.assertEqual([len(call.args[0]) for call in model.call_args_list], [1])
+
+        with open(sink_path) as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual([row['source'] for row in rows], paths[:3])
+        self.assertEqual(rows[0]['x2'], 3.0)
+
+    def test_manifest_waits_for_the_sink(self):
+        manifest_path = os.path.join(self.root, 'manifest.jsonl')
+        # The detections cannot be written: no image may be recorded as done
+        with DetectionSink(os.path.join(self.root, 'missing', 'detections.jsonl')) as sink, \
+                Manifest(manifest_path) as manifest:
+            counts = process_images(self.paths, fake_model(), MagicMock(), {'knife': 0.5}, batch_size=2,
+                                    sink=sink, manifest=manifest)
+        self.assertEqual(counts['processed'], len(self.paths))
+        with Manifest(manifest_path) as manifest:
+            self.assertFalse(any(manifest.done(path) for path in self.paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.utils.alerts import AlertDispatcher
+from anomaly_detection.utils.incidents import Detection, IncidentTracker, format_incident, iou
+
+
+def knife(x, conf=0.8):
+    return Detection('knife', conf, (x, 10.0, x + 40.0, 50.0))
+
+
+class TestIoU(unittest.TestCase):
+
+    def test_iou(self):
+        self.assertEqual(iou((0, 0, 10, 10), (0, 0, 10, 10)), 1.0)
+        self.assertEqual(iou((0, 0, 10, 10), (20, 20, 30, 30)), 0.0)
+        self.assertAlmostEqual(iou((0, 0, 10, 10), (5, 0, 15, 10)), 1 / 3)
+
+
+class TestIncidentTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.alert = MagicMock()
+
+    def feed(self, tracker, frames, fps=10):
+        closed = []
+        for i, detections in enumerate(frames):
+            closed += tracker.update(detections, i / fps)
+        return closed
+
+    def test_alerts_when_incident_opens_and_closes(self):
+        tracker = IncidentTracker(self.alert, min_frames=3, max_gap=0.5)
+        # A knife moving slowly for 10 s at 10 FPS, then gone for 1 s
+        frames = [[knife(i * 0.5, conf=0.6 + (i == 42) * 0.3)] for i in range(100)] + [[]] * 10
+        closed = self.feed(tracker, frames)
+
+        self.assertEqual(len(closed), 1)
+        incident = closed[0]
+        self.assertEqual((incident.label, incident.frames), ('knife', 100))
+        self.assertAlmostEqual(incident.start, 0.0)
+        self.assertAlmostEqual(incident.end, 9.9)
+        self.assertAlmostEqual(incident.peak_confidence, 0.9)
+        self.assertEqual(self.alert.send_alert.call_count, 2)
+        opened, closed_call = self.alert.send_alert.call_args_list
+        self.assertTrue(opened.args[0].startswith("Incidente aberto: knife em 00:00:00"))
+        self.assertEqual(opened.kwargs, {'key': (None, 1, 'aberto')})
+        self.assertEqual(closed_call.args, (format_incident(incident),))
+        self.assertEqual(closed_call.kwargs, {'key': (None, 1, 'encerrado')})
+        self.assertIn("de 00:00:00 a 00:00:09", format_incident(incident))
+
+    def test_short_flicker_is_not_an_incident(self):
+        tracker = IncidentTracker(self.alert, min_frames=3)
+        self.feed(tracker, [[knife(0)], [knife(0)], [], [knife(0)], []])
+        self.assertEqual(tracker.flush(), [])
+        self.alert.send_alert.assert_not_called()
+
+    def test_short_gap_keeps_the_incident_open(self):
+        tracker = IncidentTracker(self.alert, min_frames=2, max_gap=0.5)
+        closed = self.feed(tracker, [[knife(0)]] * 5 + [[]] * 3 + [[knife(2)]] * 5)
+        self.assertEqual(closed, [])
+        incidents = tracker.flush()
+        self.assertEqual(len(incidents), 1)
+        self.assertEqual(incidents[0].frames, 10)
+
+    def test_separate_objects_and_classes(self):
+        tracker = IncidentTracker(self.alert, min_frames=2, source='cam1')
+        scissors = Detection('scissors', 0.7, (0.0, 10.0, 40.0, 50.0))
+        self.feed(tracker, [[knife(0), knife(200), scissors]] * 4)
+        incidents = tracker.flush()
+        self.assertEqual(sorted(incident.label for incident in incidents), ['knife', 'knife', 'scissors'])
+        self.assertTrue(all(incident.source == 'cam1' for incident in incidents))
+        self.assertEqual(self.alert.send_alert.call_count, 6)
+        self.assertEqual((tracker.detections, tracker.opened, tracker.incidents), (12, 3, 3))
+
+    def test_min_frames_one_opens_immediately(self):
+        tracker = IncidentTracker(self.alert, min_frames=1)
+        self.feed(tracker, [[knife(0)]])
+        self.alert.send_alert.assert_called_once()
+        self.assertEqual(tracker.opened, 1)
+
+    def test_cooldown_does_not_merge_incidents(self):
+        alert = MagicMock()
+        with AlertDispatcher(alert, cooldown=10.0) as dispatcher:
+            cameras = [IncidentTracker(dispatcher, source=source, min_frames=2, max_gap=0.2) for source in ('camA', 'camB')]
+            for tracker in cameras:
+                # Two knives in a row on each camera, all within the cooldown
+                self.feed(tracker, [[knife(0)]] * 3 + [[]] * 3 + [[knife(0)]] * 3)
+                tracker.flush()
+        messages = [call.args[0] for call in alert.send_alert.call_args_list]
+        self.assertEqual(len(messages), 8)
+        for source in ('camA', 'camB'):
+            self.assertEqual(sum(message.endswith(f"[{source}]") and message.startswith("Incidente:") for message in messages), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
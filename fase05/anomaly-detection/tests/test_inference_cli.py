@@ -12,7 +12,7 @@ if project_root not in sys.path:
 
 # Assuming parse_arguments is in anomaly_detection.inference
 # We will need to ensure it's importable.
-from anomaly_detection.inference import parse_arguments, DEFAULT_MODEL_PATH, DEFAULT_THRESHOLDS
+from anomaly_detection.inference import parse_arguments, DEFAULT_MODEL_PATH, DEFAULT_THRESHOLDS, DEFAULT_BATCH_SIZE, DEFAULT_ALERT_COOLDOWN
 import json # For comparing threshold defaults
 
 class TestInferenceCLI(unittest.TestCase):
@@ -94,6 +94,78 @@ class TestInferenceCLI(unittest.TestCase):
         with self.assertRaises(SystemExit):
             self.run_parser(['test.jpg', '--thresholds', 'not_json'])
             
+    def test_batch_options(self):
+        args = self.run_parser(['video.mp4'])
+        self.assertEqual(args.batch_size, DEFAULT_BATCH_SIZE)
+        args = self.run_parser(['video.mp4', '--batch-size', '8', '--max-latency-ms', '20'])
+        self.assertEqual(args.batch_size, 8)
+        self.assertEqual(args.max_latency_ms, 20)
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(SystemExit):
+            self.run_parser(['video.mp4', '--batch-size', '0'])
+
+    def test_streams(self):
+        self.assertIsNone(self.run_parser(['cam1.mp4']).streams)
+        args = self.run_parser(['cam1.mp4', '--streams', 'cam2.mp4', 'rtsp://camera/3'])
+        self.assertEqual(args.file_path, 'cam1.mp4')
+        self.assertEqual(args.streams, ['cam2.mp4', 'rtsp://camera/3'])
+
+    def test_alert_dispatch_options(self):
+        args = self.run_parser(['video.mp4'])
+        self.assertEqual(args.alert_cooldown, DEFAULT_ALERT_COOLDOWN)
+        self.assertIsNone(args.alert_digest)
+        args = self.run_parser(['video.mp4', '--alert-cooldown', '30', '--alert-digest', '60'])
+        self.assertEqual(args.alert_cooldown, 30)
+        self.assertEqual(args.alert_digest, 60)
+
+    def test_headless_and_output(self):
+        args = self.run_parser(['video.mp4'])
+        self.assertFalse(args.headless)
+        self.assertIsNone(args.output)
+        args = self.run_parser(['video.mp4', '--headless', '--output', 'out.mp4'])
+        self.assertTrue(args.headless)
+        self.assertEqual(args.output, 'out.mp4')
+        with self.assertRaises(SystemExit):
+            self.run_parser(['cam1.mp4', '--streams', 'cam2.mp4', '--output', 'out.mp4'])
+
+    def test_detections_and_log_level(self):
+        args = self.run_parser(['video.mp4'])
+        self.assertIsNone(args.detections)
+        self.assertEqual(args.log_level, 'INFO')
+        args = self.run_parser(['video.mp4', '--detections', 'out.parquet', '--log-level', 'DEBUG'])
+        self.assertEqual(args.detections, 'out.parquet')
+        self.assertEqual(args.log_level, 'DEBUG')
+        with self.assertRaises(SystemExit):
+            self.run_parser(['video.mp4', '--detections', 'out.csv'])
+
+    def test_runtime(self):
+        self.assertEqual(self.run_parser(['video.mp4']).runtime, 'pytorch')
+        self.assertEqual(self.run_parser(['video.mp4', '--runtime', 'openvino-int8']).runtime, 'openvino-int8')
+        with self.assertRaises(SystemExit):
+            self.run_parser(['video.mp4', '--runtime', 'tensorrt'])
+
+    def test_batch_image_options(self):
+        args = self.run_parser(['snapshots/*.jpg', '--workers', '8', '--manifest', 'done.jsonl'])
+        self.assertEqual(args.file_path, 'snapshots/*.jpg')
+        self.assertEqual(args.workers, 8)
+        self.assertEqual(args.manifest, 'done.jsonl')
+        with self.assertRaises(SystemExit):
+            self.run_parser(['snapshots/*.jpg', '--output', 'out.jpg'])
+        with self.assertRaises(SystemExit):
+            self.run_parser(['snapshots/*.jpg', '--workers', '0'])
+
+    def test_roi_and_tiles(self):
+        args = self.run_parser(['video.mp4'])
+        self.assertIsNone(args.roi)
+        self.assertIsNone(args.tile_size)
+        args = self.run_parser(['video.mp4', '--roi', 'rois.json', '--tile-size', '640', '--tile-overlap', '0.25'])
+        self.assertEqual(args.roi, 'rois.json')
+        self.assertEqual(args.tile_size, 640)
+        self.assertEqual(args.tile_overlap, 0.25)
+        with self.assertRaises(SystemExit):
+            self.run_parser(['video.mp4', '--tile-overlap', '1'])
+
     def test_invalid_alert_type(self):
         with self.assertRaises(SystemExit):
             self.run_parser(['test.jpg', '--alert-type', 'sms'])
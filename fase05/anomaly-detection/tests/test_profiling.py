@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import unittest
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.utils.profiling import StageTimer, latency_summary, peak_rss_mb, rss_mb
+
+
+class TestLatencySummary(unittest.TestCase):
+
+    def test_percentiles(self):
+        summary = latency_summary(range(1, 101))
+        self.assertAlmostEqual(summary['mean_ms'], 50.5)
+        self.assertAlmostEqual(summary['p50_ms'], 50.5)
+        self.assertAlmostEqual(summary['p99_ms'], 99.01)
+        self.assertEqual(summary['max_ms'], 100)
+
+    def test_empty(self):
+        self.assertEqual(latency_summary([])['p95_ms'], 0.0)
+
+
+class TestStageTimer(unittest.TestCase):
+
+    def test_batch_time_is_spread_over_frames(self):
+        timer = StageTimer()
+        timer.start()
+        for _ in range(4):
+            timer.add('decode', 2.0)
+        timer.add('inference', 40.0, frames=4)
+        for _ in range(4):
+            timer.add('render', 1.0)
+        timer.stop()
+
+        summary = timer.summary()
+        self.assertEqual(summary['frames'], 4)
+        self.assertEqual(summary['latency']['p50_ms'], 13.0)
+        self.assertEqual(summary['stages']['inference']['mean_ms'], 10.0)
+        self.assertNotIn('alert', summary['stages'])
+        self.assertGreater(summary['fps'], 0)
+
+    def test_measure(self):
+        timer = StageTimer()
+        with timer.measure('alert'):
+            time.sleep(0.01)
+        self.assertGreaterEqual(timer.times['alert'][0], 9.0)
+
+
+class TestMemory(unittest.TestCase):
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), "reads /proc")
+    def test_rss(self):
+        self.assertGreater(rss_mb(), 1)
+        self.assertGreaterEqual(peak_rss_mb(), rss_mb() * 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
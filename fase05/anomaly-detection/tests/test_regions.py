@@ -0,0 +1,152 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.inference import extract_detections
+from anomaly_detection.utils.regions import (RegionDetector, RegionOfInterest, load_rois, merge_detections, roi_for,
+                                             tile_starts)
+
+
+class WhiteSquareModel:
+    """Fake detector: one 'knife' box around the white pixels of each input image."""
+
+    names = {0: 'knife'}
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, images, **kwargs):
+        self.calls.append([image.shape[:2] for image in images])
+        results = []
+        for image in images:
+            ys, xs = np.nonzero(image[..., 0] == 255)
+            boxes = torch.tensor([[xs.min(), ys.min(), xs.max() + 1, ys.max() + 1, 0.9, 0]], dtype=torch.float32) \
+                if len(xs) else torch.zeros((0, 6))
+            results.append(Results(orig_img=image, path="", names=self.names, boxes=boxes))
+        return results
+
+
+def frame_with_square(x, y, size=40, shape=(800, 1200)):
+    frame = np.zeros(shape + (3,), np.uint8)
+    frame[y:y + size, x:x + size] = 255
+    return frame
+
+
+class TestTiles(unittest.TestCase):
+
+    def test_tile_starts(self):
+        self.assertEqual(tile_starts(300, 400, 0.2), [0])
+        self.assertEqual(tile_starts(1000, 400, 0.25), [0, 300, 600])
+        starts = tile_starts(1200, 400, 0.2)
+        self.assertEqual(starts[-1], 800)
+        self.assertTrue(all(b - a <= 320 for a, b in zip(starts, starts[1:])))
+
+    def test_merge_detections(self):
+        merged = merge_detections([
+            [100, 100, 140, 140, 0.9, 0],
+            [100, 100, 120, 140, 0.6, 0],   # the same object cut at a tile border
+            [300, 300, 340, 340, 0.8, 0],
+            [100, 100, 140, 140, 0.7, 1],   # another class in the same place
+        ])
+        merged = sorted(map(tuple, merged[:, [0, 4, 5]].tolist()))
+        np.testing.assert_allclose(merged, [(100, 0.7, 1), (100, 0.9, 0), (300, 0.8, 0)], rtol=1e-6)
+        self.assertEqual(merge_detections([]).shape, (0, 6))
+
+
+class TestRegionDetector(unittest.TestCase):
+
+    def test_tiles_are_batched_and_boxes_mapped_back(self):
+        model = WhiteSquareModel()
+        detector = RegionDetector(model, tile_size=400, overlap=0.2, full_frame=False)
+        # The second square straddles a tile border
+        results = detector([frame_with_square(1000, 600), frame_with_square(300, 300)])
+
+        self.assertEqual(len(model.calls), 1)
+        self.assertEqual(len(model.calls[0]), 2 * len(tile_starts(1200, 400, 0.2)) * len(tile_starts(800, 400, 0.2)))
+        self.assertTrue(all(shape == (400, 400) for shape in model.calls[0]))
+        self.assertEqual(results[0].boxes.xyxy.tolist(), [[1000, 600, 1040, 640]])
+        self.assertEqual(results[1].boxes.xyxy.tolist(), [[300, 300, 340, 340]])
+        self.assertEqual(results[0].orig_img.shape, (800, 1200, 3))
+
+    def test_full_frame_pass(self):
+        model = WhiteSquareModel()
+        RegionDetector(model, tile_size=400)([frame_with_square(0, 0)])
+        self.assertEqual(model.calls[0][0], (800, 1200))
+
+    def test_small_frames_are_not_tiled(self):
+        model = WhiteSquareModel()
+        RegionDetector(model, tile_size=1280)(frame_with_square(10, 10))
+        self.assertEqual(model.calls, [[(800, 1200)]])
+
+    def test_roi_crops_and_filters(self):
+        model = WhiteSquareModel()
+        roi = RegionOfInterest(polygons=[[[0.5, 0.0], [1.0, 0.0], [1.0, 0.5], [0.5, 0.5]]])
+        detector = RegionDetector(model, roi=roi)
+        inside, outside = detector([frame_with_square(900, 100), frame_with_square(100, 600)])
+
+        x1, y1, x2, y2 = roi.bounds((800, 1200))
+        self.assertEqual((x1, y1), (600, 0))
+        self.assertEqual(model.calls, [[(y2 - y1, x2 - x1)] * 2])
+        self.assertEqual(inside.boxes.xyxy.tolist(), [[900, 100, 940, 140]])
+        self.assertEqual(len(outside.boxes), 0)
+        self.assertEqual([d.label for d in extract_detections(inside, detector, {'knife': 0.5})], ['knife'])
+
+    def test_roi_skips_tiles_outside_the_region(self):
+        model = WhiteSquareModel()
+        roi = RegionOfInterest(polygons=[[[0.0, 0.0], [0.3, 0.0], [0.3, 0.3], [0.0, 0.3]]])
+        RegionDetector(model, roi=roi, tile_size=200, full_frame=False)([frame_with_square(10, 10)])
+        x1, y1, x2, y2 = roi.bounds((800, 1200))
+        # Only the tiles over the region's bounding box (about 360 x 240 pixels) are inferred, not the 35 of the frame
+        self.assertEqual(len(model.calls[0]), len(tile_starts(x2 - x1, 200, 0.2)) * len(tile_starts(y2 - y1, 200, 0.2)))
+        self.assertLessEqual(len(model.calls[0]), 6)
+
+    def test_per_frame_regions(self):
+        model = WhiteSquareModel()
+        left = RegionOfInterest(polygons=[[[0.0, 0.0], [0.5, 0.0], [0.5, 1.0], [0.0, 1.0]]])
+        results = RegionDetector(model)([frame_with_square(100, 100)] * 2, regions=[left, None])
+        self.assertEqual(model.calls[0][1], (800, 1200))
+        self.assertLess(model.calls[0][0][1], 610)
+        self.assertEqual([len(result.boxes) for result in results], [1, 1])
+
+
+class TestROIConfig(unittest.TestCase):
+
+    def test_load_rois(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            mask = np.zeros((10, 20), np.uint8)
+            mask[:, 10:] = 255
+            cv2.imwrite(os.path.join(tmp, 'cam2.png'), mask)
+            path = os.path.join(tmp, 'rois.json')
+            with open(path, 'w') as file:
+                json.dump({'cam1.mp4': [[[0, 0], [0.5, 0], [0.5, 0.5], [0, 0.5]]], 'rtsp://cam/2': 'cam2.png'}, file)
+            rois = load_rois(path)
+
+            self.assertIs(roi_for(rois, '/videos/cam1.mp4'), rois['cam1.mp4'])
+            self.assertIsNone(roi_for(rois, 'cam3.mp4'))
+            mask = rois['cam1.mp4'].mask((100, 200))
+            self.assertTrue(mask[:50, :100].all())
+            self.assertAlmostEqual(mask.mean(), 0.25, delta=0.02)
+            self.assertEqual(roi_for(rois, 'rtsp://cam/2').bounds((100, 200)), (100, 0, 200, 100))
+
+    def test_default_roi(self):
+        rois = {'*': RegionOfInterest(polygons=[[[0, 0], [1, 0], [1, 1]]])}
+        self.assertIs(roi_for(rois, 'any.mp4'), rois['*'])
+        self.assertIsNone(roi_for(None, 'any.mp4'))
+
+
+if __name__ == '__main__':
+    unittest.main()
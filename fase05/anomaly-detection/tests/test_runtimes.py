@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.utils.runtimes import load_model, resolve_model_path
+
+
+class TestRuntimes(unittest.TestCase):
+
+    def test_resolve_model_path(self):
+        weights = os.path.join('runs', 'train', 'weights', 'best.pt')
+        self.assertEqual(resolve_model_path(weights), weights)
+        self.assertEqual(resolve_model_path(weights, 'onnx'), os.path.join('runs', 'train', 'weights', 'best.onnx'))
+        self.assertEqual(resolve_model_path(weights, 'openvino'),
+                         os.path.join('runs', 'train', 'weights', 'best_openvino_model'))
+        self.assertEqual(resolve_model_path(weights, 'openvino-int8'),
+                         os.path.join('runs', 'train', 'weights', 'best_int8_openvino_model'))
+
+    def test_exported_path_is_used_as_is(self):
+        self.assertEqual(resolve_model_path('models/best.onnx', 'onnx'), 'models/best.onnx')
+
+    def test_unknown_runtime(self):
+        with self.assertRaises(ValueError):
+            resolve_model_path('best.pt', 'tensorrt')
+
+    def test_missing_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(FileNotFoundError):
+                load_model(os.path.join(tmp, 'best.pt'), 'openvino')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import atexit
+import json
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.utils.incidents import Detection
+from anomaly_detection.utils.logs import configure_logging
+from anomaly_detection.utils.sink import COLUMNS, DetectionSink
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+def detections(frame):
+    return [Detection('knife', 0.5 + frame / 100, (frame, 0.0, frame + 10.0, 10.0)),
+            Detection('scissors', 0.7, (0.0, 0.0, 5.0, 5.0))]
+
+
+class TestDetectionSink(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def fill(self, path, frames=25, buffer_size=8):
+        with DetectionSink(path, buffer_size=buffer_size) as sink:
+            for frame in range(frames):
+                sink.add(detections(frame), frame, frame / 10, source='cam1')
+            sink.add([], frames, frames / 10)
+        return sink
+
+    def test_jsonl(self):
+        path = os.path.join(self.tmp.name, 'detections.jsonl')
+        sink = self.fill(path)
+        with open(path, encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(sink.rows, 50)
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(list(rows[2]), COLUMNS)
+        self.assertEqual(rows[2], {'source': 'cam1', 'frame': 1, 'timestamp': 0.1, 'label': 'knife',
+                                   'confidence': 0.51, 'x1': 1, 'y1': 0.0, 'x2': 11.0, 'y2': 10.0})
+
+    def test_when_written_runs_after_the_rows_are_on_disk(self):
+        path = os.path.join(self.tmp.name, 'detections.jsonl')
+        seen = []
+
+        def count_rows():
+            with open(path, encoding='utf-8') as file:
+                seen.append(sum(1 for _ in file))
+
+        with DetectionSink(path, buffer_size=100) as sink:
+            sink.add(detections(0), 0, 0.0)
+            sink.when_written(count_rows)
+            sink.sync()
+            self.assertEqual(seen, [2])
+            sink.add(detections(1), 1, 0.1)
+            sink.when_written(count_rows)
+        self.assertEqual(seen, [2, 4])
+
+    def test_when_written_skipped_on_write_error(self):
+        called = []
+        with DetectionSink(os.path.join(self.tmp.name, 'missing', 'detections.jsonl')) as sink:
+            sink.add(detections(0), 0, 0.0)
+            sink.when_written(lambda: called.append(True))
+            sink.sync()
+        self.assertIsNotNone(sink.error)
+        self.assertEqual(called, [])
+
+    @unittest.skipIf(pq is None, "pyarrow is not installed")
+    def test_parquet_row_groups(self):
+        path = os.path.join(self.tmp.name, 'detections.parquet')
+        self.fill(path, frames=25, buffer_size=10)
+        table = pq.read_table(path)
+        self.assertEqual(table.column_names, COLUMNS)
+        self.assertEqual(table.num_rows, 50)
+        self.assertEqual(pq.ParquetFile(path).num_row_groups, 5)
+        self.assertEqual(table.column('label').to_pylist()[:2], ['knife', 'scissors'])
+
+    @unittest.skipIf(pq is None, "pyarrow is not installed")
+    def test_empty_parquet_is_valid(self):
+        path = os.path.join(self.tmp.name, 'detections.parquet')
+        DetectionSink(path).close()
+        self.assertEqual(pq.read_table(path).num_rows, 0)
+
+    def test_append_jsonl(self):
+        path = os.path.join(self.tmp.name, 'detections.jsonl')
+        self.fill(path, frames=2)
+        with DetectionSink(path, append=True) as sink:
+            sink.add(detections(9), 9, 0.9)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual([json.loads(line)['frame'] for line in file], [0, 0, 1, 1, 9, 9])
+
+    @unittest.skipIf(pq is None, "pyarrow is not installed")
+    def test_existing_parquet_cannot_be_appended(self):
+        path = os.path.join(self.tmp.name, 'detections.parquet')
+        self.fill(path, frames=2)
+        with self.assertRaises(ValueError):
+            DetectionSink(path, append=True)
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            DetectionSink(os.path.join(self.tmp.name, 'detections.csv'))
+
+
+class TestConfigureLogging(unittest.TestCase):
+
+    def test_records_reach_the_file(self):
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'logs.log')
+            listener = configure_logging(path, logging.INFO, console=False)
+            try:
+                self.assertIsInstance(root.handlers[0], logging.handlers.QueueHandler)
+                logging.getLogger('anomaly_detection.test').info("Detectado: knife")
+                logging.getLogger('anomaly_detection.test').debug("ignored")
+            finally:
+                listener.stop()
+                atexit.unregister(listener.stop)
+                for handler in listener.handlers:
+                    handler.close()
+                root.handlers[:] = handlers
+                root.setLevel(level)
+            with open(path, encoding='utf-8') as file:
+                content = file.read()
+        self.assertIn("INFO - Detectado: knife", content)
+        self.assertNotIn("ignored", content)
+
+
+if __name__ == '__main__':
+    unittest.main()
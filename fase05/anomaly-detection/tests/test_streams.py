@@ -0,0 +1,168 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.utils.streams import StreamScheduler, is_stream_url
+from anomaly_detection.inference import process_streams
+from anomaly_detection.utils.alerts import AlertDispatcher
+from anomaly_detection.utils.gating import FrameGate
+from anomaly_detection.utils.incidents import IncidentTracker
+
+
+def write_video(path, frames, fps=10):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 10 % 255, np.uint8))
+    writer.release()
+
+
+class TestStreamScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.videos = []
+        for name, frames in (('a.mp4', 12), ('b.mp4', 6), ('c.mp4', 9)):
+            path = os.path.join(self.tmp.name, name)
+            write_video(path, frames)
+            self.videos.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_every_frame_delivered_in_order_per_stream(self):
+        scheduler = StreamScheduler(self.videos, batch_size=4, max_queue=2).start()
+        try:
+            batches = list(scheduler.batches())
+        finally:
+            scheduler.stop()
+        for stream, expected in enumerate((12, 6, 9)):
+            indexes = [frame.index for batch in batches for s, frame in batch if s == stream]
+            self.assertEqual(indexes, list(range(expected)))
+        self.assertTrue(all(len(batch) <= 4 for batch in batches))
+
+    def test_round_robin_is_fair(self):
+        scheduler = StreamScheduler(self.videos, batch_size=2, max_queue=4).start()
+        try:
+            # Let every decoder fill its queue, so all streams compete for the same batches
+            deadline = time.monotonic() + 5
+            while not all(reader.frames.full() for reader in scheduler.readers) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            batches = scheduler.batches()
+            served = [stream for _ in range(6) for stream, _ in next(batches)]
+        finally:
+            scheduler.stop()
+        self.assertEqual(served, [0, 1, 2] * 4)
+
+    def test_missing_source_ends_immediately(self):
+        scheduler = StreamScheduler([os.path.join(self.tmp.name, 'missing.mp4'), self.videos[1]], batch_size=2).start()
+        try:
+            frames = [frame for batch in scheduler.batches() for _, frame in batch]
+        finally:
+            scheduler.stop()
+        self.assertEqual(len(frames), 6)
+
+    def test_is_stream_url(self):
+        self.assertTrue(is_stream_url('rtsp://10.0.0.1/stream'))
+        self.assertFalse(is_stream_url('videos/cam1.mp4'))
+
+
+class TestProcessStreams(unittest.TestCase):
+
+    def test_shared_model_and_report(self):
+        model = MagicMock()
+        model.names = {0: 'knife'}
+        model.side_effect = lambda frames: [MagicMock(boxes=[]) for _ in frames]
+        with tempfile.TemporaryDirectory() as tmp:
+            videos = []
+            for name, frames in (('a.mp4', 8), ('b.mp4', 5)):
+                videos.append(os.path.join(tmp, name))
+                write_video(videos[-1], frames)
+            report = process_streams(videos, model, MagicMock(), {}, batch_size=4)
+
+        self.assertEqual(report['frames'], 13)
+        self.assertEqual(report['inferred'], 13)
+        self.assertEqual(sum(len(call.args[0]) for call in model.call_args_list), 13)
+        self.assertTrue(all(len(call.args[0]) <= 4 for call in model.call_args_list))
+        self.assertEqual([stream['frames'] for stream in report['streams']], [8, 5])
+        self.assertTrue(all(stream['latency_p95_ms'] >= 0 for stream in report['streams']))
+
+    def test_one_incident_per_stream(self):
+        box = MagicMock(cls=[0], conf=[0.9], xyxy=[[10.0, 10.0, 50.0, 50.0]])
+        model = MagicMock()
+        model.names = {0: 'knife'}
+        model.side_effect = lambda frames: [MagicMock(boxes=[box]) for _ in frames]
+        alert = MagicMock()
+        with tempfile.TemporaryDirectory() as tmp:
+            videos = []
+            for name, frames in (('a.mp4', 8), ('b.mp4', 5)):
+                videos.append(os.path.join(tmp, name))
+                write_video(videos[-1], frames)
+            process_streams(videos, model, alert, {'knife': 0.5}, batch_size=4,
+                            tracker_factory=lambda source: IncidentTracker(alert, source=source, min_frames=3))
+
+        messages = [call.args[0] for call in alert.send_alert.call_args_list]
+        self.assertEqual(sum(message.startswith("Incidente aberto") for message in messages), 2)
+        messages = [message for message in messages if message.startswith("Incidente:")]
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(sum("8 quadros" in message and message.endswith("a.mp4]") for message in messages), 1)
+        self.assertEqual(sum("5 quadros" in message and message.endswith("b.mp4]") for message in messages), 1)
+
+    def test_skipped_frames_do_not_confirm_an_incident(self):
+        box = MagicMock(cls=[0], conf=[0.9], xyxy=[[10.0, 10.0, 50.0, 50.0]])
+        model = MagicMock()
+        model.names = {0: 'knife'}
+        inferred = []
+
+        def infer(frames):
+            # A knife in the first two inferred frames only; the gate skips the 4 frames after each one
+            results = [MagicMock(boxes=[box] if len(inferred) + i < 2 else []) for i in range(len(frames))]
+            inferred.extend(frames)
+            return results
+
+        model.side_effect = infer
+        alert = MagicMock()
+        with tempfile.TemporaryDirectory() as tmp:
+            videos = []
+            for name in ('a.mp4', 'b.mp4'):
+                videos.append(os.path.join(tmp, name))
+                write_video(videos[-1], 10)
+            process_streams(videos, model, alert, {'knife': 0.5}, batch_size=2, gate_factory=lambda: FrameGate(stride=5),
+                            tracker_factory=lambda source: IncidentTracker(alert, source=source, min_frames=3))
+        alert.send_alert.assert_not_called()
+
+    def test_alert_cooldown_per_stream(self):
+        box = MagicMock(cls=[0], conf=[0.9], xyxy=[[10.0, 10.0, 50.0, 50.0]])
+        model = MagicMock()
+        model.names = {0: 'knife'}
+        model.side_effect = lambda frames: [MagicMock(boxes=[box]) for _ in frames]
+        alert = MagicMock()
+        with tempfile.TemporaryDirectory() as tmp:
+            videos = []
+            for name, frames in (('a.mp4', 4), ('b.mp4', 4)):
+                videos.append(os.path.join(tmp, name))
+                write_video(videos[-1], frames)
+            with AlertDispatcher(alert, cooldown=60.0) as dispatcher:
+                process_streams(videos, model, dispatcher, {'knife': 0.5}, batch_size=4)
+
+        # The knife seen by camera a must not silence the one seen by camera b
+        messages = [call.args[0] for call in alert.send_alert.call_args_list]
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(sum(message.endswith("a.mp4]") for message in messages), 1)
+        self.assertEqual(sum(message.endswith("b.mp4]") for message in messages), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
+import importlib.util
 import unittest
 import sys
 import os
-from unittest.mock import patch
+from unittest.mock import MagicMock, call, patch
 
 # --- Start of sys.path modification ---
 # Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
@@ -10,8 +11,12 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 # --- End of sys.path modification ---
 
-# Assuming parse_arguments is in anomaly_detection.training_yolo
-from anomaly_detection.training_yolo import parse_arguments
+# training-yolo.py is a script (not an importable module name), so it is loaded from its path
+spec = importlib.util.spec_from_file_location(
+    "training_yolo", os.path.join(os.path.dirname(__file__), '..', 'training-yolo.py'))
+training_yolo = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(training_yolo)
+parse_arguments = training_yolo.parse_arguments
 
 class TestTrainingCLI(unittest.TestCase):
 
@@ -85,5 +90,33 @@ class TestTrainingCLI(unittest.TestCase):
         with self.assertRaises(SystemExit):
             self.run_parser(['data.yaml', '--imgsz', 'not_an_integer'])
 
+    def test_export_options(self):
+        args = self.run_parser(['data.yaml'])
+        self.assertIsNone(args.export)  # Default
+        self.assertFalse(args.int8)  # Default
+        args = self.run_parser(['data.yaml', '--export', 'onnx', 'openvino', '--int8', '--calibration-fraction', '0.2'])
+        self.assertEqual(args.export, ['onnx', 'openvino'])
+        self.assertTrue(args.int8)
+        self.assertEqual(args.calibration_fraction, 0.2)
+
+    def test_invalid_export_options(self):
+        with self.assertRaises(SystemExit):
+            self.run_parser(['data.yaml', '--export', 'tflite'])
+        with self.assertRaises(SystemExit):
+            self.run_parser(['data.yaml', '--int8'])
+        with self.assertRaises(SystemExit):
+            self.run_parser(['data.yaml', '--skip-training'])
+    def test_export_model_int8(self):
+        model = MagicMock()
+        model.export.side_effect = lambda format, **kwargs: f"{format}{'-int8' if kwargs.get('quantize') else ''}"
+        with patch.object(training_yolo, 'YOLO', return_value=model):
+            exported = training_yolo.export_model('best.pt', ['onnx', 'openvino'], 'data.yaml', imgsz=320,
+                                                  int8=True, calibration_fraction=0.2)
+
+        # INT8 through `quantize=8` (`int8=True` is deprecated), before the FP32 export of the same format
+        self.assertEqual(exported, ['onnx-int8', 'onnx', 'openvino-int8', 'openvino'])
+        self.assertEqual(model.export.call_args_list[0],
+                         call(format='onnx', imgsz=320, dynamic=True, quantize=8, data='data.yaml', fraction=0.2))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,252 @@
+import os
+import queue
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+# --- Start of sys.path modification ---
+# Ensure the project root (/app) is in sys.path to allow imports from anomaly_detection
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# --- End of sys.path modification ---
+
+from anomaly_detection.utils.video import Frame, FrameReader, FrameWriter, format_timestamp, iter_batches
+from anomaly_detection.inference import process_batch, process_image, process_video
+from anomaly_detection.utils.gating import FrameGate
+from anomaly_detection.utils.incidents import IncidentTracker
+
+
+def write_video(path, frames=12, fps=10):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 10, np.uint8))
+    writer.release()
+
+
+def fake_box(cls, conf):
+    box = MagicMock()
+    box.cls = [cls]
+    box.conf = [conf]
+    box.xyxy = [[10.0, 10.0, 50.0, 50.0]]
+    return box
+
+
+def fake_result(boxes):
+    result = MagicMock()
+    result.boxes = boxes
+    result.plot.return_value = np.zeros((48, 64, 3), np.uint8)
+    return result
+
+
+class TestFormatTimestamp(unittest.TestCase):
+
+    def test_format(self):
+        self.assertEqual(format_timestamp(0), "00:00:00")
+        self.assertEqual(format_timestamp(62.5), "00:01:02")
+        self.assertEqual(format_timestamp(3725), "01:02:05")
+
+
+class TestIterBatches(unittest.TestCase):
+
+    def frames(self, count, end=True):
+        frames = queue.Queue()
+        for i in range(count):
+            frames.put(Frame(i, i / 10, None))
+        if end:
+            frames.put(None)
+        return frames
+
+    def test_full_batches_and_remainder(self):
+        batches = list(iter_batches(self.frames(7), batch_size=3))
+        self.assertEqual([[frame.index for frame in batch] for batch in batches], [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_partial_batch_flushed_after_max_latency(self):
+        frames = self.frames(2, end=False)
+        batches = iter_batches(frames, batch_size=8, max_latency=0.05)
+        started = time.monotonic()
+        batch = next(batches)
+        self.assertEqual([frame.index for frame in batch], [0, 1])
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_empty_stream(self):
+        self.assertEqual(list(iter_batches(self.frames(0), batch_size=4)), [])
+
+
+class TestFrameReader(unittest.TestCase):
+
+    def test_reads_all_frames_with_timestamps(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'video.mp4')
+            write_video(path, frames=12, fps=10)
+            reader = FrameReader(path, max_queue=2)
+            self.assertTrue(reader.is_opened())
+            reader.start()
+            frames = [frame for batch in iter_batches(reader.frames, batch_size=5) for frame in batch]
+            reader.join(timeout=5)
+
+        self.assertEqual([frame.index for frame in frames], list(range(12)))
+        timestamps = [frame.timestamp for frame in frames]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertAlmostEqual(timestamps[-1] - timestamps[0], 1.1, places=1)
+
+    def test_stop_releases_a_blocked_reader(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'video.mp4')
+            write_video(path, frames=12)
+            reader = FrameReader(path, max_queue=1)
+            reader.start()
+            reader.frames.get()
+            reader.stop()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+
+
+def count_frames(path):
+    capture = cv2.VideoCapture(path)
+    count = 0
+    while capture.read()[0]:
+        count += 1
+    capture.release()
+    return count
+
+
+class TestFrameWriter(unittest.TestCase):
+
+    def test_writes_every_frame(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.mp4')
+            writer = FrameWriter(path, fps=10, max_queue=2, transform=lambda value: np.full((48, 64, 3), value, np.uint8))
+            writer.start()
+            for i in range(15):
+                writer.write(i * 10)
+            writer.close()
+            self.assertIsNone(writer.error)
+            self.assertEqual(writer.written, 15)
+            self.assertEqual(count_frames(path), 15)
+
+    def test_failed_writer_does_not_block(self):
+        writer = FrameWriter('/tmp/out.mp4', max_queue=1, transform=lambda value: 1 / 0)
+        writer.start()
+        for i in range(5):
+            writer.write(i)
+        writer.close()
+        self.assertIsInstance(writer.error, ZeroDivisionError)
+
+
+class TestProcessBatch(unittest.TestCase):
+
+    def test_single_model_call_with_per_frame_timestamps(self):
+        model = MagicMock()
+        model.names = {0: 'knife', 1: 'scissors'}
+        model.return_value = [fake_result([fake_box(0, 0.9)]), fake_result([]), fake_result([fake_box(1, 0.3)])]
+        alert = MagicMock()
+        frames = [np.zeros((4, 4, 3), np.uint8)] * 3
+
+        processed = process_batch(frames, model, alert, {'knife': 0.5, 'scissors': 0.5}, ['00:00:01', '00:00:02', '00:00:03'])
+
+        model.assert_called_once()
+        self.assertEqual(len(model.call_args[0][0]), 3)
+        self.assertEqual(len(processed), 3)
+        alert.send_alert.assert_called_once_with("Detectado: knife com confiança 0.90 em 00:00:01", key='knife')
+
+
+class TestProcessVideo(unittest.TestCase):
+
+    def run_video(self, gate, batch_size=4, tracker=None, display=True, output_path=None, detected=lambda inference: True):
+        # `detected(n)`: whether the n-th inferred frame has a knife
+        model = MagicMock()
+        model.names = {0: 'knife'}
+        self.results = []
+
+        def infer(frames):
+            self.results.extend(fake_result([fake_box(0, 0.9)] if detected(len(self.results)) else []) for _ in frames)
+            return self.results[-len(frames):]
+
+        model.side_effect = infer
+        alert = MagicMock()
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('anomaly_detection.inference.cv2.namedWindow') as named_window, \
+                patch('anomaly_detection.inference.cv2.imshow') as imshow, \
+                patch('anomaly_detection.inference.cv2.waitKey', return_value=0), \
+                patch('anomaly_detection.inference.cv2.destroyAllWindows'):
+            path = os.path.join(tmp, 'video.mp4')
+            write_video(path, frames=12)
+            process_video(path, model, alert, {'knife': 0.5}, batch_size=batch_size, gate=gate, tracker=tracker,
+                          display=display, output_path=output_path)
+        self.named_window = named_window
+        return model, alert, imshow
+
+    def test_every_frame_is_inferred_by_default(self):
+        model, alert, imshow = self.run_video(None)
+        self.assertEqual(sum(len(call.args[0]) for call in model.call_args_list), 12)
+        self.assertEqual(alert.send_alert.call_count, 12)
+        self.assertEqual(imshow.call_count, 12)
+
+    def test_skipped_frames_carry_detections_over(self):
+        model, alert, imshow = self.run_video(FrameGate(stride=4))
+        self.assertEqual(sum(len(call.args[0]) for call in model.call_args_list), 3)
+        # One alert per inference, but every frame is still displayed with the last detections
+        self.assertEqual(alert.send_alert.call_count, 3)
+        self.assertEqual(imshow.call_count, 12)
+
+    def test_incident_tracker_alerts_on_open_and_close(self):
+        tracker_alert = MagicMock()
+        tracker = IncidentTracker(tracker_alert, min_frames=3)
+        model, alert, imshow = self.run_video(FrameGate(stride=2), tracker=tracker)
+        alert.send_alert.assert_not_called()
+        self.assertEqual(tracker_alert.send_alert.call_count, 2)
+        self.assertTrue(tracker_alert.send_alert.call_args_list[0][0][0].startswith("Incidente aberto: knife em 00:00:00"))
+        message = tracker_alert.send_alert.call_args[0][0]
+        self.assertTrue(message.startswith("Incidente: knife de 00:00:00 a 00:00:01"))
+        # Only the 6 inferred frames count, not the skipped ones that show the last detections
+        self.assertIn("6 quadros", message)
+
+    def test_skipped_frames_do_not_confirm_an_incident(self):
+        tracker_alert = MagicMock()
+        tracker = IncidentTracker(tracker_alert, min_frames=3)
+        # A knife on the first inferred frame only (a false positive), followed by 4 skipped frames
+        self.run_video(FrameGate(stride=5), batch_size=1, tracker=tracker, detected=lambda inference: inference == 0)
+        tracker_alert.send_alert.assert_not_called()
+        self.assertEqual(tracker.opened, 0)
+
+    def test_headless_does_not_draw(self):
+        model, alert, imshow = self.run_video(None, display=False)
+        self.assertEqual(alert.send_alert.call_count, 12)
+        imshow.assert_not_called()
+        self.named_window.assert_not_called()
+        self.assertEqual(len(self.results), 12)
+        self.assertFalse(any(result.plot.called for result in self.results))
+
+    def test_headless_with_output_video(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'out.mp4')
+            model, alert, imshow = self.run_video(FrameGate(stride=3), display=False, output_path=output)
+            imshow.assert_not_called()
+            self.assertEqual(count_frames(output), 12)
+
+
+class TestProcessImage(unittest.TestCase):
+
+    def test_headless_image_is_not_drawn(self):
+        result = fake_result([fake_box(0, 0.9)])
+        model = MagicMock(return_value=[result])
+        model.names = {0: 'knife'}
+        alert = MagicMock()
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch('anomaly_detection.inference.cv2.imshow') as imshow:
+            path = os.path.join(tmp, 'image.png')
+            cv2.imwrite(path, np.zeros((48, 64, 3), np.uint8))
+            process_image(path, model, alert, {'knife': 0.5}, display=False)
+        alert.send_alert.assert_called_once()
+        result.plot.assert_not_called()
+        imshow.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import argparse
 from ultralytics import YOLO
 
+EXPORT_FORMATS = ["onnx", "openvino"]
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Train a YOLO model.")
     parser.add_argument("dataset_yaml", help="Path to the dataset YAML file.")
@@ -10,16 +12,56 @@ def parse_arguments():
                         help="Number of training epochs (default: 30).")
     parser.add_argument("--imgsz", type=int, default=640,
                         help="Image size for training (default: 640).")
-    return parser.parse_args()
+    parser.add_argument("--export", nargs="+", choices=EXPORT_FORMATS, default=None,
+                        help="Export the trained model for CPU inference (inference.py --runtime).")
+    parser.add_argument("--int8", action="store_true",
+                        help="Also export an INT8-quantized model for each --export format.")
+    parser.add_argument("--calibration-fraction", type=float, default=0.1,
+                        help="Fraction of the dataset used to calibrate the INT8 quantization (default: 0.1).")
+    parser.add_argument("--skip-training", action="store_true",
+                        help="Only export --model-name (e.g. runs/detect/train/weights/best.pt), without training.")
+    args = parser.parse_args()
+
+    if not 0 < args.calibration_fraction <= 1:
+        parser.error("--calibration-fraction must be in (0, 1].")
+    if args.int8 and not args.export:
+        parser.error("--int8 requires --export.")
+    if args.skip_training and not args.export:
+        parser.error("--skip-training requires --export.")
+    return args
+
+def export_model(weights, formats, dataset_yaml, imgsz=640, int8=False, calibration_fraction=0.1):
+    """
+    Exports `weights` to each format, next to the .pt file. Dynamic shapes let inference.py
+    use any --batch-size. With `int8`, each format is also exported INT8-quantized (best_int8.onnx,
+    best_int8_openvino_model), calibrated on a fraction of the dataset. Returns the paths of the exported models.
+    """
+    model = YOLO(weights)
+    exported = []
+    for format in formats:
+        if int8:
+            # Before the FP32 export: the ONNX quantization writes and then deletes the plain best.onnx
+            exported.append(model.export(format=format, imgsz=imgsz, dynamic=True, quantize=8,
+                                         data=dataset_yaml, fraction=calibration_fraction))
+        exported.append(model.export(format=format, imgsz=imgsz, dynamic=True))
+    return exported
 
 def main():
     args = parse_arguments()
+    weights = args.model_name
+
+    if not args.skip_training:
+        # Initialize YOLO model
+        model = YOLO(args.model_name)
 
-    # Initialize YOLO model
-    model = YOLO(args.model_name)
+        # Train the model
+        model.train(data=args.dataset_yaml, epochs=args.epochs, imgsz=args.imgsz)
+        weights = model.trainer.best
 
-    # Train the model
-    model.train(data=args.dataset_yaml, epochs=args.epochs, imgsz=args.imgsz)
+    if args.export:
+        for path in export_model(weights, args.export, args.dataset_yaml, imgsz=args.imgsz, int8=args.int8,
+                                 calibration_fraction=args.calibration_fraction):
+            print(f"Exported: {path}")
 
 if __name__ == "__main__":
     main()
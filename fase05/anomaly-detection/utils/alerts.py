@@ -1,6 +1,9 @@
 import os
+import queue
 import smtplib
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
@@ -12,36 +15,183 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 
 class Alert(ABC):
     @abstractmethod
-    def send_alert(self, message):
+    def send_alert(self, message, key=None):
+        pass
+
+    def send_digest(self, messages):
+        """Sends several alerts at once; by default, one by one."""
+        for message in messages:
+            self.send_alert(message)
+
+    def close(self):
         pass
 
 class ConsoleAlert(Alert):
-    def send_alert(self, message):
+    def send_alert(self, message, key=None):
         logging.debug(f"ALERT: {message}")
 
 class EmailAlert(Alert):
-    def __init__(self, recipient_email):
+    """
+    Sends alerts by e-mail over a single SMTP connection, opened on the first alert and reused
+    until `close()`. If the server dropped the connection, it reconnects once and retries.
+    `host`, `port`, `use_ssl` and `login` allow pointing it at a local SMTP server (e.g. aiosmtpd).
+    """
+
+    def __init__(self, recipient_email, host="smtp.gmail.com", port=465, use_ssl=True, login=True):
         self.recipient_email = recipient_email
-        self.password = os.getenv("EMAIL_PASSWORD")
-        if not self.password:
-            logging.error("EMAIL_PASSWORD environment variable not set.")
-            raise ValueError("EMAIL_PASSWORD environment variable not set.")
-        
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.login = login
+        self.server = None
+
         self.from_email = os.getenv("EMAIL_FROM")
         if not self.from_email:
             logging.error("EMAIL_FROM environment variable not set.")
             raise ValueError("EMAIL_FROM environment variable not set.")
 
-    def send_alert(self, message):
-        msg = MIMEText(f"Alerta: objeto perigoso detectado ({message})!")
-        msg["Subject"] = "Alerta de Segurança"
+        self.password = os.getenv("EMAIL_PASSWORD")
+        if not self.password:
+            logging.error("EMAIL_PASSWORD environment variable not set.")
+            raise ValueError("EMAIL_PASSWORD environment variable not set.")
+
+    def connect(self):
+        if self.server is None:
+            smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+            server = smtp_class(self.host, self.port)
+            if self.login:
+                try:
+                    server.login(self.from_email, self.password)
+                except Exception:
+                    server.close()
+                    raise
+            self.server = server
+        return self.server
+
+    def close(self):
+        server, self.server = self.server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+
+    def _send(self, msg):
+        for attempt in range(2):
+            try:
+                self.connect().sendmail(self.from_email, self.recipient_email, msg.as_string())
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                # Connection dropped by the server (idle timeout): reconnect once
+                self.close()
+                if attempt:
+                    raise e
+
+    def _message(self, subject, body):
+        msg = MIMEText(body)
+        msg["Subject"] = subject
         msg["From"] = self.from_email
         msg["To"] = self.recipient_email
+        return msg
 
+    def send_alert(self, message, key=None):
+        msg = self._message("Alerta de Segurança", f"Alerta: objeto perigoso detectado ({message})!")
         try:
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                server.login(self.from_email, self.password)
-                server.sendmail(self.from_email, self.recipient_email, msg.as_string())
+            self._send(msg)
             logging.info(f"Email alert sent to {self.recipient_email} with message: {message}")
         except Exception as e:
+            self.close()
             logging.error(f"Failed to send email alert to {self.recipient_email}: {e}")
+
+    def send_digest(self, messages):
+        if len(messages) == 1:
+            return self.send_alert(messages[0])
+        body = "Alerta: objetos perigosos detectados:\n" + "\n".join(f"- {message}" for message in messages)
+        msg = self._message(f"Alerta de Segurança ({len(messages)} detecções)", body)
+        try:
+            self._send(msg)
+            logging.info(f"Email digest with {len(messages)} alerts sent to {self.recipient_email}")
+        except Exception as e:
+            self.close()
+            logging.error(f"Failed to send email digest to {self.recipient_email}: {e}")
+
+class AlertDispatcher(Alert):
+    """
+    Non-blocking front end for another `Alert`: `send_alert` only filters and enqueues, and a
+    background thread does the (slow) sending. Alerts with the same `key` (e.g. the class label)
+    within `cooldown` seconds of the last one sent are suppressed. With `digest_interval`, the
+    alerts are collected and sent together through `send_digest` every `digest_interval` seconds.
+    If the queue is full, new alerts are dropped rather than blocking the caller.
+    """
+
+    def __init__(self, alert: Alert, cooldown: float = 0.0, digest_interval: float = None, max_queue: int = 1000):
+        self.alert = alert
+        self.cooldown = cooldown
+        self.digest_interval = digest_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.last_sent = {}
+        self.sent = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def send_alert(self, message, key=None):
+        key = message if key is None else key
+        now = time.monotonic()
+        last = self.last_sent.get(key)
+        if last is not None and now - last < self.cooldown:
+            self.suppressed += 1
+            return False
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+            logging.warning(f"Alert queue full, dropping alert: {message}")
+            return False
+        self.last_sent[key] = now
+        return True
+
+    def _deliver(self, messages):
+        try:
+            if self.digest_interval:
+                self.alert.send_digest(messages)
+            else:
+                for message in messages:
+                    self.alert.send_alert(message)
+            self.sent += len(messages)
+        except Exception as e:
+            logging.error(f"Failed to dispatch alert: {e}")
+
+    def _run(self):
+        pending, deadline = [], None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                message = self.queue.get(timeout=timeout)
+                if message is None:
+                    break
+                pending.append(message)
+                if self.digest_interval and deadline is None:
+                    deadline = time.monotonic() + self.digest_interval
+            except queue.Empty:
+                pass
+            if pending and (not self.digest_interval or time.monotonic() >= deadline):
+                self._deliver(pending)
+                pending, deadline = [], None
+        if pending:
+            self._deliver(pending)
+
+    def close(self, timeout: float = None):
+        """Sends what is still queued (including a partial digest), stops the thread and closes the alert."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout)
+        self.alert.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+DEFAULT_MAX_INTERVAL = 2.0  # seconds
+
+
+class FrameGate:
+    """
+    Decides which frames of a stream go to the detector. Only every `stride`-th frame is a
+    candidate. If `motion_threshold` is set, a candidate is inferred only when the fraction of
+    changed pixels exceeds the threshold, or when `max_interval` seconds have passed since the
+    last inference. Motion is measured on a downscaled, blurred grayscale copy against a running
+    average background. The first frame is always inferred.
+    """
+
+    def __init__(self, stride: int = 1, motion_threshold: float = None, max_interval: float = DEFAULT_MAX_INTERVAL,
+                 width: int = 160, pixel_threshold: int = 25, learning_rate: float = 0.05):
+        self.stride = max(1, stride)
+        self.motion_threshold = motion_threshold
+        self.max_interval = max_interval
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.learning_rate = learning_rate
+        self.background = None
+        self.last_inference = None
+        self.seen = 0
+        self.inferred = 0
+
+    def motion(self, image) -> float:
+        """Fraction of pixels that differ from the background (1.0 for the first frame)."""
+        height, width = image.shape[:2]
+        scale = self.width / width
+        small = cv2.resize(image, (self.width, max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        if self.background is None or self.background.shape != gray.shape:
+            self.background = gray.astype(np.float32)
+            return 1.0
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        cv2.accumulateWeighted(gray, self.background, self.learning_rate)
+        return np.count_nonzero(diff > self.pixel_threshold) / diff.size
+
+    def should_infer(self, frame) -> bool:
+        self.seen += 1
+        if frame.index % self.stride:
+            return False
+        infer = self.last_inference is None or self.motion_threshold is None
+        if self.motion_threshold is not None:
+            # Keeps the background up to date even when the interval alone forces an inference
+            infer = self.motion(frame.image) > self.motion_threshold or infer
+        if not infer and self.max_interval is not None:
+            infer = frame.timestamp - self.last_inference >= self.max_interval
+        if infer:
+            self.last_inference = frame.timestamp
+            self.inferred += 1
+        return infer
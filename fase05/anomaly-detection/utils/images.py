@@ -0,0 +1,105 @@
+import glob
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+LIST_EXTENSIONS = (".txt",)
+
+
+def is_image_batch(source: str) -> bool:
+    """True for a directory, a glob pattern or a .txt list of images (batch mode)."""
+    return os.path.isdir(source) or glob.has_magic(source) or os.path.splitext(source)[1].lower() in LIST_EXTENSIONS
+
+
+def expand_images(source: str):
+    """
+    Image paths of a directory (searched recursively), a glob pattern (`**` allowed) or a .txt
+    file with one path per line, sorted and without duplicates.
+    """
+    if os.path.isdir(source):
+        paths = (os.path.join(root, name) for root, _, names in os.walk(source) for name in names)
+    elif glob.has_magic(source):
+        paths = glob.iglob(source, recursive=True)
+    else:
+        with open(source, encoding="utf-8") as file:
+            paths = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+    return sorted({path for path in paths if path.lower().endswith(IMAGE_EXTENSIONS)})
+
+
+def prefetch_images(paths, workers: int = 4, lookahead: int = 32):
+    """
+    Yields (path, image) in the order of `paths`, decoding up to `lookahead` images ahead in a
+    pool of `workers` threads (cv2.imread releases the GIL). `image` is None if it could not be read.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending = deque()
+    paths = iter(paths)
+    try:
+        for path in paths:
+            pending.append((path, pool.submit(cv2.imread, path)))
+            if len(pending) >= lookahead:
+                break
+        while pending:
+            path, future = pending.popleft()
+            following = next(paths, None)
+            if following is not None:
+                pending.append((following, pool.submit(cv2.imread, following)))
+            yield path, future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class Manifest:
+    """
+    Record of the images already processed, one JSON line per image with its size and
+    modification time, so an interrupted run can be resumed: `done` is true only for an image
+    that was processed and has not changed since. Lines are appended as images are processed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by an interrupted run
+                    self.entries[entry["path"]] = (entry["size"], entry["mtime"])
+        self.file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _signature(path: str):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime
+
+    def done(self, path: str) -> bool:
+        try:
+            return self.entries.get(path) == self._signature(path)
+        except OSError:
+            return False
+
+    def add(self, paths):
+        for path in paths:
+            size, mtime = self._signature(path)
+            self.entries[path] = (size, mtime)
+            self.file.write(json.dumps({"path": path, "size": size, "mtime": mtime}) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
@@ -0,0 +1,147 @@
+import logging
+from collections import namedtuple
+
+from anomaly_detection.utils.alerts import Alert
+from anomaly_detection.utils.video import format_timestamp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_FRAMES = 3
+DEFAULT_MAX_GAP = 1.0  # seconds
+DEFAULT_IOU_THRESHOLD = 0.3
+
+# A detection above its class threshold: label, confidence and box as (x1, y1, x2, y2)
+Detection = namedtuple("Detection", ["label", "confidence", "box"])
+# A closed incident: one object followed from `start` to `end` (seconds in the stream)
+Incident = namedtuple("Incident", ["label", "start", "end", "peak_confidence", "frames", "source"])
+
+
+def iou(a, b) -> float:
+    """Intersection over union of two (x1, y1, x2, y2) boxes."""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def format_opening(track, source=None) -> str:
+    message = (f"Incidente aberto: {track.label} em {format_timestamp(track.start)} "
+               f"(confiança {track.peak_confidence:.2f})")
+    if source is not None:
+        message += f" [{source}]"
+    return message
+
+
+def format_incident(incident: Incident) -> str:
+    message = (f"Incidente: {incident.label} de {format_timestamp(incident.start)} a {format_timestamp(incident.end)} "
+               f"(confiança máxima {incident.peak_confidence:.2f}, {incident.frames} quadros)")
+    if incident.source is not None:
+        message += f" [{incident.source}]"
+    return message
+
+
+class Track:
+    """One object followed over time: its last box and the incident data collected so far."""
+
+    def __init__(self, detection: Detection, timestamp: float):
+        self.label = detection.label
+        self.box = detection.box
+        self.hits = 1
+        self.incident_id = None
+        self.start = timestamp
+        self.last_seen = timestamp
+        self.peak_confidence = detection.confidence
+
+    def update(self, detection: Detection, timestamp: float):
+        self.box = detection.box
+        self.hits += 1
+        self.last_seen = timestamp
+        self.peak_confidence = max(self.peak_confidence, detection.confidence)
+
+
+class IncidentTracker:
+    """
+    Groups per-frame detections into incidents before alerting, in the spirit of SORT: boxes are
+    associated to the tracks of the same class by greedy IoU matching. A track becomes an
+    incident once it was matched in `min_frames` frames (a track that misses a frame before that
+    is discarded as noise), and the incident is closed when the object has not been seen for
+    `max_gap` seconds. `alert` gets two messages per incident: one when it opens, so the alarm is
+    raised while the object is still in view, and one when it closes, with its start and end
+    timestamps and the peak confidence. Both are keyed by (source, incident number, event), so a
+    shared `AlertDispatcher` cooldown never suppresses another incident, from this stream or any
+    other. Call `flush` at the end of the stream to close the incidents still open.
+    """
+
+    def __init__(self, alert: Alert, source=None, min_frames: int = DEFAULT_MIN_FRAMES,
+                 max_gap: float = DEFAULT_MAX_GAP, iou_threshold: float = DEFAULT_IOU_THRESHOLD):
+        self.alert = alert
+        self.source = source
+        self.min_frames = max(1, min_frames)
+        self.max_gap = max_gap
+        self.iou_threshold = iou_threshold
+        self.tracks = []
+        self.detections = 0
+        self.opened = 0
+        self.incidents = 0
+
+    def _match(self, detections):
+        # Greedy assignment by decreasing IoU; returns {track index: detection index}
+        pairs = sorted(((iou(track.box, detection.box), t, d)
+                        for t, track in enumerate(self.tracks)
+                        for d, detection in enumerate(detections)
+                        if track.label == detection.label), reverse=True)
+        matches, used = {}, set()
+        for overlap, t, d in pairs:
+            if overlap < self.iou_threshold:
+                break
+            if t not in matches and d not in used:
+                matches[t] = d
+                used.add(d)
+        return matches
+
+    def _open(self, track: Track):
+        self.opened += 1
+        track.incident_id = self.opened
+        logger.info(f"Incidente aberto: {track.label} em {format_timestamp(track.start)}")
+        self.alert.send_alert(format_opening(track, self.source), key=(self.source, track.incident_id, "aberto"))
+
+    def _close(self, track: Track) -> Incident:
+        incident = Incident(track.label, track.start, track.last_seen, track.peak_confidence, track.hits, self.source)
+        self.incidents += 1
+        self.alert.send_alert(format_incident(incident), key=(self.source, track.incident_id, "encerrado"))
+        return incident
+
+    def update(self, detections, timestamp: float):
+        """Feeds the detections of one frame; returns the incidents closed by it."""
+        self.detections += len(detections)
+        matches = self._match(detections)
+        closed, tracks = [], []
+        for t, track in enumerate(self.tracks):
+            if t in matches:
+                track.update(detections[matches[t]], timestamp)
+                if track.hits == self.min_frames:
+                    self._open(track)
+                tracks.append(track)
+            elif track.hits < self.min_frames:
+                continue
+            elif timestamp - track.last_seen > self.max_gap:
+                closed.append(self._close(track))
+            else:
+                tracks.append(track)
+        matched = set(matches.values())
+        for d, detection in enumerate(detections):
+            if d not in matched:
+                tracks.append(Track(detection, timestamp))
+                if self.min_frames == 1:
+                    self._open(tracks[-1])
+        self.tracks = tracks
+        return closed
+
+    def flush(self):
+        """Closes every confirmed incident still open (end of the stream)."""
+        closed = [self._close(track) for track in self.tracks if track.hits >= self.min_frames]
+        self.tracks = []
+        return closed
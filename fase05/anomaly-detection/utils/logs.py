@@ -0,0 +1,33 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(filename: str = "logs.log", level=logging.INFO, console: bool = True):
+    """
+    Non-blocking logging: the root logger only puts records on a queue (`QueueHandler`), and a
+    `QueueListener` thread formats them and writes them to `filename` (and to the console), so a
+    log call in the frame loop never waits on disk. Replaces any handler already configured and
+    returns the listener, which is also stopped (flushing the queue) at exit.
+    """
+    handlers = [logging.FileHandler(filename, encoding="utf-8")]
+    if console:
+        handlers.append(logging.StreamHandler())
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(records))
+    root.setLevel(level)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,91 @@
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows: no peak memory measurement
+    resource = None
+
+# Stages of the frame loop, in order
+STAGES = ["decode", "preprocess", "inference", "postprocess", "render", "alert"]
+
+
+def latency_summary(values_ms) -> dict:
+    """Mean, p50, p95, p99 and max of a list of latencies in milliseconds."""
+    values = np.asarray(values_ms, dtype=float)
+    if values.size == 0:
+        values = np.zeros(1)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"mean_ms": float(values.mean()), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+            "max_ms": float(values.max())}
+
+
+def rss_mb():
+    """Current resident memory of the process in MB (Linux), or None."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_mb():
+    """Peak resident memory of the process in MB (ru_maxrss is in KB on Linux), or None."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StageTimer:
+    """
+    Collects per-frame times of each stage in `STAGES`. Work done once for a whole batch (the
+    model call) is spread evenly over its frames. A frame's latency is the sum of its stages;
+    throughput is measured separately, from wall time, since batching and the background
+    threads overlap stages.
+    """
+
+    def __init__(self):
+        self.times = {stage: [] for stage in STAGES}
+        self.started = None
+        self.elapsed = 0.0
+
+    def add(self, stage: str, ms: float, frames: int = 1):
+        self.times[stage].extend([ms / frames] * frames)
+
+    @contextmanager
+    def measure(self, stage: str, frames: int = 1):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, (time.perf_counter() - started) * 1000, frames)
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.elapsed += time.perf_counter() - self.started
+        self.started = None
+
+    @property
+    def frames(self) -> int:
+        return max((len(values) for values in self.times.values()), default=0)
+
+    def frame_latencies(self):
+        """Per-frame sum of the stage times (stages a frame did not go through count as zero)."""
+        totals = np.zeros(self.frames)
+        for values in self.times.values():
+            totals[:len(values)] += values
+        return totals
+
+    def summary(self) -> dict:
+        return {
+            "frames": self.frames,
+            "elapsed_s": self.elapsed,
+            "fps": self.frames / self.elapsed if self.elapsed > 0 else 0.0,
+            "latency": latency_summary(self.frame_latencies()),
+            "stages": {stage: latency_summary(values) for stage, values in self.times.items() if values},
+        }
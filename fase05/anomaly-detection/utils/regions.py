@@ -0,0 +1,180 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import torch
+from ultralytics.engine.results import Results
+
+DEFAULT_TILE_OVERLAP = 0.2
+DEFAULT_MERGE_THRESHOLD = 0.5
+
+
+class RegionOfInterest:
+    """
+    Part of a camera's view worth analyzing, given as polygons in normalized (0-1) coordinates
+    or as a mask image (white = analyze). The mask is rebuilt only when the frame size changes.
+    """
+
+    def __init__(self, polygons=None, mask_path: str = None):
+        if not polygons and not mask_path:
+            raise ValueError("A region of interest needs polygons or a mask image.")
+        self.polygons = [np.asarray(polygon, dtype=np.float32) for polygon in polygons or []]
+        self.mask_path = mask_path
+        self._shape = None
+        self._mask = None
+        self._bounds = None
+
+    def mask(self, shape):
+        """Boolean mask for a frame of `shape` (height, width, ...)."""
+        height, width = shape[:2]
+        if self._shape != (height, width):
+            if self.mask_path:
+                image = cv2.imread(self.mask_path, cv2.IMREAD_GRAYSCALE)
+                if image is None:
+                    raise FileNotFoundError(f"ROI mask not found: {self.mask_path}")
+                mask = cv2.resize(image, (width, height), interpolation=cv2.INTER_NEAREST) > 127
+            else:
+                mask = np.zeros((height, width), np.uint8)
+                cv2.fillPoly(mask, [np.round(polygon * (width, height)).astype(np.int32) for polygon in self.polygons], 1)
+                mask = mask.astype(bool)
+            ys, xs = np.nonzero(mask)
+            self._bounds = (int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1) if len(xs) else (0, 0, 0, 0)
+            self._shape, self._mask = (height, width), mask
+        return self._mask
+
+    def bounds(self, shape):
+        """Bounding box (x1, y1, x2, y2) of the mask, in pixels."""
+        self.mask(shape)
+        return self._bounds
+
+
+def load_rois(path: str):
+    """
+    Reads a JSON file mapping each camera (path, URL or file name; "*" for any other) to a list
+    of polygons in normalized coordinates or to the path of a mask image.
+    """
+    with open(path, encoding="utf-8") as file:
+        config = json.load(file)
+    base = os.path.dirname(os.path.abspath(path))
+    return {source: RegionOfInterest(mask_path=os.path.join(base, region)) if isinstance(region, str)
+            else RegionOfInterest(polygons=region)
+            for source, region in config.items()}
+
+
+def roi_for(rois, source):
+    """Region of `source` in `rois` (matched by full path, then file name, then "*"), or None."""
+    if not rois:
+        return None
+    source = str(source)
+    for key in (source, os.path.basename(source), "*"):
+        if key in rois:
+            return rois[key]
+    return None
+
+
+def tile_starts(length: int, tile: int, overlap: float):
+    """Start offsets of tiles of size `tile` covering `length` with at least `overlap` between neighbours."""
+    if length <= tile:
+        return [0]
+    step = max(1, int(tile * (1 - overlap)))
+    starts = list(range(0, length - tile, step))
+    return starts + [length - tile]
+
+
+def merge_detections(detections, threshold: float = DEFAULT_MERGE_THRESHOLD):
+    """
+    Cross-tile non-maximum suppression over rows (x1, y1, x2, y2, confidence, class): per class,
+    the most confident box suppresses those overlapping it by more than `threshold`, measured
+    as intersection over the smaller box, so that a partial box cut at a tile border is merged
+    into the full one found in the neighbouring tile (plain IoU would keep both).
+    """
+    detections = np.asarray(detections, dtype=np.float32).reshape(-1, 6)
+    kept = []
+    for cls in np.unique(detections[:, 5]):
+        rows = detections[detections[:, 5] == cls]
+        rows = rows[np.argsort(-rows[:, 4])]
+        areas = (rows[:, 2] - rows[:, 0]) * (rows[:, 3] - rows[:, 1])
+        alive = np.ones(len(rows), bool)
+        for i in range(len(rows)):
+            if not alive[i]:
+                continue
+            kept.append(rows[i])
+            width = np.clip(np.minimum(rows[i, 2], rows[:, 2]) - np.maximum(rows[i, 0], rows[:, 0]), 0, None)
+            height = np.clip(np.minimum(rows[i, 3], rows[:, 3]) - np.maximum(rows[i, 1], rows[:, 1]), 0, None)
+            overlap = width * height / np.maximum(np.minimum(areas[i], areas), 1e-6)
+            alive &= overlap <= threshold
+    return np.array(kept, dtype=np.float32).reshape(-1, 6)
+
+
+class RegionDetector:
+    """
+    Wraps a YOLO model to look only where it matters and at full resolution. With a `roi`, each
+    frame is cropped to the region's bounding box and masked outside it, and boxes centred
+    outside the region are dropped. With `tile_size`, the (cropped) frame is sliced into
+    overlapping tiles of that size (SAHI-style), tiles outside the region are skipped, and,
+    with `full_frame`, the whole crop is added as one more input for objects larger than a tile.
+    All tiles of a batch of frames go through one model call and the boxes are merged with
+    `merge_detections`. Called like the model, it returns one Ultralytics `Results` per frame,
+    in frame coordinates, so alerts and rendering are unchanged.
+    """
+
+    def __init__(self, model, roi: RegionOfInterest = None, tile_size: int = None,
+                 overlap: float = DEFAULT_TILE_OVERLAP, full_frame: bool = True,
+                 merge_threshold: float = DEFAULT_MERGE_THRESHOLD):
+        self.model = model
+        self.names = model.names
+        self.roi = roi
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.full_frame = full_frame
+        self.merge_threshold = merge_threshold
+
+    def _crops(self, frame, roi):
+        """(image, x offset, y offset) inputs for one frame."""
+        x1, y1, x2, y2 = 0, 0, frame.shape[1], frame.shape[0]
+        mask = None
+        if roi is not None:
+            mask = roi.mask(frame.shape)
+            x1, y1, x2, y2 = roi.bounds(frame.shape)
+            if x2 <= x1 or y2 <= y1:
+                return []
+            mask = mask[y1:y2, x1:x2]
+            region = frame[y1:y2, x1:x2] * mask[..., None].astype(frame.dtype)
+        else:
+            region = frame
+        height, width = region.shape[:2]
+        if not self.tile_size or (height <= self.tile_size and width <= self.tile_size):
+            return [(region, x1, y1)]
+
+        crops = [(region, x1, y1)] if self.full_frame else []
+        for ty in tile_starts(height, self.tile_size, self.overlap):
+            for tx in tile_starts(width, self.tile_size, self.overlap):
+                if mask is not None and not mask[ty:ty + self.tile_size, tx:tx + self.tile_size].any():
+                    continue
+                crops.append((region[ty:ty + self.tile_size, tx:tx + self.tile_size], x1 + tx, y1 + ty))
+        return crops
+
+    def __call__(self, frames, regions=None, **kwargs):
+        frames = [frames] if isinstance(frames, np.ndarray) else list(frames)
+        regions = regions if regions is not None else [self.roi] * len(frames)
+        crops = [(index, crop) for index, (frame, roi) in enumerate(zip(frames, regions)) for crop in self._crops(frame, roi)]
+        results = self.model([image for _, (image, _, _) in crops], **kwargs) if crops else []
+
+        boxes = [[] for _ in frames]
+        for (index, (_, dx, dy)), result in zip(crops, results):
+            data = result.boxes.data.cpu().numpy().copy() if len(result.boxes) else np.zeros((0, 6), np.float32)
+            data[:, [0, 2]] += dx
+            data[:, [1, 3]] += dy
+            boxes[index].append(data)
+
+        merged = []
+        for frame, roi, frame_boxes in zip(frames, regions, boxes):
+            data = merge_detections(np.concatenate(frame_boxes) if frame_boxes else [], self.merge_threshold)
+            if roi is not None and len(data):
+                mask = roi.mask(frame.shape)
+                cx = np.clip(((data[:, 0] + data[:, 2]) / 2).astype(int), 0, frame.shape[1] - 1)
+                cy = np.clip(((data[:, 1] + data[:, 3]) / 2).astype(int), 0, frame.shape[0] - 1)
+                data = data[mask[cy, cx]]
+            merged.append(Results(orig_img=frame, path="", names=self.names, boxes=torch.from_numpy(data)))
+        return merged
@@ -0,0 +1,34 @@
+import os
+
+from ultralytics import YOLO
+
+# Engines inference.py can run on; the exported files are those written by `training-yolo.py --export`
+RUNTIMES = ["pytorch", "onnx", "openvino", "openvino-int8"]
+EXPORT_SUFFIXES = {
+    "onnx": ".onnx",
+    "openvino": "_openvino_model",
+    "openvino-int8": "_int8_openvino_model",
+}
+
+
+def resolve_model_path(model_path: str, runtime: str = "pytorch") -> str:
+    """
+    Path of the model for `runtime`. Given the `.pt` weights, the exported model is looked up
+    next to them, with the names Ultralytics gives to exports (best.onnx, best_openvino_model/,
+    best_int8_openvino_model/). Any other path is taken to be the exported model itself.
+    """
+    if runtime not in RUNTIMES:
+        raise ValueError(f"Unknown runtime {runtime}: use one of {', '.join(RUNTIMES)}.")
+    stem, ext = os.path.splitext(model_path)
+    if runtime == "pytorch" or ext != ".pt":
+        return model_path
+    return stem + EXPORT_SUFFIXES[runtime]
+
+
+def load_model(model_path: str, runtime: str = "pytorch"):
+    """Loads the model for `runtime`; raises FileNotFoundError if it was not exported."""
+    path = resolve_model_path(model_path, runtime)
+    if runtime != "pytorch" and not os.path.exists(path):
+        raise FileNotFoundError(f"Model for runtime {runtime} not found: {path} (export it with training-yolo.py --export)")
+    # Exported models do not always carry the task, so it is given explicitly
+    return YOLO(path, task="detect")
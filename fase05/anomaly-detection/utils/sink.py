@@ -0,0 +1,155 @@
+import json
+import contextlib
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["source", "frame", "timestamp", "label", "confidence", "x1", "y1", "x2", "y2"]
+FORMATS = {".jsonl": "jsonl", ".parquet": "parquet"}
+
+
+class DetectionSink:
+    """
+    Saves every detection (source, frame index, timestamp in seconds, class, confidence and box)
+    to a JSONL or Parquet file, chosen from the extension of `path`, for offline analysis.
+    Detections are buffered in columns and every `buffer_size` rows the buffer is handed to a
+    background thread, which writes it as one block (a row group, in Parquet), so the frame loop
+    never waits on disk. `close` writes the rest and finalizes the file. With `append`, a JSONL
+    file is continued (resumed runs); a Parquet file cannot be, so it must not exist yet.
+    `when_written` lets the caller act once rows are on disk, e.g. to mark their images as done.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 10000, max_pending: int = 8, append: bool = False):
+        self.path = path
+        self.format = FORMATS.get(os.path.splitext(path)[1].lower())
+        if self.format is None:
+            raise ValueError(f"Unsupported detection file {path}: use {' or '.join(FORMATS)}.")
+        if self.format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Writing detections to Parquet requires pyarrow: pip install pyarrow")
+            if append and os.path.exists(path):
+                raise ValueError(f"Cannot append to the Parquet file {path}: use a new file or .jsonl.")
+        self.append = append
+        self.buffer_size = max(1, buffer_size)
+        self.rows = 0
+        self.error = None
+        self._columns = self._empty()
+        self._callbacks = []
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _empty():
+        return {column: [] for column in COLUMNS}
+
+    def add(self, detections, frame: int, timestamp: float, source=None):
+        """Buffers the `Detection`s of one frame."""
+        columns = self._columns
+        for detection in detections:
+            columns["source"].append(None if source is None else str(source))
+            columns["frame"].append(int(frame))
+            columns["timestamp"].append(float(timestamp))
+            columns["label"].append(detection.label)
+            columns["confidence"].append(float(detection.confidence))
+            box = tuple(detection.box) or (None,) * 4
+            for column, value in zip(("x1", "y1", "x2", "y2"), box):
+                columns[column].append(value)
+        if len(columns["frame"]) >= self.buffer_size:
+            self.flush()
+
+    def when_written(self, callback):
+        """
+        Has the writer thread call `callback()` once every row added so far has been written.
+        It is not called if writing fails, so nothing is reported as saved when it was lost.
+        """
+        self._callbacks.append(callback)
+
+    def flush(self):
+        """Hands the buffered rows (and the callbacks waiting on them) to the writer thread."""
+        if self._columns["frame"] or self._callbacks:
+            block = (self._columns, self._callbacks)
+            self._columns, self._callbacks = self._empty(), []
+            # Blocks only if the writer is `max_pending` blocks behind
+            self._pending.put(block)
+
+    def sync(self):
+        """Flushes and waits until the writer thread has written everything added so far."""
+        self.flush()
+        if self._thread.is_alive():
+            self._pending.join()
+
+    def _run(self):
+        writer = None
+        try:
+            with open(self.path, "a" if self.append else "w", encoding="utf-8") if self.format == "jsonl" else contextlib.nullcontext() as file:
+                while True:
+                    block = self._pending.get()
+                    try:
+                        if block is None:
+                            break
+                        columns, callbacks = block
+                        if columns["frame"]:
+                            if self.format == "jsonl":
+                                _write_jsonl(file, columns)
+                            else:
+                                writer = _write_parquet(writer, self.path, columns)
+                            self.rows += len(columns["frame"])
+                        for callback in callbacks:
+                            callback()
+                    finally:
+                        self._pending.task_done()
+        except Exception as e:
+            self.error = e
+            logger.error(f"Erro ao gravar detecções em {self.path}: {e}")
+            while True:
+                block = self._pending.get()
+                self._pending.task_done()
+                if block is None:
+                    break
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def close(self):
+        self.flush()
+        if self._thread.is_alive():
+            self._pending.put(None)
+            self._thread.join()
+        if self.format == "parquet" and self.rows == 0 and self.error is None:
+            # Nothing was detected: still leave a valid (empty) file
+            _write_parquet(None, self.path, self._empty()).close()
+        logger.info(f"{self.rows} detecções gravadas em {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+def _write_jsonl(file, columns):
+    lines = (json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) for row in zip(*(columns[c] for c in COLUMNS)))
+    file.write("\n".join(lines) + "\n")
+    file.flush()
+
+
+def _write_parquet(writer, path, columns):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("source", pa.string()), ("frame", pa.int64()), ("timestamp", pa.float64()),
+        ("label", pa.string()), ("confidence", pa.float32()),
+        ("x1", pa.float32()), ("y1", pa.float32()), ("x2", pa.float32()), ("y2", pa.float32()),
+    ])
+    if writer is None:
+        writer = pq.ParquetWriter(path, schema)
+    writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+    return writer
@@ -0,0 +1,112 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from anomaly_detection.utils.video import FrameReader
+
+logger = logging.getLogger(__name__)
+
+
+def is_stream_url(source: str) -> bool:
+    """True for network sources such as rtsp://, http:// (live cameras)."""
+    return "://" in str(source)
+
+
+class StreamStats:
+    """Per-stream counters: frames handled, frames inferred and decode-to-result latency."""
+
+    def __init__(self, source, window: int = 10000):
+        self.source = source
+        self.frames = 0
+        self.inferred = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, latency: float, inferred: bool):
+        self.frames += 1
+        self.inferred += int(inferred)
+        self.latencies.append(latency)
+
+    def summary(self, dropped: int = 0) -> dict:
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "source": str(self.source),
+            "frames": self.frames,
+            "inferred": self.inferred,
+            "dropped": dropped,
+            "latency_mean_ms": float(latencies.mean()),
+            "latency_p95_ms": float(np.percentile(latencies, 95)),
+            "latency_max_ms": float(latencies.max()),
+        }
+
+
+class StreamScheduler:
+    """
+    Feeds one shared model from many sources. Each source has its own decoder thread and bounded
+    queue (`FrameReader`), so a fast source cannot starve the others or grow memory: it simply
+    waits (files) or drops its oldest frames (live URLs). Batches are filled round-robin, one
+    frame per stream per round, starting after the stream served last. A partial batch is
+    emitted after `max_latency` seconds.
+    """
+
+    def __init__(self, sources, batch_size: int = 8, max_latency: float = 0.05, max_queue: int = 8):
+        self.sources = list(sources)
+        self.batch_size = max(1, batch_size)
+        self.max_latency = max_latency
+        self.ready = threading.Event()
+        self.readers = [FrameReader(source, max_queue=max_queue, drop_when_full=is_stream_url(source), ready=self.ready)
+                        for source in self.sources]
+        self._next = 0
+
+    def start(self):
+        for reader in self.readers:
+            if not reader.is_opened():
+                logger.error(f"Erro ao abrir vídeo: {reader.source}")
+            reader.start()
+        return self
+
+    def stop(self):
+        for reader in self.readers:
+            reader.stop()
+        for reader in self.readers:
+            reader.join()
+
+    def _round(self, batch, active):
+        # One frame from each active stream, in round-robin order; returns whether anything was taken
+        taken = False
+        count = len(self.readers)
+        first = self._next
+        for offset in range(count):
+            stream = (first + offset) % count
+            if stream not in active or len(batch) >= self.batch_size:
+                continue
+            try:
+                frame = self.readers[stream].frames.get_nowait()
+            except queue.Empty:
+                continue
+            if frame is None:
+                active.discard(stream)
+                continue
+            batch.append((stream, frame))
+            self._next = (stream + 1) % count
+            taken = True
+        return taken
+
+    def batches(self):
+        """Yields lists of (stream index, Frame) until every stream has ended."""
+        active = set(range(len(self.readers)))
+        batch, deadline = [], None
+        while active or batch:
+            self.ready.clear()
+            while len(batch) < self.batch_size and self._round(batch, active):
+                if deadline is None:
+                    deadline = time.monotonic() + self.max_latency
+            if batch and (len(batch) >= self.batch_size or not active or time.monotonic() >= deadline):
+                yield batch
+                batch, deadline = [], None
+                continue
+            if active:
+                self.ready.wait(timeout=0.1 if deadline is None else max(deadline - time.monotonic(), 0))
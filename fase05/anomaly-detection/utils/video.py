@@ -0,0 +1,159 @@
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# A decoded frame: position in the stream, timestamp in seconds, the BGR image and when it was
+# decoded (time.monotonic(), used to measure end-to-end latency)
+Frame = namedtuple("Frame", ["index", "timestamp", "image", "decoded"], defaults=(None,))
+
+
+def format_timestamp(seconds: float) -> str:
+    """Formats a stream position in seconds as HH:MM:SS (the format used in alert messages)."""
+    return f"{int(seconds // 3600):02}:{int((seconds % 3600) // 60):02}:{int(seconds % 60):02}"
+
+
+class FrameReader(threading.Thread):
+    """
+    Decodes a video in a background thread into a bounded queue of `Frame`s, so decoding
+    overlaps with inference. The timestamp is read from the capture right after each frame is
+    decoded, so it stays correct no matter how frames are grouped later. `None` marks the end
+    of the stream. When the queue is full the decoder waits (backpressure) or, with
+    `drop_when_full` (live cameras, which cannot be paused), replaces the oldest queued frame.
+    `ready`, if given, is set after every frame so a consumer can wait on several readers.
+    """
+
+    def __init__(self, source, max_queue: int = 64, drop_when_full: bool = False, ready: threading.Event = None):
+        super().__init__(daemon=True)
+        self.source = source
+        self.frames = queue.Queue(maxsize=max_queue)
+        self.drop_when_full = drop_when_full
+        self.ready = ready
+        self.dropped = 0
+        self.stopped = threading.Event()
+        self.capture = cv2.VideoCapture(source)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 0.0
+
+    def is_opened(self) -> bool:
+        return self.capture.isOpened()
+
+    def _put(self, item) -> bool:
+        # Blocks while the queue is full, but gives up as soon as the reader is stopped
+        while not self.stopped.is_set():
+            try:
+                if self.drop_when_full and item is not None and self.frames.full():
+                    self.frames.get_nowait()
+                    self.dropped += 1
+                self.frames.put(item, timeout=0.1)
+                if self.ready is not None:
+                    self.ready.set()
+                return True
+            except (queue.Full, queue.Empty):
+                continue
+        return False
+
+    def run(self):
+        index = 0
+        try:
+            while not self.stopped.is_set():
+                ret, image = self.capture.read()
+                if not ret:
+                    break
+                timestamp = self.capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                if not self._put(Frame(index, timestamp, image, time.monotonic())):
+                    break
+                index += 1
+        except Exception as e:
+            logger.error(f"Erro ao decodificar {self.source}: {e}")
+        finally:
+            self.capture.release()
+            self._put(None)
+
+    def stop(self):
+        self.stopped.set()
+
+
+def iter_batches(frames: queue.Queue, batch_size: int = 1, max_latency: float = 0.05):
+    """
+    Groups frames from `frames` into lists of up to `batch_size`. A partial batch is emitted once
+    `max_latency` seconds have passed since its first frame arrived, so a slow source never holds
+    frames back for long. Stops at the `None` end marker.
+    """
+    batch, deadline = [], None
+    while True:
+        timeout = None if not batch else max(deadline - time.monotonic(), 0)
+        try:
+            item = frames.get(timeout=timeout)
+        except queue.Empty:
+            yield batch
+            batch = []
+            continue
+        if item is None:
+            if batch:
+                yield batch
+            return
+        if not batch:
+            deadline = time.monotonic() + max_latency
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+
+class FrameWriter(threading.Thread):
+    """
+    Encodes frames to a video file in a background thread, so encoding (and, with `transform`,
+    drawing the annotations) does not slow the inference loop. `write` queues an item; `transform`
+    turns it into the BGR image to encode (default: the item is the image). The frame size is
+    taken from the first frame. When the queue is full `write` waits, so no frame is lost.
+    """
+
+    def __init__(self, path: str, fps: float = 30.0, max_queue: int = 64, transform=None, fourcc: str = "mp4v"):
+        super().__init__(daemon=True)
+        self.path = path
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.fourcc = fourcc
+        self.transform = transform
+        self.items = queue.Queue(maxsize=max_queue)
+        self.written = 0
+        self.error = None
+
+    def write(self, item):
+        if self.error is None:
+            self.items.put(item)
+
+    def run(self):
+        writer = None
+        try:
+            while True:
+                item = self.items.get()
+                if item is None:
+                    break
+                image = item if self.transform is None else self.transform(item)
+                if writer is None:
+                    height, width = image.shape[:2]
+                    writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (width, height))
+                    if not writer.isOpened():
+                        raise IOError(f"não foi possível criar {self.path}")
+                writer.write(image)
+                self.written += 1
+        except Exception as e:
+            self.error = e
+            logger.error(f"Erro ao gravar vídeo {self.path}: {e}")
+            # Keep draining so producers never block on a dead writer
+            while self.items.get() is not None:
+                pass
+        finally:
+            if writer is not None:
+                writer.release()
+
+    def close(self):
+        """Writes what is still queued and finalizes the file."""
+        if self.is_alive():
+            self.items.put(None)
+            self.join()
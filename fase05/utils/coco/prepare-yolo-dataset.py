@@ -1,7 +1,9 @@
 import os
 import json
 import shutil
-from pycocotools.coco import COCO
+import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Configurações centralizadas
 CONFIG = {
@@ -9,8 +11,10 @@ CONFIG = {
     'train_img_dir': 'train2017',
     'ann_file': 'annotations_trainval2017/annotations/instances_train2017.json',
     'output_dir': 'filtered_dataset',
-    'classes': ['knife', 'scissors'],  # Classes desejadas
-    'max_negatives': 500  # Limite de imagens negativas
+    'classes': ['knife', 'scissors'],  # Classes desejadas (a ordem define o índice YOLO)
+    'max_negatives': 500,  # Limite de imagens negativas
+    'link': 'hardlink',  # Como levar as imagens ao dataset: hardlink, symlink ou copy
+    'workers': 16  # Threads para as operações de arquivo
 }
 
 # Inicializar diretórios
@@ -30,69 +34,130 @@ def convert_to_yolo(bbox, img_w, img_h, class_id):
     h_norm = h / img_h
     return f"{class_id} {x_center} {y_center} {w_norm} {h_norm}"
 
-# Processar imagem (positiva ou negativa)
-def process_image(img_info, coco, output_img_dir, output_label_dir, train_img_dir, cat_ids=None, coco_to_yolo=None):
+# Ler o JSON do COCO uma única vez, agrupando as anotações das classes desejadas por imagem
+def load_annotations(ann_file, classes):
+    with open(ann_file) as f:
+        data = json.load(f)
+    # IDs de categoria do COCO (knife = 49, scissors = 87) para o índice YOLO, pelo nome
+    coco_to_yolo = {cat['id']: classes.index(cat['name']) for cat in data['categories'] if cat['name'] in classes}
+    anns_by_image = defaultdict(list)
+    for ann in data['annotations']:
+        if ann['category_id'] in coco_to_yolo:
+            anns_by_image[ann['image_id']].append(ann)
+    return data['images'], anns_by_image, coco_to_yolo
+
+# Conteúdo do arquivo de anotações YOLO de uma imagem (vazio para negativas)
+def yolo_labels(img_info, anns, coco_to_yolo):
+    lines = [convert_to_yolo(ann['bbox'], img_info['width'], img_info['height'], coco_to_yolo[ann['category_id']])
+             for ann in anns]
+    return ''.join(line + '\n' for line in lines)
+
+# A imagem já está no dataset, do jeito pedido em `mode`?
+def same_file(src, dst, mode):
+    if not os.path.exists(dst):
+        return False  # symlink quebrado
+    if mode == 'symlink' or os.path.islink(dst):
+        return mode == 'symlink' and os.path.islink(dst) and os.path.samefile(src, dst)
+    if os.path.samefile(src, dst):
+        return mode == 'hardlink'
+    # Cópia anterior inalterada (copy2 preserva o mtime); também é o resultado de hardlink entre sistemas de arquivos
+    src_stat, dst_stat = os.stat(src), os.stat(dst)
+    return (src_stat.st_size, int(src_stat.st_mtime)) == (dst_stat.st_size, int(dst_stat.st_mtime))
+
+# Levar a imagem ao dataset sem copiar quando possível; retorna False se ela já estava lá
+def link_image(src, dst, mode):
+    if os.path.lexists(dst):
+        if same_file(src, dst, mode):
+            return False
+        os.remove(dst)
+    if mode == 'symlink':
+        os.symlink(os.path.abspath(src), dst)
+        return True
+    if mode == 'hardlink':
+        try:
+            os.link(src, dst)
+            return True
+        except OSError:  # outro sistema de arquivos ou sem suporte: copiar
+            pass
+    shutil.copy2(src, dst)
+    return True
+
+# Gravar o arquivo de anotações apenas se o conteúdo mudou
+def write_labels(label_path, content):
+    if os.path.exists(label_path):
+        with open(label_path) as f:
+            if f.read() == content:
+                return False
+    with open(label_path, 'w') as f:
+        f.write(content)
+    return True
+
+# Processar imagem (positiva ou negativa); retorna quantos arquivos foram criados ou atualizados
+def process_image(img_info, anns, output_img_dir, output_label_dir, train_img_dir, coco_to_yolo, mode):
     img_path = os.path.join(train_img_dir, img_info['file_name'])
     output_img_path = os.path.join(output_img_dir, img_info['file_name'])
-    
-    # Copiar imagem
-    shutil.copy(img_path, output_img_path)
-    
-    # Criar arquivo de anotações
-    label_path = os.path.join(output_label_dir, img_info['file_name'].replace('.jpg', '.txt'))
-    if cat_ids:  # Para imagens positivas
-        ann_ids = coco.getAnnIds(imgIds=img_info['id'], catIds=cat_ids, iscrowd=None)
-        anns = coco.loadAnns(ann_ids)
-        with open(label_path, 'w') as f:
-            for ann in anns:
-                if ann['category_id'] in coco_to_yolo:
-                    yolo_class = coco_to_yolo[ann['category_id']]
-                    bbox = convert_to_yolo(ann['bbox'], img_info['width'], img_info['height'], yolo_class)
-                    f.write(bbox + '\n')
-    else:  # Para imagens negativas
-        open(label_path, 'w').close()  # Arquivo vazio para negativas
+    label_path = os.path.join(output_label_dir, os.path.splitext(img_info['file_name'])[0] + '.txt')
+    changed = link_image(img_path, output_img_path, mode)
+    changed += write_labels(label_path, yolo_labels(img_info, anns, coco_to_yolo))
+    return changed
+
+# Remover do dataset imagens e anotações que não fazem mais parte da seleção
+def remove_stale(directory, expected):
+    removed = 0
+    for name in os.listdir(directory):
+        if name not in expected:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+    return removed
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Filtra o COCO nas classes desejadas e exporta no formato YOLO.")
+    parser.add_argument("--data-dir", default=CONFIG['data_dir'], help=f"Diretório do COCO (default: {CONFIG['data_dir']}).")
+    parser.add_argument("--output-dir", default=CONFIG['output_dir'],
+                        help=f"Diretório de saída, relativo a --data-dir (default: {CONFIG['output_dir']}).")
+    parser.add_argument("--max-negatives", type=int, default=CONFIG['max_negatives'],
+                        help=f"Limite de imagens negativas (default: {CONFIG['max_negatives']}).")
+    parser.add_argument("--link", choices=['hardlink', 'symlink', 'copy'], default=CONFIG['link'],
+                        help=f"Como levar as imagens ao dataset; hardlink copia se não for possível (default: {CONFIG['link']}).")
+    parser.add_argument("--workers", type=int, default=CONFIG['workers'],
+                        help=f"Threads para as operações de arquivo (default: {CONFIG['workers']}).")
+    return parser.parse_args()
 
 # Função principal
 def main():
+    args = parse_arguments()
+
     # Expandir caminhos
     config = CONFIG.copy()
+    config.update(data_dir=args.data_dir, output_dir=args.output_dir, max_negatives=args.max_negatives,
+                  link=args.link, workers=args.workers)
     config['data_dir'] = os.path.expanduser(config['data_dir'])
     config['train_img_dir'] = os.path.join(config['data_dir'], config['train_img_dir'])
     config['ann_file'] = os.path.join(config['data_dir'], config['ann_file'])
-    
+
     # Configurar diretórios
     output_img_dir, output_label_dir = setup_directories(config)
-    
-    # Inicializar COCO
-    coco = COCO(config['ann_file'])
-    
-    # Obter IDs das classes desejadas
-    cat_ids = coco.getCatIds(catNms=config['classes'])
-    coco_to_yolo = {43: 0, 74: 1}  # Mapear COCO IDs para YOLO (0: knife, 1: scissors)
-    
-    # Obter imagens positivas
-    positive_img_ids = set()
-    for cat_id in cat_ids:
-        positive_img_ids.update(coco.getImgIds(catIds=[cat_id]))
-    
-    # Obter imagens negativas
-    all_img_ids = coco.getImgIds()
-    negative_img_ids = [img_id for img_id in all_img_ids if img_id not in positive_img_ids]
-    
-    # Processar imagens positivas
-    print("Processando imagens positivas...")
-    for img_id in positive_img_ids:
-        img_info = coco.loadImgs(img_id)[0]
-        process_image(img_info, coco, output_img_dir, output_label_dir, config['train_img_dir'], 
-                     cat_ids=cat_ids, coco_to_yolo=coco_to_yolo)
-    
-    # Processar imagens negativas (limitado a max_negatives)
-    print("Processando imagens negativas...")
-    for img_id in negative_img_ids[:config['max_negatives']]:
-        img_info = coco.loadImgs(img_id)[0]
-        process_image(img_info, coco, output_img_dir, output_label_dir, config['train_img_dir'])
-    
-    print(f"Total de imagens processadas: {len(os.listdir(output_img_dir))}")
+
+    # Anotações agrupadas por imagem, em uma passada
+    images, anns_by_image, coco_to_yolo = load_annotations(config['ann_file'], config['classes'])
+
+    # Imagens positivas e negativas (as primeiras max_negatives sem nenhuma das classes)
+    positives = [img for img in images if img['id'] in anns_by_image]
+    negatives = [img for img in images if img['id'] not in anns_by_image][:config['max_negatives']]
+    selected = positives + negatives
+    print(f"Imagens positivas: {len(positives)}, negativas: {len(negatives)}")
+
+    # Operações de arquivo em paralelo (são dominadas por I/O)
+    with ThreadPoolExecutor(max_workers=config['workers']) as pool:
+        changed = sum(pool.map(lambda img: process_image(img, anns_by_image.get(img['id'], []), output_img_dir,
+                                                         output_label_dir, config['train_img_dir'], coco_to_yolo,
+                                                         config['link']),
+                               selected))
+
+    removed = remove_stale(output_img_dir, {img['file_name'] for img in selected})
+    removed += remove_stale(output_label_dir, {os.path.splitext(img['file_name'])[0] + '.txt' for img in selected})
+
+    print(f"Total de imagens no dataset: {len(selected)} ({changed} arquivos criados ou atualizados, {removed} removidos)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()